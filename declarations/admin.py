@@ -1,5 +1,6 @@
 from django.contrib import admin
-from .models import PurchaseOrder, DeclarationRequest, Declaration, HazardousMaterial
+from . import compliance
+from .models import PurchaseOrder, DeclarationRequest, Declaration, HazardousMaterial, Substance, ComplianceThreshold
 
 
 @admin.register(PurchaseOrder)
@@ -66,11 +67,16 @@ class DeclarationAdmin(admin.ModelAdmin):
     list_display = ['id', 'declaration_type', 'item_name', 'supplier', 'ship', 'compliance_status', 'status', 'submitted_date', 'approved_date']
     list_filter = ['declaration_type', 'compliance_status', 'status', 'submitted_date', 'approved_date', 'created_at']
     search_fields = ['item_name', 'manufacturer', 'model_number', 'supplier__company_name', 'ship__ship_name']
-    readonly_fields = ['created_at', 'updated_at']
+    # 적합성 상태는 유해물질과 기준값으로 판정 (declarations.compliance)
+    readonly_fields = ['compliance_status', 'created_at', 'updated_at']
     ordering = ['-created_at']
     date_hierarchy = 'submitted_date'
     inlines = [HazardousMaterialInline]
     
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        compliance.evaluate([form.instance.pk])
+    
     fieldsets = (
         ('기본 정보', {
             'fields': ('declaration_request', 'supplier', 'ship', 'declaration_type')
@@ -98,14 +104,24 @@ class DeclarationAdmin(admin.ModelAdmin):
 class HazardousMaterialAdmin(admin.ModelAdmin):
     """유해물질 관리"""
     list_display = ['material_name', 'cas_number', 'content_percentage', 'declaration', 'location_in_product', 'created_at']
-    list_filter = ['material_name', 'created_at']
+    # 물질명 목록 필터는 전체 테이블 DISTINCT 가 필요하므로 물질 등록부의 규제 목록으로 거른다
+    list_filter = ['substance__hkc_table', 'substance__eu_srr_annex', 'created_at']
     search_fields = ['material_name', 'cas_number', 'declaration__item_name']
+    autocomplete_fields = ['substance']
     readonly_fields = ['created_at']
     ordering = ['-created_at']
     
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        compliance.evaluate({obj.declaration_id, form.initial.get('declaration')} - {None})
+    
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        compliance.evaluate([obj.declaration_id])
+    
     fieldsets = (
         ('물질 정보', {
-            'fields': ('declaration', 'material_name', 'cas_number', 'content_percentage')
+            'fields': ('declaration', 'material_name', 'cas_number', 'substance', 'content_percentage')
         }),
         ('상세 정보', {
             'fields': ('location_in_product', 'remarks')
@@ -115,3 +131,23 @@ class HazardousMaterialAdmin(admin.ModelAdmin):
             'classes': ('collapse',)
         }),
     )
+
+
+@admin.register(Substance)
+class SubstanceAdmin(admin.ModelAdmin):
+    """물질 등록부 관리"""
+    list_display = ['cas_number', 'name', 'hkc_table', 'eu_srr_annex', 'updated_at']
+    list_filter = ['hkc_table', 'eu_srr_annex']
+    search_fields = ['cas_number', 'name']
+    readonly_fields = ['created_at', 'updated_at']
+    ordering = ['name']
+
+
+@admin.register(ComplianceThreshold)
+class ComplianceThresholdAdmin(admin.ModelAdmin):
+    """적합성 기준값 관리 - 저장/삭제하면 모든 신고서를 다시 판정하는 작업이 등록됨"""
+    list_display = ['substance', 'value', 'unit', 'basis', 'updated_at']
+    list_filter = ['unit']
+    search_fields = ['substance__cas_number', 'substance__name']
+    autocomplete_fields = ['substance']
+    readonly_fields = ['updated_at']
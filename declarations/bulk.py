@@ -0,0 +1,272 @@
+"""
+신고서 일괄 처리
+
+submit_declarations: 공급업체가 여러 신고서(유해물질 포함)를 한 번에 제출.
+항목 수와 관계없이 일정한 수의 쿼리로 검증하고, 한 트랜잭션에서 bulk_create 로 저장합니다.
+기존 신고서 요청은 workflow.TRANSITIONS['submit'] 이 허용하는 상태에서만 제출할 수 있습니다.
+
+review_declarations: 운영자가 신고서 여러 건을 한 번에 승인/거절.
+workflow.can_transition 으로 항목별 허용 여부를 판단하고, 신고서, 신고서 요청, 구매 주문 테이블마다
+workflow.transition_many 의 조건부 UPDATE 한 번으로 전환합니다.
+
+bulk_create / update() 는 signal 을 발생시키지 않으므로 요약 건수는 summary.record_changes,
+선박 인벤토리는 inventory.refresh_many, 검색 색인은 search.documents.index_objects,
+응답 캐시는 response_cache.invalidate 로 직접 반영합니다.
+적합성 상태는 저장 전에 compliance.status_for 로 판정합니다.
+"""
+from django.db import transaction
+from django.utils import timezone
+
+from ihm_backend import response_cache
+from search.documents import index_objects
+from . import compliance, inventory, substances, summary, workflow
+from .models import PurchaseOrder, DeclarationRequest, Declaration, HazardousMaterial
+from .serializers import BulkDeclarationItemSerializer
+
+BULK_MAX_ITEMS = 500
+HAZMAT_BATCH_SIZE = 1000
+
+
+class BulkValidationError(Exception):
+    """항목별 오류 목록 (입력 순서와 같은 인덱스)"""
+
+    def __init__(self, errors):
+        super().__init__(errors)
+        self.errors = errors
+
+
+def _item_errors(items, purchase_orders, supplier_id):
+    """구매 주문/요청/신고서 번호 상태를 한 번에 검사하여 항목별 오류 반환"""
+    numbers = [item.get('declaration_number', '') for item in items]
+    taken = set(
+        Declaration.objects.filter(declaration_number__in=set(numbers))
+        .values_list('declaration_number', flat=True)
+    )
+
+    errors = [{} for _ in items]
+    seen_orders, seen_numbers = set(), set()
+    for index, item in enumerate(items):
+        po_id = item['purchase_order']
+        po = purchase_orders.get(po_id)
+        request = getattr(po, 'declaration_request', None) if po else None
+        if po is None:
+            errors[index]['purchase_order'] = ['존재하지 않는 구매 주문입니다.']
+        elif po_id in seen_orders:
+            errors[index]['purchase_order'] = ['같은 구매 주문이 중복되었습니다.']
+        elif request is not None and request.supplier_id != supplier_id:
+            errors[index]['purchase_order'] = ['다른 공급업체에 요청된 구매 주문입니다.']
+        elif request is not None and hasattr(request, 'declaration'):
+            errors[index]['purchase_order'] = ['이미 신고서가 제출된 구매 주문입니다.']
+        elif request is not None and not workflow.can_transition(DeclarationRequest, 'submit', request.status):
+            # 단건 제출이 409 로 돌려주는 것과 같은 메시지
+            errors[index]['purchase_order'] = [
+                str(workflow.TransitionConflict(request, 'submit', request.status).detail)
+            ]
+        seen_orders.add(po_id)
+
+        number = numbers[index]
+        if number in taken or number in seen_numbers:
+            errors[index]['declaration_number'] = ['이미 사용 중인 신고서 번호입니다.']
+        seen_numbers.add(number)
+    return errors
+
+
+def _assign_pks(objs, model, key_attname):
+    """pk 를 돌려주지 않는 DB(MySQL)에서 bulk_create 한 행의 pk 를 고유 키로 조회"""
+    if all(obj.pk is not None for obj in objs):
+        return
+    keys = [getattr(obj, key_attname) for obj in objs]
+    pks = dict(model.objects.filter(**{f'{key_attname}__in': keys}).values_list(key_attname, 'pk'))
+    for obj in objs:
+        obj.pk = pks[getattr(obj, key_attname)]
+
+
+def submit_declarations(user, data, context=None):
+    """신고서 일괄 제출, 생성된 Declaration 목록 반환 (입력 순서)
+
+    검증 오류가 하나라도 있으면 아무것도 저장하지 않고 BulkValidationError 를 발생시킵니다.
+    """
+    serializer = BulkDeclarationItemSerializer(data=data, many=True, context=context or {})
+    if not serializer.is_valid():
+        raise BulkValidationError(serializer.errors)
+    items = serializer.validated_data
+
+    # 구매 주문, 기존 요청, 기존 신고서를 한 번에 조회
+    purchase_orders = PurchaseOrder.objects.select_related(
+        'declaration_request__declaration'
+    ).in_bulk({item['purchase_order'] for item in items})
+    errors = _item_errors(items, purchase_orders, user.supplier_id)
+    if any(errors):
+        raise BulkValidationError(errors)
+
+    now = timezone.now()
+    with transaction.atomic():
+        new_requests, submitted_requests, request_changes = [], [], []
+        requests = {}
+        for item in items:
+            po = purchase_orders[item['purchase_order']]
+            request = getattr(po, 'declaration_request', None)
+            if request is None:
+                request = DeclarationRequest(
+                    purchase_order=po, supplier_id=user.supplier_id, customer_id=po.customer_id,
+                    created_by_id=user.id, status='submitted',
+                )
+                new_requests.append(request)
+                request_changes.append((None, summary.row_values(request)))
+            else:
+                old = summary.row_values(request)
+                request.status = 'submitted'
+                submitted_requests.append(request.pk)
+                request_changes.append((old, summary.row_values(request)))
+            requests[po.pk] = request
+
+        DeclarationRequest.objects.bulk_create(new_requests)
+        _assign_pks(new_requests, DeclarationRequest, 'purchase_order_id')
+        if submitted_requests:
+            workflow.transition_many(DeclarationRequest, 'submit', submitted_requests)
+
+        substance_ids = substances.resolve(
+            material.get('cas_number') for item in items for material in item.get('hazardous_materials', [])
+        )
+        limits = compliance.limits()
+
+        declarations = []
+        for item in items:
+            fields = {k: v for k, v in item.items() if k not in ('purchase_order', 'hazardous_materials')}
+            po = purchase_orders[item['purchase_order']]
+            compliance_status = compliance.status_for(
+                (
+                    (substance_ids.get(material.get('cas_number')), material.get('content_percentage'))
+                    for material in item.get('hazardous_materials', [])
+                ),
+                limits,
+            )
+            declarations.append(Declaration(
+                declaration_request=requests[po.pk], supplier_id=user.supplier_id, ship_id=po.ship_id,
+                customer_id=po.customer_id, status='submitted', submitted_date=now,
+                compliance_status=compliance_status, **fields
+            ))
+        Declaration.objects.bulk_create(declarations)
+        _assign_pks(declarations, Declaration, 'declaration_request_id')
+
+        materials = [
+            (declaration, material)
+            for declaration, item in zip(declarations, items)
+            for material in item.get('hazardous_materials', [])
+        ]
+        HazardousMaterial.objects.bulk_create(
+            [
+                HazardousMaterial(
+                    declaration=declaration, customer_id=declaration.customer_id,
+                    substance_id=substance_ids.get(material.get('cas_number')), **material
+                )
+                for declaration, material in materials
+            ],
+            batch_size=HAZMAT_BATCH_SIZE,
+        )
+
+        summary.record_changes(DeclarationRequest, request_changes)
+        summary.record_changes(Declaration, [(None, summary.row_values(d)) for d in declarations])
+        index_objects(declarations, created=True)
+        scopes = {f'supplier:{user.supplier_id}', *(f'customer:{d.customer_id}' for d in declarations)}
+        for model in (DeclarationRequest, Declaration, HazardousMaterial):
+            response_cache.invalidate(model, scopes)
+    return declarations
+
+
+# 일괄 승인/거절 결정 → 함께 전환할 (모델, workflow 전환 이름)
+REVIEW_TRANSITIONS = {
+    'approve': [(Declaration, 'approve'), (DeclarationRequest, 'approve'), (PurchaseOrder, 'complete')],
+    'reject': [(Declaration, 'reject'), (DeclarationRequest, 'reject')],
+}
+
+
+def _review_rows(ids):
+    """신고서와 요청/구매 주문의 상태 및 건수 계산용 컬럼을 한 번에 조회 (행 잠금)"""
+    fields = {
+        Declaration: ('pk', *Declaration._tracked_attnames()),
+        DeclarationRequest: ('declaration_request__pk', *(
+            f'declaration_request__{name}' for name in DeclarationRequest._tracked_attnames()
+        )),
+        PurchaseOrder: ('declaration_request__purchase_order__pk', *(
+            f'declaration_request__purchase_order__{name}' for name in PurchaseOrder._tracked_attnames()
+        )),
+    }
+    rows = Declaration.objects.select_for_update().filter(pk__in=ids).values(
+        *(name for names in fields.values() for name in names)
+    )
+    result = {}
+    for row in rows:
+        split = {}
+        for model, names in fields.items():
+            prefix = names[0][:-len('pk')]
+            split[model] = {name[len(prefix):]: row[name] for name in names}
+        result[row['pk']] = split
+    return result
+
+
+def _can_transition(row, transitions):
+    return all(workflow.can_transition(model, name, row[model]['status']) for model, name in transitions)
+
+
+def review_declarations(user, ids, decision, rejection_reason=''):
+    """신고서 일괄 승인(decision='approve') / 거절(decision='reject')
+
+    ids 순서대로 {'id', 'outcome', 'detail'?} 목록을 반환합니다.
+    outcome 은 approved / rejected, 없는 신고서는 not_found, 전환할 수 없는 상태면 invalid_status 입니다.
+    """
+    transitions = REVIEW_TRANSITIONS[decision]
+    declaration_status = workflow.TRANSITIONS[Declaration][decision][1]
+    ids = list(dict.fromkeys(ids))
+    now = timezone.now()
+
+    with transaction.atomic():
+        rows = _review_rows(ids)
+        results, reviewed = [], []
+        for pk in ids:
+            row = rows.get(pk)
+            if row is None:
+                results.append({'id': pk, 'outcome': 'not_found', 'detail': '존재하지 않는 신고서입니다.'})
+            elif not _can_transition(row, transitions):
+                results.append({
+                    'id': pk, 'outcome': 'invalid_status',
+                    'detail': f"현재 상태({row[Declaration]['status']})에서는 처리할 수 없습니다.",
+                })
+            else:
+                results.append({'id': pk, 'outcome': declaration_status})
+                reviewed.append(row)
+        if not reviewed:
+            return results
+
+        fields = {Declaration: {'approved_by_id': user.id, 'approved_date': now}}
+        if decision == 'reject':
+            fields[Declaration]['rejection_reason'] = rejection_reason
+
+        # 단건 전환과 같은 허용 상태 조건으로 UPDATE - 그 사이 다른 요청이 상태를 바꿨으면 409 로 전체를 되돌린다
+        for model, name in transitions:
+            new_status = workflow.transition_many(
+                model, name, [row[model]['pk'] for row in reviewed], **fields.get(model, {})
+            )
+            changes = [(row[model], dict(row[model], status=new_status)) for row in reviewed]
+            summary.record_changes(model, changes)
+            # 구매 주문은 모든 공급업체에 보인다
+            response_cache.invalidate(model, {
+                scope for old, _ in changes for scope in (
+                    f"customer:{old['customer_id']}",
+                    f"supplier:{old['supplier_id']}" if 'supplier_id' in old else 'supplier',
+                )
+            })
+
+        # 승인 여부가 바뀐 신고서의 유해물질만 인벤토리에 반영
+        ships = {
+            row[Declaration]['pk']: row[Declaration]['ship_id'] for row in reviewed
+            if inventory.INVENTORY_STATUS in (row[Declaration]['status'], declaration_status)
+        }
+        if ships:
+            inventory.refresh_many(
+                (ships[declaration_id], cas_number)
+                for declaration_id, cas_number in HazardousMaterial.objects.filter(
+                    declaration_id__in=ships
+                ).values_list('declaration_id', 'cas_number').distinct().order_by()
+            )
+    return results
@@ -0,0 +1,119 @@
+"""
+신고서 적합성 판정
+
+신고서의 유해물질 중 하나라도 물질 기준값(ComplianceThreshold)을 넘으면 규정 미준수(non_compliant),
+아니면 규정 준수(compliant) 입니다. 기준값이 있는 물질인데 함유율을 적지 않은 행은 초과로 봅니다.
+공급업체가 입력한 값은 쓰지 않고 제출할 때 서버가 판정합니다.
+
+- limits(): 물질 ID → 기준값(%) - 기준값 테이블 전체를 한 번에 조회
+- status_for(materials, limits): (물질 ID, 함유율) 목록의 판정 - 제출 시 저장 전에 메모리에서 계산
+- evaluate(declaration_ids): 신고서 몇 건을 다시 판정 (유해물질 수정/삭제 시)
+- reevaluate(chunk_size): 기준값이 바뀌었을 때 모든 신고서를 다시 판정 (reevaluate_compliance 작업/명령)
+
+evaluate / reevaluate 는 ORM 객체를 만들지 않고 (신고서 ID, 물질 ID, 함유율) 을 NumPy 배열로 읽어
+기준값과 한 번에 비교하고, 판정이 바뀐 신고서만 bulk_update 로 저장합니다.
+bulk_update 는 signal 을 발생시키지 않지만 판정 결과는 요약 건수/인벤토리/검색 색인과 관계가 없습니다.
+응답 캐시는 판정이 바뀐 신고서가 있으면 신고서 캐시 전체를 무효화합니다.
+"""
+import numpy as np
+from django.utils import timezone
+
+from ihm_backend import response_cache
+from .models import ComplianceThreshold, Declaration, HazardousMaterial
+
+COMPLIANT = 'compliant'
+NON_COMPLIANT = 'non_compliant'
+# 초안은 아직 판정하지 않는다 (제출할 때 판정)
+UNEVALUATED_STATUS = 'draft'
+UPDATE_BATCH_SIZE = 1000
+
+
+def limits():
+    """물질 ID → 함유율(%) 단위의 기준값"""
+    return {
+        threshold.substance_id: threshold.percentage
+        for threshold in ComplianceThreshold.objects.only('substance_id', 'value', 'unit')
+    }
+
+
+def status_for(materials, limits):
+    """(물질 ID, 함유율) 목록의 판정"""
+    for substance_id, content_percentage in materials:
+        limit = limits.get(substance_id)
+        if limit is not None and (content_percentage is None or content_percentage > limit):
+            return NON_COMPLIANT
+    return COMPLIANT
+
+
+def _material_arrays(materials):
+    """유해물질 조회 결과 → (신고서 ID, 물질 ID, 함유율) 배열, 물질이 없으면 -1, 함유율이 없으면 NaN"""
+    rows = list(materials.values_list('declaration_id', 'substance_id', 'content_percentage').order_by())
+    declaration_ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+    substance_ids = np.fromiter(
+        (-1 if row[1] is None else row[1] for row in rows), dtype=np.int64, count=len(rows)
+    )
+    contents = np.fromiter(
+        (np.nan if row[2] is None else float(row[2]) for row in rows), dtype=np.float64, count=len(rows)
+    )
+    return declaration_ids, substance_ids, contents
+
+
+def _non_compliant_ids(arrays, limits):
+    """기준값을 넘는 유해물질이 있는 신고서 ID 집합"""
+    declaration_ids, substance_ids, contents = arrays
+    if not limits or not len(declaration_ids):
+        return set()
+    limit_ids = np.array(sorted(limits), dtype=np.int64)
+    limit_values = np.array([float(limits[pk]) for pk in limit_ids.tolist()], dtype=np.float64)
+
+    # 정렬된 기준값 물질 ID 에서 각 행의 물질 위치를 찾는다 (없는 물질은 위치의 ID 가 다름)
+    positions = np.minimum(np.searchsorted(limit_ids, substance_ids), len(limit_ids) - 1)
+    listed = limit_ids[positions] == substance_ids
+    exceeded = listed & (np.isnan(contents) | (contents > limit_values[positions]))
+    return set(np.unique(declaration_ids[exceeded]).tolist())
+
+
+def _apply(current, non_compliant, now):
+    """판정이 바뀐 신고서만 저장, 바뀐 건수 반환
+
+    current 는 신고서 ID → 저장된 판정입니다.
+    """
+    changed = []
+    for pk, old_status in current.items():
+        new_status = NON_COMPLIANT if pk in non_compliant else COMPLIANT
+        if new_status != old_status:
+            changed.append(Declaration(pk=pk, compliance_status=new_status, updated_at=now))
+    Declaration.objects.bulk_update(changed, ['compliance_status', 'updated_at'], batch_size=UPDATE_BATCH_SIZE)
+    if changed:
+        response_cache.invalidate_all(Declaration)
+    return len(changed)
+
+
+def evaluate(declaration_ids):
+    """신고서 몇 건을 다시 판정, 판정이 바뀐 건수 반환"""
+    current = dict(
+        Declaration.objects.filter(pk__in=list(declaration_ids)).exclude(status=UNEVALUATED_STATUS)
+        .values_list('pk', 'compliance_status')
+    )
+    if not current:
+        return 0
+    arrays = _material_arrays(HazardousMaterial.objects.filter(declaration_id__in=list(current)))
+    return _apply(current, _non_compliant_ids(arrays, limits()), timezone.now())
+
+
+def reevaluate(chunk_size=2000):
+    """모든 신고서를 pk 순서로 chunk_size 건씩 다시 판정, 판정이 바뀐 건수 반환"""
+    threshold_limits = limits()
+    now = timezone.now()
+    changed, last_pk = 0, 0
+    while True:
+        current = dict(
+            Declaration.objects.filter(pk__gt=last_pk).exclude(status=UNEVALUATED_STATUS)
+            .order_by('pk').values_list('pk', 'compliance_status')[:chunk_size]
+        )
+        if not current:
+            return changed
+        # 신고서 ID 범위로 조회하면 (declaration, cas_number) 색인을 쓴다 - 초안의 행은 _apply 에서 무시
+        materials = HazardousMaterial.objects.filter(declaration_id__gt=last_pk, declaration_id__lte=max(current))
+        changed += _apply(current, _non_compliant_ids(_material_arrays(materials), threshold_limits), now)
+        last_pk = max(current)
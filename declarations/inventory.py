@@ -0,0 +1,132 @@
+"""
+선박별 유해물질 인벤토리 (IHM Part I) 집계
+
+ShipInventoryItem 은 승인(approved)된 신고서의 유해물질을 (선박, CAS 번호)별로 집계한 테이블입니다.
+declaration_ids 에는 최근(ID 가 큰) 신고서 DECLARATION_IDS_LIMIT 건만 두고, 전체 건수는 declaration_count 에 둡니다.
+
+- refresh(ship_id, cas_numbers): 해당 선박의 지정 CAS 번호만 다시 집계 (승인/거절 시 signals 에서 호출)
+- refresh_many(keys): 여러 (선박, CAS 번호)를 한 번에 다시 집계 (일괄 승인 등 signal 없는 변경 후 호출)
+- rebuild(chunk_size): 선박 pk 구간별로 전체 재집계
+"""
+from collections import defaultdict
+from decimal import Decimal
+from functools import reduce
+from operator import or_
+
+from django.db import transaction
+from django.db.models import Avg, Count, Max, Q
+
+from ships.models import Ship
+from .models import HazardousMaterial, ShipInventoryItem
+
+INVENTORY_STATUS = 'approved'
+ROLLUP_FIELDS = [
+    'material_name', 'item_count', 'max_content_percentage', 'avg_content_percentage',
+    'declaration_count', 'declaration_ids',
+]
+PERCENT = Decimal('0.0001')
+# 갱신마다 다시 쓰는 JSON 목록이 신고서 수만큼 커지지 않도록 제한
+DECLARATION_IDS_LIMIT = 20
+
+# 쿼리 예산(ihm_backend.query_budget)용
+REFRESH_MANY_QUERIES = 4    # 집계 2 (신고서 목록, 수치) + upsert + 집계가 없는 행 삭제
+REFRESH_QUERIES = 1 + REFRESH_MANY_QUERIES  # refresh_declaration: 신고서의 CAS 번호 조회 + refresh_many
+
+
+def _approved_materials():
+    return HazardousMaterial.objects.filter(declaration__status=INVENTORY_STATUS)
+
+
+def _rollup(materials):
+    """materials 를 (선박, CAS 번호)별로 집계한 ShipInventoryItem 목록 (저장 전)"""
+    declarations = defaultdict(set)
+    for ship_id, cas_number, declaration_id in materials.values_list(
+        'declaration__ship_id', 'cas_number', 'declaration_id'
+    ).distinct():
+        declarations[(ship_id, cas_number)].add(declaration_id)
+
+    rows = materials.values('declaration__ship_id', 'cas_number').annotate(
+        material_name_max=Max('material_name'),
+        item_count=Count('pk'),
+        max_content_percentage=Max('content_percentage'),
+        avg_content_percentage=Avg('content_percentage'),
+    ).order_by()
+
+    items = []
+    for row in rows:
+        key = (row['declaration__ship_id'], row['cas_number'])
+        average = row['avg_content_percentage']
+        items.append(ShipInventoryItem(
+            ship_id=key[0],
+            cas_number=key[1],
+            material_name=row['material_name_max'] or '',
+            item_count=row['item_count'],
+            max_content_percentage=row['max_content_percentage'],
+            avg_content_percentage=Decimal(average).quantize(PERCENT) if average is not None else None,
+            declaration_count=len(declarations[key]),
+            declaration_ids=sorted(declarations[key])[-DECLARATION_IDS_LIMIT:],
+        ))
+    return items
+
+
+def refresh(ship_id, cas_numbers):
+    """선박 하나의 지정 CAS 번호 인벤토리를 다시 집계"""
+    refresh_many((ship_id, cas_number) for cas_number in cas_numbers)
+
+
+@transaction.atomic(savepoint=False)
+def refresh_many(keys):
+    """여러 (선박, CAS 번호)를 한 번에 다시 집계
+
+    선박 목록 × CAS 번호 목록 전체를 집계하므로 keys 보다 넓은 범위가 갱신될 수 있지만,
+    각 키는 처음부터 다시 계산되므로 결과는 같습니다.
+    """
+    keys = set(keys)
+    if not keys:
+        return
+    ship_ids = {ship_id for ship_id, _ in keys}
+    cas_numbers = {cas_number for _, cas_number in keys}
+    items = _rollup(_approved_materials().filter(declaration__ship_id__in=ship_ids, cas_number__in=cas_numbers))
+    if items:
+        ShipInventoryItem.objects.bulk_create(
+            items, update_conflicts=True,
+            unique_fields=['ship', 'cas_number'], update_fields=[*ROLLUP_FIELDS, 'updated_at'],
+        )
+    if len(items) == len(ship_ids) * len(cas_numbers):
+        return
+
+    # 집계 결과가 없는 (선박, CAS 번호) 행은 삭제
+    remaining = defaultdict(set)
+    for item in items:
+        remaining[item.ship_id].add(item.cas_number)
+    stale = ShipInventoryItem.objects.filter(ship_id__in=ship_ids, cas_number__in=cas_numbers)
+    if remaining:
+        stale = stale.exclude(reduce(or_, [
+            Q(ship_id=ship_id, cas_number__in=cas) for ship_id, cas in remaining.items()
+        ]))
+    stale.delete()
+
+
+def refresh_declaration(declaration, ship_ids=None):
+    """신고서 하나가 기여하는 (선박, CAS 번호)를 다시 집계"""
+    cas_numbers = set(declaration.hazardous_materials.values_list('cas_number', flat=True))
+    for ship_id in ship_ids or [declaration.ship_id]:
+        refresh(ship_id, cas_numbers)
+
+
+def rebuild(chunk_size=200):
+    """선박 pk 구간별로 전체 인벤토리 재집계, 처리한 선박 수 반환"""
+    processed = 0
+    last_pk = 0
+    while True:
+        ship_ids = list(
+            Ship.objects.filter(pk__gt=last_pk).order_by('pk').values_list('pk', flat=True)[:chunk_size]
+        )
+        if not ship_ids:
+            return processed
+        items = _rollup(_approved_materials().filter(declaration__ship_id__in=ship_ids))
+        with transaction.atomic():
+            ShipInventoryItem.objects.filter(ship_id__in=ship_ids).delete()
+            ShipInventoryItem.objects.bulk_create(items)
+        processed += len(ship_ids)
+        last_pk = ship_ids[-1]
@@ -0,0 +1,19 @@
+"""
+Django management command that links existing hazardous material rows to the substance registry
+Usage: python manage.py backfill_substances [--chunk-size 1000]
+"""
+from django.core.management.base import BaseCommand
+from declarations.substances import backfill
+
+
+class Command(BaseCommand):
+    help = 'Map hazardous_materials rows without a substance to the registry by normalized CAS number'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000, help='Rows per batch')
+
+    def handle(self, *args, **options):
+        mapped, skipped = backfill(chunk_size=options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Linked {mapped} hazardous materials to substances, skipped {skipped} without a valid CAS number.'
+        ))
@@ -0,0 +1,179 @@
+"""
+Django management command that compares how many concurrent dashboard reads one worker serves
+with the sync views (WSGI worker with a fixed thread count) and the async views (ASGI worker)
+Usage: python manage.py benchmark_async_reads [--concurrency 1 8 32] [--requests 200] [--threads 4] [--latency 5]
+       python manage.py benchmark_async_reads --base-url http://127.0.0.1:8000 [--concurrency 8 32]
+"""
+import asyncio
+import statistics
+import threading
+import time
+import types
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import ThreadSensitiveContext
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.test import AsyncClient, Client, override_settings
+from django.urls import include, path
+
+from ihm_backend.async_views import async_routes
+from ships import urls as ship_urls
+from ships.models import Ship
+from users.authentication import ClaimsTokenObtainPairSerializer
+from declarations import urls as declaration_urls
+
+
+def urlconf(enabled):
+    """조회 라우트만 있는 URLconf - enabled 이면 async view"""
+    module = types.ModuleType(f'benchmark_urls_{"async" if enabled else "sync"}')
+    module.urlpatterns = [
+        path('api/', include(async_routes(ship_urls.router.urls, enabled=enabled))),
+        path('api/', include(async_routes(declaration_urls.router.urls, enabled=enabled))),
+    ]
+    return module
+
+
+class DatabaseLatency:
+    """모든 쿼리 앞에서 latency 초 대기 (네트워크 너머의 DB 흉내)"""
+
+    def __init__(self, latency):
+        self.latency = latency
+
+    def __call__(self, execute, sql, params, many, context):
+        time.sleep(self.latency)
+        return execute(sql, params, many, context)
+
+    def install(self, sender=None, connection=None, **kwargs):
+        # 요청 중에 연결되면 QueryBudgetMixin 의 execute_wrapper() 가 끝에서 pop 하므로 맨 앞에 둔다
+        if connection is not None and self not in connection.execute_wrappers:
+            connection.execute_wrappers.insert(0, self)
+
+    def __enter__(self):
+        if self.latency:
+            connection_created.connect(self.install)
+            self.install(connection=connections['default'])
+        return self
+
+    def __exit__(self, *exc):
+        connection_created.disconnect(self.install)
+        if self in connections['default'].execute_wrappers:
+            connections['default'].execute_wrappers.remove(self)
+
+
+class Command(BaseCommand):
+    help = 'Compare concurrent read throughput of the sync and async views at a fixed worker size'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 8, 32],
+                            help='Concurrent clients for each run')
+        parser.add_argument('--requests', type=int, default=200, help='Requests per run')
+        parser.add_argument('--threads', type=int, default=4,
+                            help='Threads of the sync worker (gunicorn --threads)')
+        parser.add_argument('--latency', type=float, default=5,
+                            help='Milliseconds added to every query to model a network database (in-process only)')
+        parser.add_argument('--username', help='User to authenticate as (default: the first operator)')
+        parser.add_argument('--base-url',
+                            help='Benchmark a running server instead, e.g. http://127.0.0.1:8000')
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        users = User.objects.order_by('pk')
+        user = (users.filter(username=options['username']) if options['username']
+                else users.filter(user_type='operator')).first()
+        if user is None:
+            raise CommandError('No user to authenticate as; pass --username')
+        ship = Ship.objects.order_by('pk').first()
+        if ship is None:
+            raise CommandError('No ships to read; load data first')
+        token = str(ClaimsTokenObtainPairSerializer.get_token(user).access_token)
+        urls = [
+            '/api/dashboard/summary/', '/api/declarations/', '/api/purchase-orders/',
+            '/api/ships/', f'/api/ships/{ship.pk}/inventory/',
+        ]
+        self.stdout.write(f'user: {user.username} ({user.user_type}), endpoints: {", ".join(urls)}')
+        self.stdout.write(f'{"server":<20}{"clients":>8}{"req/s":>10}{"p50 ms":>10}{"p95 ms":>10}')
+
+        for concurrency in options['concurrency']:
+            plan = [urls[i % len(urls)] for i in range(options['requests'])]
+            if options['base_url']:
+                self.report('server', concurrency, *self.run_server(options['base_url'], token, plan, concurrency))
+                continue
+            # 응답 캐시를 끄고 매 요청 DB 를 읽는다 (테스트 클라이언트의 Host 는 testserver)
+            in_process = override_settings(RESPONSE_CACHE_TIMEOUT=0, ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver'])
+            with in_process, DatabaseLatency(options['latency'] / 1000):
+                with override_settings(ROOT_URLCONF=urlconf(False)):
+                    result = self.run_sync(token, plan, concurrency, options['threads'])
+                self.report(f'wsgi (threads={options["threads"]})', concurrency, *result)
+                with override_settings(ROOT_URLCONF=urlconf(True)):
+                    result = asyncio.run(self.run_async(token, plan, concurrency))
+                self.report('asgi', concurrency, *result)
+
+    def report(self, name, concurrency, elapsed, latencies):
+        latencies = sorted(latencies)
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        self.stdout.write(
+            f'{name:<20}{concurrency:>8}{len(latencies) / elapsed:>10,.0f}'
+            f'{statistics.median(latencies) * 1000:>10.1f}{p95 * 1000:>10.1f}'
+        )
+
+    @staticmethod
+    def ensure_ok(url, status):
+        if status != 200:
+            raise CommandError(f'GET {url} returned {status}')
+
+    def run_sync(self, token, plan, concurrency, threads):
+        """clients 개의 동시 요청을 스레드 threads 개인 WSGI 워커가 처리"""
+        slots = threading.BoundedSemaphore(threads)
+        local = threading.local()
+
+        def get(url):
+            client = getattr(local, 'client', None) or Client(headers={'authorization': f'Bearer {token}'})
+            local.client = client
+            started = time.perf_counter()
+            with slots:
+                response = client.get(url)
+            self.ensure_ok(url, response.status_code)
+            return time.perf_counter() - started
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(concurrency) as pool:
+            latencies = list(pool.map(get, plan))
+        return time.perf_counter() - started, latencies
+
+    async def run_async(self, token, plan, concurrency):
+        """clients 개의 동시 요청을 ASGI 워커 하나(이벤트 루프)가 처리"""
+        client = AsyncClient()
+        headers = {'authorization': f'Bearer {token}'}
+        clients = asyncio.Semaphore(concurrency)
+
+        async def get(url):
+            # ASGIHandler 처럼 요청마다 별도 스레드에서 sync 코드(ORM 포함)를 실행
+            async with clients, ThreadSensitiveContext():
+                started = time.perf_counter()
+                response = await client.get(url, headers=headers)
+            self.ensure_ok(url, response.status_code)
+            return time.perf_counter() - started
+
+        started = time.perf_counter()
+        latencies = await asyncio.gather(*(get(url) for url in plan))
+        return time.perf_counter() - started, latencies
+
+    def run_server(self, base_url, token, plan, concurrency):
+        """실행 중인 서버(gunicorn sync 워커 또는 uvicorn 워커)에 clients 개의 동시 요청"""
+        def get(url):
+            request = urllib.request.Request(base_url.rstrip('/') + url, headers={'Authorization': f'Bearer {token}'})
+            started = time.perf_counter()
+            with urllib.request.urlopen(request) as response:
+                response.read()
+                self.ensure_ok(url, response.status)
+            return time.perf_counter() - started
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(concurrency) as pool:
+            latencies = list(pool.map(get, plan))
+        return time.perf_counter() - started, latencies
@@ -0,0 +1,144 @@
+"""
+Django management command that measures list rendering throughput (rows/sec) of the
+Serializer + JSONRenderer path against the .values() + compiled row function + FastJSONRenderer path
+Usage: python manage.py benchmark_list_rendering [--seed 5000] [--repeat 5]
+"""
+import json
+import time
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from ihm_backend.fast_list import compile_serializer
+from ihm_backend.query_planner import plan_serializer
+from ihm_backend.renderers import FastJSONRenderer, orjson
+from ships.models import Ship
+from ships.serializers import ShipListSerializer
+from users.models import Customer, Supplier
+from declarations.models import PurchaseOrder, DeclarationRequest, Declaration
+from declarations.serializers import DeclarationListSerializer, PurchaseOrderListSerializer
+
+CASES = [
+    ('ships', Ship, ShipListSerializer),
+    ('purchase-orders', PurchaseOrder, PurchaseOrderListSerializer),
+    ('declarations', Declaration, DeclarationListSerializer),
+]
+
+
+class Rollback(Exception):
+    pass
+
+
+def planned(queryset, serializer):
+    """ViewSet.plan_queryset 과 같은 select_related / only()"""
+    plan = plan_serializer(serializer, queryset.model)
+    if plan.select_related:
+        queryset = queryset.select_related(*sorted(plan.select_related))
+    if plan.complete and plan.only:
+        ordering = [name.lstrip('-') for name in queryset.model._meta.ordering]
+        queryset = queryset.only(*plan.only, *ordering)
+    return queryset
+
+
+def render_serializer(queryset, serializer_class):
+    queryset = planned(queryset, serializer_class())
+    return JSONRenderer().render(serializer_class(queryset, many=True).data)
+
+
+def render_fast(queryset, serializer_class):
+    compiled = compile_serializer(serializer_class(), queryset.model)
+    return FastJSONRenderer().render(compiled.serialize(compiled.values(queryset)))
+
+
+def seed(n):
+    """선박/구매 주문/신고서 요청/신고서 n 건씩 (bulk_create)"""
+    User = get_user_model()
+    stamp = time.time_ns()
+    customer = Customer.objects.create(
+        user=User.objects.create(username=f'bench-customer-{stamp}', user_type='customer'), company_name='Benchmark Customer',
+        business_number=f'BC-{stamp}', contact_person='담당자', contact_phone='010-0000-0000',
+        contact_email='bench-customer@example.com',
+    )
+    supplier = Supplier.objects.create(
+        user=User.objects.create(username=f'bench-supplier-{stamp}', user_type='supplier'), company_name='Benchmark Supplier',
+        business_number=f'BS-{stamp}', contact_person='담당자', contact_phone='010-0000-0000',
+        contact_email='bench-supplier@example.com',
+    )
+    Ship.objects.bulk_create([
+        Ship(customer=customer, ship_name=f'Ship {i}', imo_number=f'B{stamp % 10**8}-{i}', ship_type='Bulk')
+        for i in range(n)
+    ])
+    ships = list(Ship.objects.filter(customer=customer).values_list('pk', flat=True))
+    PurchaseOrder.objects.bulk_create([
+        PurchaseOrder(
+            ship_id=ships[i], customer=customer, order_number=f'BPO-{stamp}-{i}', title=f'Order {i}',
+            item_name='Gasket', quantity=i, unit='EA', order_date=date(2026, 1, 1), status='requested',
+        )
+        for i in range(n)
+    ])
+    orders = PurchaseOrder.objects.filter(customer=customer).values_list('pk', 'ship_id')
+    DeclarationRequest.objects.bulk_create([
+        DeclarationRequest(purchase_order_id=pk, supplier=supplier, customer=customer, status='submitted')
+        for pk, _ in orders
+    ])
+    requests = DeclarationRequest.objects.filter(customer=customer).values_list('pk', 'purchase_order__ship_id')
+    now = timezone.now()
+    Declaration.objects.bulk_create([
+        Declaration(
+            declaration_request_id=pk, supplier=supplier, ship_id=ship_id, customer=customer,
+            declaration_number=f'BMD-{stamp}-{pk}', title=f'Declaration {pk}', declaration_type='MD',
+            status='submitted', submitted_date=now,
+        )
+        for pk, ship_id in requests
+    ])
+
+
+class Command(BaseCommand):
+    help = 'Compare list rendering rows/sec of Serializer + JSONRenderer and the .values() fast path'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=0,
+                            help='Create this many rows per table for the run (rolled back afterwards)')
+        parser.add_argument('--repeat', type=int, default=5, help='Runs per path; the fastest run is reported')
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                if options['seed']:
+                    seed(options['seed'])
+                self.run(options['repeat'])
+                raise Rollback
+        except Rollback:
+            pass
+
+    def run(self, repeat):
+        self.stdout.write(f'JSON encoder: {"orjson " + orjson.__version__ if orjson else "json (stdlib)"}')
+        self.stdout.write(f'{"list":<16}{"rows":>8}{"before rows/s":>16}{"after rows/s":>16}{"speedup":>10}')
+        for name, model, serializer_class in CASES:
+            queryset = model.objects.all()
+            rows = queryset.count()
+            if not rows:
+                raise CommandError(f'No {name} rows; run with --seed N')
+            before, after = (
+                min(self.timed(render, queryset, serializer_class) for _ in range(repeat))
+                for render in (render_serializer, render_fast)
+            )
+            outputs = [
+                sorted(json.loads(render(queryset, serializer_class)), key=lambda row: row['id'])
+                for render in (render_serializer, render_fast)
+            ]
+            if outputs[0] != outputs[1]:
+                raise CommandError(f'{name}: fast path output differs from the serializer')
+            self.stdout.write(
+                f'{name:<16}{rows:>8}{rows / before:>16,.0f}{rows / after:>16,.0f}{before / after:>9.1f}x'
+            )
+
+    @staticmethod
+    def timed(render, queryset, serializer_class):
+        started = time.perf_counter()
+        render(queryset, serializer_class)
+        return time.perf_counter() - started
@@ -0,0 +1,27 @@
+"""
+Django management command to compare the dashboard summary counters with GROUP BY results
+Usage: python manage.py check_dashboard_summary [--fix]
+"""
+from django.core.management.base import BaseCommand, CommandError
+from declarations.summary import find_mismatches, rebuild
+
+
+class Command(BaseCommand):
+    help = 'Fail if any dashboard counter differs from the source tables'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--fix', action='store_true', help='Rebuild the counters when drift is found')
+
+    def handle(self, *args, **options):
+        mismatches = find_mismatches()
+        for table, key, stored, expected in mismatches:
+            self.stdout.write(self.style.ERROR(f'DRIFT {table} {key}: stored={stored} actual={expected}'))
+
+        if not mismatches:
+            self.stdout.write(self.style.SUCCESS('Dashboard summary matches the source tables.'))
+            return
+        if options['fix']:
+            rebuild()
+            self.stdout.write(self.style.SUCCESS(f'Rebuilt after {len(mismatches)} mismatches.'))
+            return
+        raise CommandError(f'{len(mismatches)} dashboard counters are out of sync')
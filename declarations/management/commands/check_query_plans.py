@@ -0,0 +1,28 @@
+"""
+Django management command to verify that list queries still use their composite indexes
+Usage: python manage.py check_query_plans [--verbose-plans]
+"""
+from django.core.management.base import BaseCommand, CommandError
+from declarations.query_plans import check_query_plans
+
+
+class Command(BaseCommand):
+    help = 'Run EXPLAIN on known list queries and fail if any stops using its index'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--verbose-plans', action='store_true', help='Print the full EXPLAIN output')
+
+    def handle(self, *args, **options):
+        failures = []
+        for name, index_name, ok, plan in check_query_plans():
+            if ok:
+                self.stdout.write(self.style.SUCCESS(f'OK    {name} ({index_name})'))
+            else:
+                failures.append(name)
+                self.stdout.write(self.style.ERROR(f'FAIL  {name} (expected {index_name})'))
+            if options['verbose_plans'] or not ok:
+                self.stdout.write(plan)
+
+        if failures:
+            raise CommandError(f'{len(failures)} list queries no longer use their index')
+        self.stdout.write(self.style.SUCCESS('All list queries use their indexes.'))
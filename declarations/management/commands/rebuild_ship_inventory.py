@@ -0,0 +1,17 @@
+"""
+Django management command to recompute the per-ship hazardous material inventory
+Usage: python manage.py rebuild_ship_inventory [--chunk-size 200]
+"""
+from django.core.management.base import BaseCommand
+from declarations.inventory import rebuild
+
+
+class Command(BaseCommand):
+    help = 'Recompute ship_inventory_items from approved declarations, a chunk of ships at a time'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=200, help='Ships per transaction')
+
+    def handle(self, *args, **options):
+        processed = rebuild(chunk_size=options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt inventory for {processed} ships.'))
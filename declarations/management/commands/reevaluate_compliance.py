@@ -0,0 +1,17 @@
+"""
+Django management command that re-derives every declaration's compliance status from the threshold table
+Usage: python manage.py reevaluate_compliance [--chunk-size 2000]
+"""
+from django.core.management.base import BaseCommand
+from declarations.compliance import reevaluate
+
+
+class Command(BaseCommand):
+    help = 'Re-evaluate compliance_status of all submitted declarations against compliance_thresholds'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=2000, help='Declarations per batch')
+
+    def handle(self, *args, **options):
+        changed = reevaluate(chunk_size=options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(f'Updated compliance status of {changed} declarations.'))
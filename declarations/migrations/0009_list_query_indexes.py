@@ -0,0 +1,49 @@
+# Generated by Django 5.2.8 on 2026-10-18 07:59
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('declarations', '0008_alter_hazardousmaterial_content_percentage_and_more'),
+        ('ships', '0002_initial'),
+        ('users', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='declaration',
+            index=models.Index(fields=['supplier', 'status', 'created_at'], name='decl_supplier_status_crtd_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='declaration',
+            index=models.Index(fields=['ship', 'status', 'created_at'], name='decl_ship_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='declaration',
+            index=models.Index(fields=['status', 'created_at'], name='decl_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='declarationrequest',
+            index=models.Index(fields=['supplier', 'status', 'created_at'], name='dr_supplier_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='declarationrequest',
+            index=models.Index(fields=['status', 'created_at'], name='dr_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='hazardousmaterial',
+            index=models.Index(fields=['declaration', 'cas_number'], name='hazmat_declaration_cas_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='purchaseorder',
+            index=models.Index(fields=['ship', 'status', 'created_at'], name='po_ship_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='purchaseorder',
+            index=models.Index(fields=['status', 'created_at'], name='po_status_created_idx'),
+        ),
+    ]
@@ -0,0 +1,86 @@
+# Generated by Django 5.2.8 on 2026-10-18 08:13
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models, transaction
+from django.db.models import OuterRef, Subquery
+
+BACKFILL_CHUNK_SIZE = 2000
+
+# (모델, customer_id 를 읽을 경로) - 상위 행이 먼저 채워지도록 순서 유지
+BACKFILL_SOURCES = [
+    ('PurchaseOrder', 'ship__customer_id'),
+    ('DeclarationRequest', 'purchase_order__ship__customer_id'),
+    ('Declaration', 'ship__customer_id'),
+    ('HazardousMaterial', 'declaration__ship__customer_id'),
+]
+
+
+def backfill_customer(apps, schema_editor):
+    """pk 구간별로 나누어 customer_id 채우기 (구간마다 커밋하여 긴 잠금 방지)"""
+    for model_name, source in BACKFILL_SOURCES:
+        model = apps.get_model('declarations', model_name)
+        customer_id = Subquery(model.objects.filter(pk=OuterRef('pk')).values(source)[:1])
+        last_pk = 0
+        while True:
+            pks = list(
+                model.objects.filter(pk__gt=last_pk).order_by('pk')
+                .values_list('pk', flat=True)[:BACKFILL_CHUNK_SIZE]
+            )
+            if not pks:
+                break
+            with transaction.atomic():
+                model.objects.filter(pk__in=pks).update(customer_id=customer_id)
+            last_pk = pks[-1]
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('declarations', '0009_list_query_indexes'),
+        ('ships', '0002_initial'),
+        ('users', '0002_user_token_version'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='declaration',
+            name='customer',
+            field=models.ForeignKey(blank=True, db_index=False, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='users.customer', verbose_name='고객사'),
+        ),
+        migrations.AddField(
+            model_name='declarationrequest',
+            name='customer',
+            field=models.ForeignKey(blank=True, db_index=False, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='users.customer', verbose_name='고객사'),
+        ),
+        migrations.AddField(
+            model_name='hazardousmaterial',
+            name='customer',
+            field=models.ForeignKey(blank=True, db_index=False, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='users.customer', verbose_name='고객사'),
+        ),
+        migrations.AddField(
+            model_name='purchaseorder',
+            name='customer',
+            field=models.ForeignKey(blank=True, db_index=False, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='users.customer', verbose_name='고객사'),
+        ),
+        migrations.RunPython(backfill_customer, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='declaration',
+            index=models.Index(fields=['customer', 'status', 'created_at'], name='decl_customer_status_crtd_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='declarationrequest',
+            index=models.Index(fields=['customer', 'status', 'created_at'], name='dr_customer_status_crtd_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='hazardousmaterial',
+            index=models.Index(fields=['customer', 'cas_number'], name='hazmat_customer_cas_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='purchaseorder',
+            index=models.Index(fields=['customer', 'status', 'created_at'], name='po_customer_status_crtd_idx'),
+        ),
+    ]
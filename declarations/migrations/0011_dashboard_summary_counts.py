@@ -0,0 +1,46 @@
+# Generated by Django 5.2.8 on 2026-10-18 08:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('declarations', '0010_denormalized_customer'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DueDateCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope', models.CharField(choices=[('all', '전체'), ('customer', '고객사'), ('supplier', '공급업체')], max_length=10, verbose_name='범위')),
+                ('scope_id', models.PositiveBigIntegerField(default=0, verbose_name='범위 ID')),
+                ('due_date', models.DateField(verbose_name='마감일')),
+                ('count', models.IntegerField(default=0, verbose_name='건수')),
+            ],
+            options={
+                'verbose_name': '마감일별 건수',
+                'verbose_name_plural': '마감일별 건수',
+                'db_table': 'dashboard_due_date_counts',
+                'constraints': [models.UniqueConstraint(fields=('scope', 'scope_id', 'due_date'), name='due_date_count_key')],
+            },
+        ),
+        migrations.CreateModel(
+            name='StatusCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope', models.CharField(choices=[('all', '전체'), ('customer', '고객사'), ('supplier', '공급업체')], max_length=10, verbose_name='범위')),
+                ('scope_id', models.PositiveBigIntegerField(default=0, verbose_name='범위 ID')),
+                ('entity', models.CharField(max_length=30, verbose_name='대상')),
+                ('status', models.CharField(max_length=20, verbose_name='상태')),
+                ('count', models.IntegerField(default=0, verbose_name='건수')),
+            ],
+            options={
+                'verbose_name': '상태별 건수',
+                'verbose_name_plural': '상태별 건수',
+                'db_table': 'dashboard_status_counts',
+                'constraints': [models.UniqueConstraint(fields=('scope', 'scope_id', 'entity', 'status'), name='status_count_key')],
+            },
+        ),
+    ]
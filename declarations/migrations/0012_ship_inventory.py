@@ -0,0 +1,37 @@
+# Generated by Django 5.2.8 on 2026-10-18 08:18
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('declarations', '0011_dashboard_summary_counts'),
+        ('ships', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ShipInventoryItem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('cas_number', models.CharField(blank=True, max_length=50, verbose_name='CAS 번호')),
+                ('material_name', models.CharField(blank=True, max_length=200, verbose_name='물질명')),
+                ('item_count', models.PositiveIntegerField(default=0, verbose_name='품목 수')),
+                ('max_content_percentage', models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True, verbose_name='최대 함유율 (%)')),
+                ('avg_content_percentage', models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True, verbose_name='평균 함유율 (%)')),
+                ('declaration_count', models.PositiveIntegerField(default=0, verbose_name='신고서 수')),
+                ('declaration_ids', models.JSONField(default=list, verbose_name='신고서 ID 목록')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='수정일')),
+                ('ship', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='inventory_items', to='ships.ship', verbose_name='선박')),
+            ],
+            options={
+                'verbose_name': '선박 유해물질 인벤토리',
+                'verbose_name_plural': '선박 유해물질 인벤토리',
+                'db_table': 'ship_inventory_items',
+                'ordering': ['cas_number'],
+                'constraints': [models.UniqueConstraint(fields=('ship', 'cas_number'), name='ship_inventory_cas_key')],
+            },
+        ),
+    ]
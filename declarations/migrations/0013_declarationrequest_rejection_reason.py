@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-18 08:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('declarations', '0012_ship_inventory'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='declarationrequest',
+            name='rejection_reason',
+            field=models.TextField(blank=True, verbose_name='거절 사유'),
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.2.8 on 2026-10-18 08:30
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('declarations', '0013_declarationrequest_rejection_reason'),
+        ('ships', '0002_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReportArtifact',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('content_hash', models.CharField(max_length=64, unique=True, verbose_name='내용 해시')),
+                ('document', models.JSONField(verbose_name='보고서 (JSON)')),
+                ('html', models.TextField(verbose_name='보고서 (HTML)')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='생성일')),
+            ],
+            options={
+                'verbose_name': '보고서 결과물',
+                'verbose_name_plural': '보고서 결과물',
+                'db_table': 'report_artifacts',
+            },
+        ),
+        migrations.CreateModel(
+            name='ShipReport',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('queued', '대기'), ('running', '생성 중'), ('done', '완료'), ('failed', '실패')], default='queued', max_length=20, verbose_name='상태')),
+                ('reused', models.BooleanField(default=False, verbose_name='이전 결과 재사용')),
+                ('error', models.TextField(blank=True, verbose_name='오류')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='요청일')),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name='시작일')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='완료일')),
+                ('artifact', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='reports', to='declarations.reportartifact', verbose_name='결과물')),
+                ('requested_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='ship_reports', to=settings.AUTH_USER_MODEL, verbose_name='요청자')),
+                ('ship', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reports', to='ships.ship', verbose_name='선박')),
+            ],
+            options={
+                'verbose_name': '선박 보고서',
+                'verbose_name_plural': '선박 보고서',
+                'db_table': 'ship_reports',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'created_at'], name='ship_report_status_crtd_idx'), models.Index(fields=['ship', 'status'], name='ship_report_ship_status_idx')],
+            },
+        ),
+    ]
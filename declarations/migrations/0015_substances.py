@@ -0,0 +1,69 @@
+# Generated by Django 5.2.8 on 2026-10-18 08:39
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('declarations', '0014_ship_reports'),
+        ('users', '0002_user_token_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Substance',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('cas_number', models.CharField(max_length=12, unique=True, verbose_name='CAS 번호')),
+                ('name', models.CharField(max_length=200, verbose_name='대표 물질명')),
+                ('synonyms', models.JSONField(blank=True, default=list, verbose_name='동의어')),
+                ('hkc_table', models.CharField(blank=True, choices=[('', '해당 없음'), ('A', 'Table A (금지/제한)'), ('B', 'Table B (목록 작성 대상)')], max_length=1, verbose_name='홍콩협약 목록')),
+                ('eu_srr_annex', models.CharField(blank=True, choices=[('', '해당 없음'), ('I', 'Annex I (금지/제한)'), ('II', 'Annex II (목록 작성 대상)')], max_length=2, verbose_name='EU SRR 부속서')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='생성일')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='수정일')),
+            ],
+            options={
+                'verbose_name': '물질',
+                'verbose_name_plural': '물질 등록부',
+                'db_table': 'substances',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='SubstanceName',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=200, verbose_name='이름')),
+                ('search_key', models.CharField(max_length=200, verbose_name='검색 키')),
+            ],
+            options={
+                'verbose_name': '물질 이름',
+                'verbose_name_plural': '물질 이름',
+                'db_table': 'substance_names',
+            },
+        ),
+        migrations.AddField(
+            model_name='hazardousmaterial',
+            name='substance',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='hazardous_materials', to='declarations.substance', verbose_name='물질'),
+        ),
+        migrations.AddIndex(
+            model_name='hazardousmaterial',
+            index=models.Index(fields=['customer', 'substance'], name='hazmat_customer_subst_idx'),
+        ),
+        migrations.AddField(
+            model_name='substancename',
+            name='substance',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='names', to='declarations.substance', verbose_name='물질'),
+        ),
+        migrations.AddIndex(
+            model_name='substancename',
+            index=models.Index(fields=['search_key'], name='substance_name_key_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='substancename',
+            constraint=models.UniqueConstraint(fields=('substance', 'search_key'), name='substance_name_unique'),
+        ),
+    ]
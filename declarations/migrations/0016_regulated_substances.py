@@ -0,0 +1,56 @@
+from django.db import migrations
+
+# (CAS 번호, 대표 물질명, 동의어, 홍콩협약 목록, EU SRR 부속서)
+REGULATED_SUBSTANCES = [
+    ('1332-21-4', 'Asbestos', ['석면'], 'A', 'I'),
+    ('12001-29-5', 'Chrysotile', ['백석면', 'White asbestos'], 'A', 'I'),
+    ('1336-36-3', 'Polychlorinated biphenyls', ['PCB', 'PCBs', '폴리염화비페닐'], 'A', 'I'),
+    ('75-69-4', 'Trichlorofluoromethane', ['CFC-11', 'R-11'], 'A', 'I'),
+    ('75-71-8', 'Dichlorodifluoromethane', ['CFC-12', 'R-12'], 'A', 'I'),
+    ('353-59-3', 'Bromochlorodifluoromethane', ['Halon 1211'], 'A', 'I'),
+    ('75-63-8', 'Bromotrifluoromethane', ['Halon 1301'], 'A', 'I'),
+    ('75-45-6', 'Chlorodifluoromethane', ['HCFC-22', 'R-22'], 'A', 'I'),
+    ('56-35-9', 'Bis(tributyltin) oxide', ['TBTO', 'Tributyltin oxide', '트리부틸주석'], 'A', 'I'),
+    ('28159-98-0', 'Cybutryne', ['Irgarol 1051'], 'A', 'I'),
+    ('1763-23-1', 'Perfluorooctane sulfonic acid', ['PFOS', '과불화옥탄술폰산'], '', 'I'),
+    ('7440-43-9', 'Cadmium', ['카드뮴', 'Cd'], 'B', 'II'),
+    ('18540-29-9', 'Chromium(VI)', ['Hexavalent chromium', '6가 크롬'], 'B', 'II'),
+    ('7439-92-1', 'Lead', ['납', 'Pb'], 'B', 'II'),
+    ('7439-97-6', 'Mercury', ['수은', 'Hg'], 'B', 'II'),
+    ('59536-65-1', 'Polybrominated biphenyls', ['PBB', 'PBBs'], 'B', 'II'),
+    ('1163-19-5', 'Decabromodiphenyl ether', ['DecaBDE', 'PBDE'], 'B', 'II'),
+    ('85535-84-8', 'Short-chain chlorinated paraffins', ['SCCP', 'Alkanes, C10-13, chloro'], 'B', 'II'),
+    ('25637-99-4', 'Hexabromocyclododecane', ['HBCDD', 'HBCD'], '', 'II'),
+]
+
+
+def search_key(name):
+    return ' '.join(name.split()).casefold()
+
+
+def load_substances(apps, schema_editor):
+    Substance = apps.get_model('declarations', 'Substance')
+    SubstanceName = apps.get_model('declarations', 'SubstanceName')
+    for cas_number, name, synonyms, hkc_table, eu_srr_annex in REGULATED_SUBSTANCES:
+        substance, _ = Substance.objects.update_or_create(
+            cas_number=cas_number,
+            defaults={'name': name, 'synonyms': synonyms, 'hkc_table': hkc_table, 'eu_srr_annex': eu_srr_annex},
+        )
+        SubstanceName.objects.filter(substance=substance).delete()
+        keys = {}
+        for value in [name, *synonyms]:
+            keys.setdefault(search_key(value), value)
+        SubstanceName.objects.bulk_create(
+            [SubstanceName(substance=substance, name=value, search_key=key) for key, value in keys.items()]
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('declarations', '0015_substances'),
+    ]
+
+    operations = [
+        migrations.RunPython(load_substances, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 5.2.8 on 2026-10-18 08:53
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# 금지/제한 물질(홍콩협약 Table A, EU SRR Annex I)의 기준값 - (CAS 번호, 기준값, 단위, 근거)
+# 목록 작성 대상(Table B)의 기준값은 인벤토리 기재 여부 기준이라 적합성 판정에는 넣지 않는다
+THRESHOLDS = [
+    ('1332-21-4', '0.1', 'percent', 'HKC Table A / MEPC.379(80)'),
+    ('12001-29-5', '0.1', 'percent', 'HKC Table A / MEPC.379(80)'),
+    ('1336-36-3', '50', 'mg_kg', 'HKC Table A / MEPC.379(80)'),
+    # 오존층 파괴 물질은 기준값 없음 - 함유 자체가 미준수
+    ('75-69-4', '0', 'percent', 'HKC Table A (ODS, no threshold)'),
+    ('75-71-8', '0', 'percent', 'HKC Table A (ODS, no threshold)'),
+    ('353-59-3', '0', 'percent', 'HKC Table A (ODS, no threshold)'),
+    ('75-63-8', '0', 'percent', 'HKC Table A (ODS, no threshold)'),
+    ('75-45-6', '0', 'percent', 'HKC Table A (ODS, no threshold)'),
+    ('56-35-9', '2500', 'mg_kg', 'HKC Table A (anti-fouling, total tin)'),
+    ('28159-98-0', '1000', 'mg_kg', 'HKC Table A (anti-fouling)'),
+    ('1763-23-1', '10', 'mg_kg', 'EU SRR Annex I (Regulation (EU) 2019/1021)'),
+]
+
+
+def load_thresholds(apps, schema_editor):
+    Substance = apps.get_model('declarations', 'Substance')
+    ComplianceThreshold = apps.get_model('declarations', 'ComplianceThreshold')
+    substance_ids = dict(
+        Substance.objects.filter(cas_number__in=[row[0] for row in THRESHOLDS]).values_list('cas_number', 'pk')
+    )
+    for cas_number, value, unit, basis in THRESHOLDS:
+        if cas_number in substance_ids:
+            ComplianceThreshold.objects.update_or_create(
+                substance_id=substance_ids[cas_number], defaults={'value': value, 'unit': unit, 'basis': basis}
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('declarations', '0016_regulated_substances'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ComplianceThreshold',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('value', models.DecimalField(decimal_places=4, max_digits=10, verbose_name='기준값')),
+                ('unit', models.CharField(choices=[('percent', '%'), ('mg_kg', 'mg/kg')], default='percent', max_length=10, verbose_name='단위')),
+                ('basis', models.CharField(blank=True, max_length=200, verbose_name='근거')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='수정일')),
+                ('substance', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='threshold', to='declarations.substance', verbose_name='물질')),
+            ],
+            options={
+                'verbose_name': '적합성 기준값',
+                'verbose_name_plural': '적합성 기준값',
+                'db_table': 'compliance_thresholds',
+            },
+        ),
+        migrations.RunPython(load_thresholds, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.8 on 2026-10-18 09:30
+
+from django.db import migrations, models
+
+
+def queue_reevaluation(apps, schema_editor):
+    """0017 에서 넣은 기준값으로 기존 신고서를 다시 판정하도록 reevaluate_compliance 작업 등록
+
+    RunPython 으로 넣은 기준값은 signal(reevaluate_on_threshold)을 발생시키지 않는다.
+    """
+    Declaration = apps.get_model('declarations', 'Declaration')
+    Job = apps.get_model('jobs', 'Job')
+    if not Declaration.objects.exists():
+        return
+    if not Job.objects.filter(job_type='reevaluate_compliance', status='queued').exists():
+        Job.objects.create(job_type='reevaluate_compliance', payload={})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('declarations', '0017_compliance_thresholds'),
+        ('jobs', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='hazardousmaterial',
+            name='content_percentage',
+            field=models.DecimalField(blank=True, decimal_places=4, max_digits=7, null=True, verbose_name='함유율 (%)'),
+        ),
+        migrations.AlterField(
+            model_name='shipinventoryitem',
+            name='avg_content_percentage',
+            field=models.DecimalField(blank=True, decimal_places=4, max_digits=7, null=True, verbose_name='평균 함유율 (%)'),
+        ),
+        migrations.AlterField(
+            model_name='shipinventoryitem',
+            name='max_content_percentage',
+            field=models.DecimalField(blank=True, decimal_places=4, max_digits=7, null=True, verbose_name='최대 함유율 (%)'),
+        ),
+        migrations.RunPython(queue_reevaluation, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.8 on 2026-10-18 09:45
+
+from django.db import migrations, models
+
+# declarations.inventory.DECLARATION_IDS_LIMIT (마이그레이션 시점의 값)
+DECLARATION_IDS_LIMIT = 20
+
+
+def trim_declaration_ids(apps, schema_editor):
+    """기존 행의 declaration_ids 도 최근 신고서 DECLARATION_IDS_LIMIT 건으로 줄임"""
+    ShipInventoryItem = apps.get_model('declarations', 'ShipInventoryItem')
+    items = []
+    for item in ShipInventoryItem.objects.only('pk', 'declaration_ids').iterator():
+        if len(item.declaration_ids) > DECLARATION_IDS_LIMIT:
+            item.declaration_ids = sorted(item.declaration_ids)[-DECLARATION_IDS_LIMIT:]
+            items.append(item)
+    ShipInventoryItem.objects.bulk_update(items, ['declaration_ids'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('declarations', '0018_content_percentage_precision'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='shipinventoryitem',
+            name='declaration_ids',
+            field=models.JSONField(default=list, verbose_name='최근 신고서 ID 목록'),
+        ),
+        migrations.RunPython(trim_declaration_ids, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.8 on 2026-10-18 09:48
+
+from django.db import migrations, models
+from django.db.models import F
+from django.db.models.functions import Coalesce
+
+
+def backfill_updated_at(apps, schema_editor):
+    """기존 행의 수정일은 마이그레이션 시각 대신 마지막으로 알려진 시각으로"""
+    HazardousMaterial = apps.get_model('declarations', 'HazardousMaterial')
+    ShipReport = apps.get_model('declarations', 'ShipReport')
+    HazardousMaterial.objects.update(updated_at=F('created_at'))
+    ShipReport.objects.update(updated_at=Coalesce('finished_at', 'started_at', 'created_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('declarations', '0019_inventory_declaration_ids_limit'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='hazardousmaterial',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='수정일'),
+        ),
+        migrations.AddField(
+            model_name='shipreport',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='수정일'),
+        ),
+        migrations.RunPython(backfill_updated_at, migrations.RunPython.noop),
+    ]
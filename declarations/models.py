@@ -1,12 +1,65 @@
 from django.db import models
 from django.contrib.auth import get_user_model
-from users.models import Supplier
+from django.utils import timezone
+from users.models import Customer, Supplier
 from ships.models import Ship
 
 User = get_user_model()
 
 
-class PurchaseOrder(models.Model):
+class CustomerScopedModel(models.Model):
+    """고객사 범위 조회를 위해 customer_id 를 비정규화한 모델
+
+    customer 는 customer_source 관계(예: ship)의 customer_id 를 따라 save() 시 채워지며,
+    선박의 소유 고객사가 바뀌면 signals.sync_ship_customer 가 일괄 갱신합니다.
+    bulk_create / update() 로 행을 만들 때는 customer 를 직접 지정해야 합니다.
+
+    DB 에서 읽은 시점의 customer_source, customer, tracked_fields 값은 loaded_values 에 남아
+    save() 이후 signal 에서 변경 전 상태로 사용됩니다.
+    """
+    customer = models.ForeignKey(
+        Customer, on_delete=models.CASCADE, null=True, blank=True, editable=False,
+        related_name='+', db_index=False, verbose_name='고객사'
+    )
+    customer_source = None
+    tracked_fields = ()
+    
+    class Meta:
+        abstract = True
+    
+    @classmethod
+    def _tracked_attnames(cls):
+        return (cls._meta.get_field(cls.customer_source).attname, 'customer_id', *cls.tracked_fields)
+    
+    def _current_values(self):
+        return {name: self.__dict__[name] for name in self._tracked_attnames() if name in self.__dict__}
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.loaded_values = instance._current_values()
+        return instance
+    
+    def save(self, *args, **kwargs):
+        source_attname = self._meta.get_field(self.customer_source).attname
+        source_id = getattr(self, source_attname)
+        loaded = getattr(self, 'loaded_values', {})
+        previous_customer_id = self.customer_id
+        if self.customer_id is None or source_id != loaded.get(source_attname):
+            source = getattr(self, self.customer_source) if source_id else None
+            self.customer_id = source.customer_id if source else None
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = {*kwargs['update_fields'], 'customer'}
+        super().save(*args, **kwargs)
+        self.loaded_values = self._current_values()
+        if loaded and self.customer_id != previous_customer_id:
+            self.propagate_customer()
+    
+    def propagate_customer(self):
+        """이 행의 customer 를 따르는 하위 행 갱신"""
+
+
+class PurchaseOrder(CustomerScopedModel):
     """구매 주문"""
     
     STATUS_CHOICES = [
@@ -30,17 +83,29 @@ class PurchaseOrder(models.Model):
     created_at = models.DateTimeField(auto_now_add=True, verbose_name='생성일')
     updated_at = models.DateTimeField(auto_now=True, verbose_name='수정일')
     
+    customer_source = 'ship'
+    tracked_fields = ('status',)
+    
     class Meta:
         db_table = 'purchase_orders'
         verbose_name = '구매 주문'
         verbose_name_plural = '구매 주문'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['ship', 'status', 'created_at'], name='po_ship_status_created_idx'),
+            models.Index(fields=['status', 'created_at'], name='po_status_created_idx'),
+            models.Index(fields=['customer', 'status', 'created_at'], name='po_customer_status_crtd_idx'),
+        ]
     
     def __str__(self):
         return f"{self.order_number} - {self.title}"
+    
+    def propagate_customer(self):
+        from .summary import reassign_customer
+        reassign_customer(DeclarationRequest.objects.filter(purchase_order=self), self.customer_id)
 
 
-class DeclarationRequest(models.Model):
+class DeclarationRequest(CustomerScopedModel):
     """신고서 요청"""
     
     STATUS_CHOICES = [
@@ -55,21 +120,30 @@ class DeclarationRequest(models.Model):
     request_date = models.DateField(auto_now_add=True, verbose_name='요청일')
     due_date = models.DateField(null=True, blank=True, verbose_name='마감일')
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending', verbose_name='상태')
+    rejection_reason = models.TextField(blank=True, verbose_name='거절 사유')
     created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='created_declaration_requests', verbose_name='생성자')
     created_at = models.DateTimeField(auto_now_add=True, verbose_name='생성일')
     updated_at = models.DateTimeField(auto_now=True, verbose_name='수정일')
     
+    customer_source = 'purchase_order'
+    tracked_fields = ('status', 'supplier_id', 'due_date')
+    
     class Meta:
         db_table = 'declaration_requests'
         verbose_name = '신고서 요청'
         verbose_name_plural = '신고서 요청'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['supplier', 'status', 'created_at'], name='dr_supplier_status_created_idx'),
+            models.Index(fields=['status', 'created_at'], name='dr_status_created_idx'),
+            models.Index(fields=['customer', 'status', 'created_at'], name='dr_customer_status_crtd_idx'),
+        ]
     
     def __str__(self):
         return f"요청 #{self.id} - {self.purchase_order.item_name}"
 
 
-class Declaration(models.Model):
+class Declaration(CustomerScopedModel):
     """신고서 (MD/SDoC)"""
     
     DECLARATION_TYPE_CHOICES = [
@@ -118,31 +192,304 @@ class Declaration(models.Model):
     created_at = models.DateTimeField(auto_now_add=True, verbose_name='생성일')
     updated_at = models.DateTimeField(auto_now=True, verbose_name='수정일')
     
+    customer_source = 'ship'
+    tracked_fields = ('status', 'supplier_id')
+    
     class Meta:
         db_table = 'declarations'
         verbose_name = '신고서'
         verbose_name_plural = '신고서'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['supplier', 'status', 'created_at'], name='decl_supplier_status_crtd_idx'),
+            models.Index(fields=['ship', 'status', 'created_at'], name='decl_ship_status_created_idx'),
+            models.Index(fields=['status', 'created_at'], name='decl_status_created_idx'),
+            models.Index(fields=['customer', 'status', 'created_at'], name='decl_customer_status_crtd_idx'),
+        ]
     
     def __str__(self):
         return f"{self.get_declaration_type_display()} - {self.item_name}"
+    
+    def propagate_customer(self):
+        HazardousMaterial.objects.filter(declaration=self).update(customer_id=self.customer_id, updated_at=timezone.now())
+
+
+class Substance(models.Model):
+    """물질 등록부 - CAS 번호별 대표 물질명, 동의어, 규제 목록 해당 여부
+
+    cas_number 는 declarations.substances.normalize_cas 로 정규화한 값(검증 숫자 확인)입니다.
+    검색용 이름(대표 물질명 + 동의어)은 save() 시 SubstanceName 에 색인됩니다.
+    """
+    
+    HKC_TABLE_CHOICES = [
+        ('', '해당 없음'),
+        ('A', 'Table A (금지/제한)'),
+        ('B', 'Table B (목록 작성 대상)'),
+    ]
+    EU_SRR_ANNEX_CHOICES = [
+        ('', '해당 없음'),
+        ('I', 'Annex I (금지/제한)'),
+        ('II', 'Annex II (목록 작성 대상)'),
+    ]
+    
+    cas_number = models.CharField(max_length=12, unique=True, verbose_name='CAS 번호')
+    name = models.CharField(max_length=200, verbose_name='대표 물질명')
+    synonyms = models.JSONField(default=list, blank=True, verbose_name='동의어')
+    hkc_table = models.CharField(max_length=1, choices=HKC_TABLE_CHOICES, blank=True, verbose_name='홍콩협약 목록')
+    eu_srr_annex = models.CharField(max_length=2, choices=EU_SRR_ANNEX_CHOICES, blank=True, verbose_name='EU SRR 부속서')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='생성일')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='수정일')
+    
+    class Meta:
+        db_table = 'substances'
+        verbose_name = '물질'
+        verbose_name_plural = '물질 등록부'
+        ordering = ['name']
+    
+    def __str__(self):
+        return f"{self.name} ({self.cas_number})"
+    
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self.sync_names()
+    
+    def sync_names(self):
+        """검색용 이름 색인을 대표 물질명 + 동의어로 다시 작성"""
+        from .substances import search_names
+        
+        self.names.all().delete()
+        SubstanceName.objects.bulk_create(
+            [SubstanceName(substance=self, name=name, search_key=key) for key, name in search_names(self)]
+        )
+
+
+class SubstanceName(models.Model):
+    """물질 이름 검색 색인 (대표 물질명과 동의어 하나당 한 행)"""
+    
+    substance = models.ForeignKey(Substance, on_delete=models.CASCADE, related_name='names', verbose_name='물질')
+    name = models.CharField(max_length=200, verbose_name='이름')
+    search_key = models.CharField(max_length=200, verbose_name='검색 키')
+    
+    class Meta:
+        db_table = 'substance_names'
+        verbose_name = '물질 이름'
+        verbose_name_plural = '물질 이름'
+        constraints = [
+            models.UniqueConstraint(fields=['substance', 'search_key'], name='substance_name_unique'),
+        ]
+        indexes = [
+            # 앞부분 일치 검색 (search_key 범위 조회)
+            models.Index(fields=['search_key'], name='substance_name_key_idx'),
+        ]
+    
+    def __str__(self):
+        return self.name
+
+
+class ComplianceThreshold(models.Model):
+    """물질별 적합성 기준값 - 함유율이 기준값을 넘는 유해물질이 있으면 신고서는 규정 미준수
+
+    기준값 0 은 함유 자체를 허용하지 않는다는 뜻입니다 (예: 오존층 파괴 물질).
+    기준값이 바뀌면 declarations.compliance.reevaluate 작업으로 모든 신고서를 다시 판정합니다.
+    """
+
+    UNIT_CHOICES = [
+        ('percent', '%'),
+        ('mg_kg', 'mg/kg'),
+    ]
+
+    substance = models.OneToOneField(Substance, on_delete=models.CASCADE, related_name='threshold', verbose_name='물질')
+    value = models.DecimalField(max_digits=10, decimal_places=4, verbose_name='기준값')
+    unit = models.CharField(max_length=10, choices=UNIT_CHOICES, default='percent', verbose_name='단위')
+    basis = models.CharField(max_length=200, blank=True, verbose_name='근거')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='수정일')
+
+    class Meta:
+        db_table = 'compliance_thresholds'
+        verbose_name = '적합성 기준값'
+        verbose_name_plural = '적합성 기준값'
+
+    def __str__(self):
+        return f"{self.substance_id}: {self.value} {self.get_unit_display()}"
+
+    @property
+    def percentage(self):
+        """함유율(%)과 같은 단위의 기준값 (1% = 10,000 mg/kg)"""
+        if self.unit == 'mg_kg':
+            return self.value / 10000
+        return self.value
 
 
-class HazardousMaterial(models.Model):
+class HazardousMaterial(CustomerScopedModel):
     """유해물질"""
     
     declaration = models.ForeignKey(Declaration, on_delete=models.CASCADE, related_name='hazardous_materials', verbose_name='신고서')
     material_name = models.CharField(max_length=200, blank=True, verbose_name='물질명')
     cas_number = models.CharField(max_length=50, blank=True, verbose_name='CAS 번호')
-    content_percentage = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True, verbose_name='함유율 (%)')
+    # 소수점 넷째 자리(0.0001% = 1 mg/kg)까지 - PCB(50 mg/kg), PFOS(10 mg/kg) 기준값을 비교할 수 있도록
+    content_percentage = models.DecimalField(max_digits=7, decimal_places=4, null=True, blank=True, verbose_name='함유율 (%)')
     location_in_product = models.CharField(max_length=200, blank=True, verbose_name='제품 내 위치')
     remarks = models.TextField(blank=True, verbose_name='비고')
+    substance = models.ForeignKey(Substance, on_delete=models.PROTECT, null=True, blank=True, related_name='hazardous_materials', verbose_name='물질')
     created_at = models.DateTimeField(auto_now_add=True, verbose_name='생성일')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='수정일')
+    
+    customer_source = 'declaration'
+    tracked_fields = ('cas_number',)
     
     class Meta:
         db_table = 'hazardous_materials'
         verbose_name = '유해물질'
         verbose_name_plural = '유해물질'
+        indexes = [
+            models.Index(fields=['declaration', 'cas_number'], name='hazmat_declaration_cas_idx'),
+            models.Index(fields=['customer', 'cas_number'], name='hazmat_customer_cas_idx'),
+            models.Index(fields=['customer', 'substance'], name='hazmat_customer_subst_idx'),
+        ]
     
     def __str__(self):
         return f"{self.material_name} ({self.content_percentage}%)"
+    
+    def save(self, *args, **kwargs):
+        # CAS 번호가 바뀌면 등록부의 물질로 다시 연결 (미리 substance 를 지정해 만든 행은 그대로)
+        loaded = getattr(self, 'loaded_values', {})
+        if self.cas_number != loaded.get('cas_number') and not (self._state.adding and self.substance_id):
+            from .substances import resolve, normalize_cas_or_none
+            
+            cas_number = normalize_cas_or_none(self.cas_number)
+            self.substance_id = resolve([cas_number]).get(cas_number)
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = {*kwargs['update_fields'], 'substance'}
+        super().save(*args, **kwargs)
+
+
+class StatusCount(models.Model):
+    """대시보드용 상태별 건수 (declarations.summary 가 증분 갱신)"""
+    
+    SCOPE_CHOICES = [
+        ('all', '전체'),
+        ('customer', '고객사'),
+        ('supplier', '공급업체'),
+    ]
+    
+    scope = models.CharField(max_length=10, choices=SCOPE_CHOICES, verbose_name='범위')
+    scope_id = models.PositiveBigIntegerField(default=0, verbose_name='범위 ID')
+    entity = models.CharField(max_length=30, verbose_name='대상')
+    status = models.CharField(max_length=20, verbose_name='상태')
+    count = models.IntegerField(default=0, verbose_name='건수')
+    
+    class Meta:
+        db_table = 'dashboard_status_counts'
+        verbose_name = '상태별 건수'
+        verbose_name_plural = '상태별 건수'
+        constraints = [
+            models.UniqueConstraint(fields=['scope', 'scope_id', 'entity', 'status'], name='status_count_key'),
+        ]
+    
+    def __str__(self):
+        return f"{self.scope}:{self.scope_id} {self.entity}.{self.status} = {self.count}"
+
+
+class DueDateCount(models.Model):
+    """마감일별 대기(pending) 신고서 요청 건수 - 마감 지연 건수 계산용"""
+    
+    scope = models.CharField(max_length=10, choices=StatusCount.SCOPE_CHOICES, verbose_name='범위')
+    scope_id = models.PositiveBigIntegerField(default=0, verbose_name='범위 ID')
+    due_date = models.DateField(verbose_name='마감일')
+    count = models.IntegerField(default=0, verbose_name='건수')
+    
+    class Meta:
+        db_table = 'dashboard_due_date_counts'
+        verbose_name = '마감일별 건수'
+        verbose_name_plural = '마감일별 건수'
+        constraints = [
+            models.UniqueConstraint(fields=['scope', 'scope_id', 'due_date'], name='due_date_count_key'),
+        ]
+    
+    def __str__(self):
+        return f"{self.scope}:{self.scope_id} {self.due_date} = {self.count}"
+
+
+class ShipInventoryItem(models.Model):
+    """선박별 IHM Part I 유해물질 인벤토리 (승인된 신고서의 유해물질을 CAS 번호별로 집계)
+
+    declarations.inventory 가 신고서 승인/거절 시 해당 선박·CAS 번호만 다시 집계합니다.
+    """
+    
+    ship = models.ForeignKey(Ship, on_delete=models.CASCADE, related_name='inventory_items', verbose_name='선박')
+    cas_number = models.CharField(max_length=50, blank=True, verbose_name='CAS 번호')
+    material_name = models.CharField(max_length=200, blank=True, verbose_name='물질명')
+    item_count = models.PositiveIntegerField(default=0, verbose_name='품목 수')
+    max_content_percentage = models.DecimalField(max_digits=7, decimal_places=4, null=True, blank=True, verbose_name='최대 함유율 (%)')
+    avg_content_percentage = models.DecimalField(max_digits=7, decimal_places=4, null=True, blank=True, verbose_name='평균 함유율 (%)')
+    declaration_count = models.PositiveIntegerField(default=0, verbose_name='신고서 수')
+    declaration_ids = models.JSONField(default=list, verbose_name='최근 신고서 ID 목록')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='수정일')
+    
+    class Meta:
+        db_table = 'ship_inventory_items'
+        verbose_name = '선박 유해물질 인벤토리'
+        verbose_name_plural = '선박 유해물질 인벤토리'
+        ordering = ['cas_number']
+        constraints = [
+            models.UniqueConstraint(fields=['ship', 'cas_number'], name='ship_inventory_cas_key'),
+        ]
+    
+    def __str__(self):
+        return f"{self.ship_id} {self.cas_number} x{self.item_count}"
+
+
+class ReportArtifact(models.Model):
+    """생성된 IHM 보고서 (문서 내용의 SHA-256 으로 식별)
+
+    선박의 승인된 신고서가 바뀌지 않았다면 같은 해시가 나오므로 이전 결과를 다시 사용합니다.
+    """
+    
+    content_hash = models.CharField(max_length=64, unique=True, verbose_name='내용 해시')
+    document = models.JSONField(verbose_name='보고서 (JSON)')
+    html = models.TextField(verbose_name='보고서 (HTML)')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='생성일')
+    
+    class Meta:
+        db_table = 'report_artifacts'
+        verbose_name = '보고서 결과물'
+        verbose_name_plural = '보고서 결과물'
+    
+    def __str__(self):
+        return self.content_hash[:12]
+
+
+class ShipReport(models.Model):
+    """선박 IHM Part I 보고서 생성 요청"""
+    
+    STATUS_CHOICES = [
+        ('queued', '대기'),
+        ('running', '생성 중'),
+        ('done', '완료'),
+        ('failed', '실패'),
+    ]
+    
+    ship = models.ForeignKey(Ship, on_delete=models.CASCADE, related_name='reports', verbose_name='선박')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='queued', verbose_name='상태')
+    artifact = models.ForeignKey(ReportArtifact, on_delete=models.SET_NULL, null=True, blank=True, related_name='reports', verbose_name='결과물')
+    reused = models.BooleanField(default=False, verbose_name='이전 결과 재사용')
+    error = models.TextField(blank=True, verbose_name='오류')
+    requested_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='ship_reports', verbose_name='요청자')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='요청일')
+    started_at = models.DateTimeField(null=True, blank=True, verbose_name='시작일')
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name='완료일')
+    # 상태 변경(워커의 update() 포함)마다 갱신 - 생성 상태를 폴링하는 조건부 조회의 검증 값
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='수정일')
+    
+    class Meta:
+        db_table = 'ship_reports'
+        verbose_name = '선박 보고서'
+        verbose_name_plural = '선박 보고서'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='ship_report_status_crtd_idx'),
+            models.Index(fields=['ship', 'status'], name='ship_report_ship_status_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.ship_id} 보고서 #{self.id} ({self.status})"
@@ -0,0 +1,49 @@
+"""
+목록 쿼리 실행 계획(EXPLAIN) 검사
+
+ViewSet 목록 쿼리가 Meta.indexes 에 선언한 복합 인덱스를 계속 사용하는지,
+ORDER BY -created_at 을 위해 filesort 를 하지 않는지 확인합니다.
+"""
+from .models import PurchaseOrder, DeclarationRequest, Declaration, HazardousMaterial
+
+# 정렬을 인덱스로 처리하지 못할 때 EXPLAIN 에 나타나는 문구 (SQLite / MySQL)
+FILESORT_MARKERS = ('USE TEMP B-TREE FOR ORDER BY', 'Using filesort')
+
+
+# (이름, 기대 인덱스, 쿼리셋 생성 함수)
+KNOWN_LIST_QUERIES = [
+    ('purchase_orders: 상태 필터', 'po_status_created_idx',
+     lambda: PurchaseOrder.objects.filter(status='pending')),
+    ('purchase_orders: 선박 + 상태 필터', 'po_ship_status_created_idx',
+     lambda: PurchaseOrder.objects.filter(ship_id=1, status='pending')),
+    ('purchase_orders: 고객사 범위 + 상태', 'po_customer_status_crtd_idx',
+     lambda: PurchaseOrder.objects.filter(customer_id=1, status='pending')),
+    ('declaration_requests: 공급업체 범위 + 상태', 'dr_supplier_status_created_idx',
+     lambda: DeclarationRequest.objects.filter(supplier_id=1, status='pending')),
+    ('declaration_requests: 고객사 범위 + 상태', 'dr_customer_status_crtd_idx',
+     lambda: DeclarationRequest.objects.filter(customer_id=1, status='pending')),
+    ('declaration_requests: 상태 필터', 'dr_status_created_idx',
+     lambda: DeclarationRequest.objects.filter(status='pending')),
+    ('declarations: 공급업체 범위 + 상태', 'decl_supplier_status_crtd_idx',
+     lambda: Declaration.objects.filter(supplier_id=1, status='submitted')),
+    ('declarations: 고객사 범위 + 상태', 'decl_customer_status_crtd_idx',
+     lambda: Declaration.objects.filter(customer_id=1, status='approved')),
+    ('declarations: 선박 + 상태 필터', 'decl_ship_status_created_idx',
+     lambda: Declaration.objects.filter(ship_id=1, status='approved')),
+    ('declarations: 상태 필터', 'decl_status_created_idx',
+     lambda: Declaration.objects.filter(status='submitted')),
+    ('hazardous_materials: 신고서 + CAS', 'hazmat_declaration_cas_idx',
+     lambda: HazardousMaterial.objects.filter(declaration_id=1, cas_number='7439-92-1')),
+    ('hazardous_materials: 고객사 + CAS', 'hazmat_customer_cas_idx',
+     lambda: HazardousMaterial.objects.filter(customer_id=1, cas_number='7439-92-1')),
+]
+
+
+def check_query_plans():
+    """알려진 목록 쿼리의 실행 계획을 검사하여 (이름, 인덱스, 성공 여부, 계획) 목록을 반환"""
+    results = []
+    for name, index_name, build_queryset in KNOWN_LIST_QUERIES:
+        plan = build_queryset().explain()
+        ok = index_name in plan and not any(marker in plan for marker in FILESORT_MARKERS)
+        results.append((name, index_name, ok, plan))
+    return results
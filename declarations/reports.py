@@ -0,0 +1,136 @@
+"""
+선박 IHM Part I 보고서 비동기 생성
+
+웹 요청은 ShipReport(queued) 와 선박 하나당 'ship_report' 작업(jobs 큐)만 만들고,
+실제 생성은 run_worker 워커가 합니다 (declarations/tasks.py).
+
+- enqueue(ship_ids, user): 선박별 생성 요청 - 이미 대기/생성 중인 요청이 있으면 그 요청을 반환
+- generate(report_id): 문서 데이터 수집 → 내용 해시 → 같은 해시의 ReportArtifact 가 있으면 재사용, 없으면 HTML 렌더링
+  실패하면 예외를 그대로 발생시켜 작업 큐가 재시도하고, 마지막 시도까지 실패하면 mark_failed 로 기록
+
+문서에는 생성 시각 등 가변 값을 넣지 않으므로, 선박 정보와 승인된 신고서(유해물질 포함)가 그대로면
+내용 해시도 같아 이전 결과물을 그대로 사용합니다.
+"""
+import hashlib
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Prefetch
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from jobs.queue import enqueue_many
+from ships.models import Ship
+from .models import Declaration, HazardousMaterial, ReportArtifact, ShipInventoryItem, ShipReport
+
+REPORT_STATUS = 'approved'
+OPEN_STATUSES = ('queued', 'running')
+REPORT_JOB_TYPE = 'ship_report'
+# 쿼리 예산(ihm_backend.query_budget)용: enqueue() = 진행 중인 요청 조회 + ShipReport INSERT + Job INSERT
+ENQUEUE_QUERIES = 3
+
+
+@transaction.atomic
+def enqueue(ship_ids, user=None):
+    """선박별 보고서 생성 요청, ship_ids 순서대로 ShipReport 목록 반환"""
+    ship_ids = list(dict.fromkeys(ship_ids))
+    existing = {
+        report.ship_id: report
+        for report in ShipReport.objects.filter(ship_id__in=ship_ids, status__in=OPEN_STATUSES)
+    }
+    new_ship_ids = [ship_id for ship_id in ship_ids if ship_id not in existing]
+    created = ShipReport.objects.bulk_create([
+        ShipReport(ship_id=ship_id, requested_by_id=getattr(user, 'id', None))
+        for ship_id in new_ship_ids
+    ])
+    if any(report.pk is None for report in created):
+        # pk 를 돌려주지 않는 DB(MySQL) - 방금 만든 대기 요청을 다시 조회
+        created = list(ShipReport.objects.filter(ship_id__in=new_ship_ids, status='queued'))
+    enqueue_many(REPORT_JOB_TYPE, [{'report_id': report.pk} for report in created], user=user)
+    existing.update((report.ship_id, report) for report in created)
+    return [existing[ship_id] for ship_id in ship_ids]
+
+
+def build_document(ship_id):
+    """보고서 문서 - Decimal/날짜는 문자열로 바꾼 JSON 값"""
+    ship = Ship.objects.select_related('customer').get(pk=ship_id)
+    declarations = Declaration.objects.filter(ship_id=ship_id, status=REPORT_STATUS).select_related(
+        'supplier'
+    ).prefetch_related(
+        Prefetch('hazardous_materials', queryset=HazardousMaterial.objects.order_by('pk'))
+    ).order_by('pk')
+    inventory = ShipInventoryItem.objects.filter(ship_id=ship_id).values(
+        'cas_number', 'material_name', 'item_count', 'max_content_percentage',
+        'avg_content_percentage', 'declaration_count',
+    )
+
+    document = {
+        'ship': {
+            'id': ship.id,
+            'ship_name': ship.ship_name,
+            'imo_number': ship.imo_number,
+            'ship_type': ship.ship_type,
+            'gross_tonnage': ship.gross_tonnage,
+            'year_built': ship.year_built,
+            'owner': ship.customer.company_name,
+        },
+        'inventory': list(inventory),
+        'declarations': [
+            {
+                'id': declaration.id,
+                'declaration_number': declaration.declaration_number,
+                'declaration_type': declaration.declaration_type,
+                'item_name': declaration.item_name,
+                'manufacturer': declaration.manufacturer,
+                'model_number': declaration.model_number,
+                'supplier': declaration.supplier.company_name,
+                'approved_date': declaration.approved_date,
+                'hazardous_materials': [
+                    {
+                        'material_name': material.material_name,
+                        'cas_number': material.cas_number,
+                        'content_percentage': material.content_percentage,
+                        'location_in_product': material.location_in_product,
+                    }
+                    for material in declaration.hazardous_materials.all()
+                ],
+            }
+            for declaration in declarations
+        ],
+    }
+    return json.loads(json.dumps(document, cls=DjangoJSONEncoder))
+
+
+def content_hash(document):
+    encoded = json.dumps(document, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+def generate(report_id):
+    """요청 하나 처리, 결과물의 내용 해시 반환"""
+    ShipReport.objects.filter(pk=report_id).update(status='running', started_at=timezone.now(), updated_at=timezone.now())
+    report = ShipReport.objects.get(pk=report_id)
+    try:
+        document = build_document(report.ship_id)
+        key = content_hash(document)
+        artifact = ReportArtifact.objects.filter(content_hash=key).only('pk').first()
+        reused = artifact is not None
+        if artifact is None:
+            html = render_to_string('declarations/ship_report.html', {'document': document})
+            artifact, _ = ReportArtifact.objects.get_or_create(
+                content_hash=key, defaults={'document': document, 'html': html}
+            )
+    except Exception as exc:
+        # 재시도를 기다리는 동안에는 대기 상태로 두고 마지막 오류만 남긴다
+        ShipReport.objects.filter(pk=report_id).update(status='queued', error=str(exc), updated_at=timezone.now())
+        raise
+    ShipReport.objects.filter(pk=report_id).update(
+        status='done', artifact=artifact, reused=reused, error='', finished_at=timezone.now(),
+        updated_at=timezone.now(),
+    )
+    return key
+
+
+def mark_failed(report_id, error):
+    ShipReport.objects.filter(pk=report_id).update(status='failed', error=error, finished_at=timezone.now(), updated_at=timezone.now())
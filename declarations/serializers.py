@@ -1,24 +1,45 @@
 from rest_framework import serializers
-from .models import PurchaseOrder, DeclarationRequest, Declaration, HazardousMaterial
+from ihm_backend.fieldsets import DynamicFieldsModelSerializer
+from .models import (
+    PurchaseOrder, DeclarationRequest, Declaration, HazardousMaterial, ShipInventoryItem, ShipReport, Substance,
+)
+from . import compliance
+from .substances import normalize_cas_or_none, resolve
 from ships.serializers import ShipListSerializer
 from users.serializers import SupplierSerializer
 
 
-class HazardousMaterialSerializer(serializers.ModelSerializer):
+class HazardousMaterialSerializer(DynamicFieldsModelSerializer):
     """유해물질 Serializer"""
     
     class Meta:
         model = HazardousMaterial
-        fields = ['id', 'declaration', 'material_name', 'cas_number', 
+        fields = ['id', 'declaration', 'material_name', 'cas_number', 'substance',
                   'content_percentage', 'location_in_product', 'remarks', 'created_at']
-        read_only_fields = ['id', 'created_at', 'declaration']
+        read_only_fields = ['id', 'created_at', 'declaration', 'substance']
         extra_kwargs = {
             'content_percentage': {'required': False},
             'material_name': {'required': False},
         }
+    
+    def validate_cas_number(self, value):
+        """올바른 CAS 번호는 정규화한 값으로 저장
+
+        형식이나 검증 숫자가 맞지 않는 값('N/A', 'unknown' 등)도 그대로 받으며, 물질 등록부에는 연결하지 않습니다.
+        """
+        return normalize_cas_or_none(value) or value
+
+
+class SubstanceSerializer(DynamicFieldsModelSerializer):
+    """물질 등록부 Serializer"""
+    
+    class Meta:
+        model = Substance
+        fields = ['id', 'cas_number', 'name', 'synonyms', 'hkc_table', 'eu_srr_annex']
+        read_only_fields = fields
 
 
-class PurchaseOrderSerializer(serializers.ModelSerializer):
+class PurchaseOrderSerializer(DynamicFieldsModelSerializer):
     """구매 주문 Serializer"""
     ship_info = ShipListSerializer(source='ship', read_only=True)
     created_by_username = serializers.CharField(source='created_by.username', read_only=True)
@@ -30,9 +51,10 @@ class PurchaseOrderSerializer(serializers.ModelSerializer):
                   'order_date', 'delivery_date', 'status', 'created_by', 'created_by_username',
                   'created_at', 'updated_at']
         read_only_fields = ['id', 'created_at', 'updated_at']
+        expandable_fields = ['ship_info']
 
 
-class PurchaseOrderListSerializer(serializers.ModelSerializer):
+class PurchaseOrderListSerializer(DynamicFieldsModelSerializer):
     """구매 주문 목록용 Serializer"""
     ship_name = serializers.CharField(source='ship.ship_name', read_only=True)
     
@@ -42,7 +64,7 @@ class PurchaseOrderListSerializer(serializers.ModelSerializer):
                   'quantity', 'unit', 'order_date', 'status']
 
 
-class DeclarationRequestSerializer(serializers.ModelSerializer):
+class DeclarationRequestSerializer(DynamicFieldsModelSerializer):
     """신고서 요청 Serializer"""
     order_number = serializers.CharField(source='purchase_order.order_number', read_only=True)
     supplier_name = serializers.CharField(source='supplier.company_name', read_only=True)
@@ -52,12 +74,12 @@ class DeclarationRequestSerializer(serializers.ModelSerializer):
     class Meta:
         model = DeclarationRequest
         fields = ['id', 'purchase_order', 'order_number', 'supplier', 'supplier_name',
-                  'ship_name', 'request_date', 'due_date', 'status', 'created_by', 
+                  'ship_name', 'request_date', 'due_date', 'status', 'rejection_reason', 'created_by', 
                   'created_by_username', 'created_at', 'updated_at']
-        read_only_fields = ['id', 'request_date', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'request_date', 'rejection_reason', 'created_at', 'updated_at']
 
 
-class DeclarationSerializer(serializers.ModelSerializer):
+class DeclarationSerializer(DynamicFieldsModelSerializer):
     """신고서 Serializer"""
     declaration_request_info = DeclarationRequestSerializer(source='declaration_request', read_only=True)
     supplier_info = SupplierSerializer(source='supplier', read_only=True)
@@ -73,10 +95,12 @@ class DeclarationSerializer(serializers.ModelSerializer):
                   'certification_number', 'supplier_signature', 'supplier_name', 'signature_date',
                   'submitted_date', 'approved_date', 'approved_by', 'approved_by_username',
                   'status', 'rejection_reason', 'hazardous_materials', 'created_at', 'updated_at']
-        read_only_fields = ['id', 'created_at', 'updated_at']
+        # 적합성 상태는 유해물질과 기준값으로 서버가 판정 (declarations.compliance)
+        read_only_fields = ['id', 'compliance_status', 'created_at', 'updated_at']
+        expandable_fields = ['declaration_request_info', 'supplier_info', 'ship_info', 'hazardous_materials']
 
 
-class DeclarationListSerializer(serializers.ModelSerializer):
+class DeclarationListSerializer(DynamicFieldsModelSerializer):
     """신고서 목록용 Serializer"""
     supplier_name = serializers.CharField(source='supplier.company_name', read_only=True)
     ship_name = serializers.CharField(source='ship.ship_name', read_only=True)
@@ -89,7 +113,7 @@ class DeclarationListSerializer(serializers.ModelSerializer):
                   'submitted_date', 'approved_date']
 
 
-class DeclarationCreateSerializer(serializers.ModelSerializer):
+class DeclarationCreateSerializer(DynamicFieldsModelSerializer):
     """신고서 생성용 Serializer (유해물질 포함)"""
     hazardous_materials = HazardousMaterialSerializer(many=True, required=False)
     
@@ -116,14 +140,14 @@ class DeclarationCreateSerializer(serializers.ModelSerializer):
         purchase_order = PurchaseOrder.objects.get(id=purchase_order_id)
         
         # 현재 사용자의 Supplier 가져오기
-        supplier = Supplier.objects.get(user=self.context['request'].user)
+        supplier = Supplier.objects.get(pk=self.context['request'].user.supplier_id)
         
         # DeclarationRequest 생성 또는 조회
         declaration_request, created = DeclarationRequest.objects.get_or_create(
             purchase_order=purchase_order,
             supplier=supplier,
             defaults={
-                'created_by': self.context['request'].user,
+                'created_by_id': self.context['request'].user.id,
                 'status': 'pending'
             }
         )
@@ -133,10 +157,54 @@ class DeclarationCreateSerializer(serializers.ModelSerializer):
         validated_data['supplier'] = supplier
         validated_data['ship'] = purchase_order.ship
         
+        # 물질 등록부 조회는 한 번에, 적합성은 저장 전에 판정
+        substance_ids = resolve(hazmat.get('cas_number') for hazmat in hazmat_data)
+        validated_data['compliance_status'] = compliance.status_for(
+            ((substance_ids.get(hazmat.get('cas_number')), hazmat.get('content_percentage')) for hazmat in hazmat_data),
+            compliance.limits(),
+        )
+        
         declaration = Declaration.objects.create(**validated_data)
         
         # 유해물질 생성
         for hazmat in hazmat_data:
-            HazardousMaterial.objects.create(declaration=declaration, **hazmat)
+            HazardousMaterial.objects.create(
+                declaration=declaration, substance_id=substance_ids.get(hazmat.get('cas_number')), **hazmat
+            )
         
         return declaration
+
+
+class BulkDeclarationItemSerializer(DeclarationCreateSerializer):
+    """일괄 제출 항목 Serializer
+
+    항목마다 쿼리가 발생하지 않도록 신고서 번호 중복 검사는 declarations.bulk 에서 한 번에 합니다.
+    """
+    
+    class Meta(DeclarationCreateSerializer.Meta):
+        extra_kwargs = {
+            **DeclarationCreateSerializer.Meta.extra_kwargs,
+            'declaration_number': {'required': False, 'validators': []},
+        }
+
+
+class ShipInventoryItemSerializer(DynamicFieldsModelSerializer):
+    """선박 유해물질 인벤토리 Serializer"""
+    
+    class Meta:
+        model = ShipInventoryItem
+        fields = ['cas_number', 'material_name', 'item_count', 'max_content_percentage',
+                  'avg_content_percentage', 'declaration_count', 'declaration_ids', 'updated_at']
+        read_only_fields = fields
+
+
+class ShipReportSerializer(DynamicFieldsModelSerializer):
+    """선박 보고서 생성 요청 Serializer (상태 조회용)"""
+    ship_name = serializers.CharField(source='ship.ship_name', read_only=True)
+    content_hash = serializers.CharField(source='artifact.content_hash', read_only=True, default=None)
+    
+    class Meta:
+        model = ShipReport
+        fields = ['id', 'ship', 'ship_name', 'status', 'content_hash', 'reused', 'error',
+                  'created_at', 'started_at', 'finished_at']
+        read_only_fields = fields
@@ -0,0 +1,188 @@
+"""
+declarations 모델 변경에 따른 비정규화 컬럼/요약 건수 갱신
+
+- 선박의 소유 고객사가 바뀌면 비정규화된 customer_id 갱신
+- 구매 주문/신고서 요청/신고서 저장·삭제 시 대시보드 요약 건수 반영
+- 신고서 승인/거절/삭제, 승인된 신고서의 유해물질 변경 시 선박 인벤토리 재집계
+- 유해물질 변경 시 신고서 updated_at 갱신 (신고서 응답의 ETag/Last-Modified)
+- 적합성 기준값 변경 시 모든 신고서 재판정 작업 등록
+- 선박/회사/구매 주문/신고서 요청/신고서/유해물질 저장·삭제 시 그 행이 보이는 역할 범위의 응답 캐시 무효화
+"""
+from django.db import transaction
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from ihm_backend import response_cache
+from ships.models import Ship
+from users.models import Customer, Supplier
+from jobs.models import Job
+from jobs.queue import enqueue
+from . import inventory, summary
+from .models import PurchaseOrder, DeclarationRequest, Declaration, HazardousMaterial, ComplianceThreshold
+
+
+def _origin_model(origin):
+    """삭제를 시작한 모델 - origin 은 delete() 를 호출한 인스턴스나 QuerySet (저장 signal 은 None)"""
+    if origin is None:
+        return None
+    return origin.model if isinstance(origin, QuerySet) else type(origin)
+
+
+def _deleted_with_declaration(origin):
+    """상위 행(신고서, 신고서 요청, 구매 주문, 선박, 회사) 삭제로 신고서와 함께 지워지는 유해물질인지"""
+    return _origin_model(origin) not in (None, HazardousMaterial)
+
+
+@receiver(post_save, sender=Ship)
+def sync_ship_customer(sender, instance, created, update_fields=None, **kwargs):
+    if created or (update_fields is not None and 'customer' not in update_fields):
+        return
+    customer_id = instance.customer_id
+    # 이미 같은 고객사인 행은 제외하므로 소유자가 그대로면 갱신되는 행이 없다
+    with transaction.atomic():
+        moved = [
+            summary.reassign_customer(PurchaseOrder.objects.filter(ship=instance), customer_id),
+            summary.reassign_customer(DeclarationRequest.objects.filter(purchase_order__ship=instance), customer_id),
+            summary.reassign_customer(Declaration.objects.filter(ship=instance), customer_id),
+            HazardousMaterial.objects.filter(declaration__ship=instance).exclude(
+                customer_id=customer_id
+            ).update(customer_id=customer_id),
+        ]
+    if any(moved):
+        # 이전 고객사를 알 수 없으므로 고객사 역할 전체를 무효화 (update() 는 signal 이 없다)
+        for model in (PurchaseOrder, DeclarationRequest, Declaration, HazardousMaterial):
+            response_cache.invalidate(model, ['customer'])
+
+
+@receiver(post_save, sender=PurchaseOrder)
+@receiver(post_save, sender=DeclarationRequest)
+@receiver(post_save, sender=Declaration)
+def count_on_save(sender, instance, created, **kwargs):
+    summary.record_save(instance, created)
+
+
+@receiver(post_delete, sender=PurchaseOrder)
+@receiver(post_delete, sender=DeclarationRequest)
+@receiver(post_delete, sender=Declaration)
+def count_on_delete(sender, instance, **kwargs):
+    summary.record_delete(instance)
+
+
+@receiver(post_save, sender=Declaration)
+def refresh_inventory_on_status(sender, instance, created, **kwargs):
+    old = {} if created else getattr(instance, 'loaded_values', {})
+    was_counted = old.get('status') == inventory.INVENTORY_STATUS
+    is_counted = instance.status == inventory.INVENTORY_STATUS
+    ship_changed = old.get('ship_id', instance.ship_id) != instance.ship_id
+    if was_counted != is_counted or (ship_changed and (was_counted or is_counted)):
+        inventory.refresh_declaration(instance, {old.get('ship_id') or instance.ship_id, instance.ship_id})
+
+
+@receiver(post_save, sender=HazardousMaterial)
+@receiver(post_delete, sender=HazardousMaterial)
+def refresh_inventory_on_material(sender, instance, origin=None, **kwargs):
+    if _deleted_with_declaration(origin):
+        # 신고서 삭제 시 refresh_inventory_on_delete 가 한 번에 재집계한다
+        return
+    declaration = instance.declaration
+    if declaration.status != inventory.INVENTORY_STATUS:
+        return
+    old_cas = getattr(instance, 'loaded_values', {}).get('cas_number', instance.cas_number)
+    inventory.refresh(declaration.ship_id, {old_cas, instance.cas_number})
+
+
+@receiver(pre_delete, sender=Declaration)
+def collect_inventory_on_delete(sender, instance, origin=None, **kwargs):
+    # 유해물질은 신고서보다 먼저 삭제되므로 재집계할 CAS 번호를 미리 읽어 둔다
+    if instance.status != inventory.INVENTORY_STATUS or _origin_model(origin) in (Ship, Customer):
+        # 선박 자체가 삭제되면 인벤토리도 함께 삭제된다
+        return
+    instance.inventory_cas_numbers = set(instance.hazardous_materials.values_list('cas_number', flat=True))
+
+
+@receiver(post_delete, sender=Declaration)
+def refresh_inventory_on_delete(sender, instance, **kwargs):
+    cas_numbers = getattr(instance, 'inventory_cas_numbers', None)
+    if cas_numbers:
+        inventory.refresh(instance.ship_id, cas_numbers)
+
+
+@receiver(post_save, sender=HazardousMaterial)
+@receiver(post_delete, sender=HazardousMaterial)
+def touch_declaration(sender, instance, origin=None, **kwargs):
+    if _deleted_with_declaration(origin):
+        # 신고서도 함께 삭제된다
+        return
+    Declaration.objects.filter(pk=instance.declaration_id).update(updated_at=timezone.now())
+
+
+def _enqueue_reevaluation():
+    # 대기 중인 재판정 작업이 있으면 그 작업이 바뀐 기준값까지 반영한다
+    if not Job.objects.filter(job_type='reevaluate_compliance', status='queued').exists():
+        enqueue('reevaluate_compliance')
+
+
+@receiver(post_save, sender=ComplianceThreshold)
+@receiver(post_delete, sender=ComplianceThreshold)
+def reevaluate_on_threshold(sender, **kwargs):
+    transaction.on_commit(_enqueue_reevaluation)
+
+
+def _company_scopes(instance):
+    """고객사와 공급업체가 모두 있는 행 - 변경 전/후 회사의 범위"""
+    scopes = set()
+    for values in (getattr(instance, 'loaded_values', {}), instance.__dict__):
+        if values.get('customer_id') is not None:
+            scopes.add(f"customer:{values['customer_id']}")
+        if values.get('supplier_id') is not None:
+            scopes.add(f"supplier:{values['supplier_id']}")
+    return scopes
+
+
+@receiver(post_save, sender=Ship)
+@receiver(post_delete, sender=Ship)
+def invalidate_ship_cache(sender, instance, created=False, **kwargs):
+    # 소유 고객사가 바뀌었을 수 있으므로 수정은 고객사 역할 전체를 무효화
+    scopes = ['supplier', f'customer:{instance.customer_id}' if created else 'customer']
+    response_cache.invalidate(Ship, scopes)
+
+
+@receiver(post_save, sender=Customer)
+@receiver(post_delete, sender=Customer)
+def invalidate_customer_cache(sender, instance, **kwargs):
+    response_cache.invalidate(Customer, ['supplier', f'customer:{instance.pk}'])
+
+
+@receiver(post_save, sender=Supplier)
+@receiver(post_delete, sender=Supplier)
+def invalidate_supplier_cache(sender, instance, **kwargs):
+    response_cache.invalidate(Supplier, ['customer', f'supplier:{instance.pk}'])
+
+
+@receiver(post_save, sender=PurchaseOrder)
+@receiver(post_delete, sender=PurchaseOrder)
+def invalidate_purchase_order_cache(sender, instance, **kwargs):
+    # 구매 주문은 모든 공급업체에 보인다
+    customer_ids = {getattr(instance, 'loaded_values', {}).get('customer_id'), instance.customer_id}
+    response_cache.invalidate(PurchaseOrder, ['supplier', *(f'customer:{pk}' for pk in customer_ids if pk)])
+
+
+@receiver(post_save, sender=DeclarationRequest)
+@receiver(post_delete, sender=DeclarationRequest)
+@receiver(post_save, sender=Declaration)
+@receiver(post_delete, sender=Declaration)
+def invalidate_declaration_cache(sender, instance, **kwargs):
+    response_cache.invalidate(sender, _company_scopes(instance))
+
+
+@receiver(post_save, sender=HazardousMaterial)
+@receiver(post_delete, sender=HazardousMaterial)
+def invalidate_material_cache(sender, instance, origin=None, **kwargs):
+    if _deleted_with_declaration(origin):
+        # 상위 행의 삭제가 무효화한다
+        return
+    # 신고서는 refresh_inventory_on_material 이 이미 읽어 두었다
+    scopes = _company_scopes(instance) | {f'supplier:{instance.declaration.supplier_id}'}
+    response_cache.invalidate(HazardousMaterial, scopes)
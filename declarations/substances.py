@@ -0,0 +1,132 @@
+"""
+물질 등록부 (Substance) 와 CAS 번호
+
+- normalize_cas(value): CAS 번호를 'NNNNNNN-NN-N' 형식으로 정규화하고 검증 숫자(check digit) 확인
+- resolve(cas_numbers): CAS 번호 목록을 물질 ID 로 변환 - 등록부에 있는 물질에만 연결
+- search(query): CAS 번호(앞부분) 또는 물질명/동의어(앞부분)로 물질 검색
+- backfill(chunk_size): 물질이 연결되지 않은 기존 유해물질 행을 등록부에 연결 (backfill_substances 명령)
+
+이름 검색은 SubstanceName.search_key(소문자, 공백 정리) 색인의 범위 조회
+(search_key >= q AND search_key < q + '\\uffff') 로 하므로 전체 테이블을 읽지 않습니다.
+LIKE 'q%' 는 DB 와 collation 에 따라 색인을 쓰지 못하는 경우가 있습니다.
+"""
+import re
+from collections import defaultdict
+
+from django.db.models import Q
+from django.utils import timezone
+
+from ihm_backend import response_cache
+from .models import HazardousMaterial, Substance, SubstanceName
+
+CAS_PATTERN = re.compile(r'^(\d{2,7})-(\d{2})-(\d)$')
+# 구분자 없이 입력한 CAS 번호 (5~10자리)
+CAS_DIGITS_PATTERN = re.compile(r'^\d{5,10}$')
+_PREFIX_END = '\uffff'
+
+
+def cas_check_digit(digits):
+    """검증 숫자 - 오른쪽 숫자부터 1, 2, 3... 을 곱한 합의 일의 자리"""
+    return sum(position * int(digit) for position, digit in enumerate(reversed(digits), start=1)) % 10
+
+
+def normalize_cas(value):
+    """정규화한 CAS 번호 반환, 형식이나 검증 숫자가 맞지 않으면 ValueError"""
+    value = re.sub(r'\s+', '', str(value or ''))
+    if CAS_DIGITS_PATTERN.match(value):
+        value = f'{value[:-3]}-{value[-3:-1]}-{value[-1]}'
+    match = CAS_PATTERN.match(value)
+    if not match:
+        raise ValueError('CAS 번호는 0000000-00-0 형식이어야 합니다.')
+    first, second, check = match.groups()
+    first = first.lstrip('0').rjust(2, '0')
+    if cas_check_digit(first + second) != int(check):
+        raise ValueError('CAS 번호의 검증 숫자가 맞지 않습니다.')
+    return f'{first}-{second}-{check}'
+
+
+def normalize_cas_or_none(value):
+    try:
+        return normalize_cas(value)
+    except ValueError:
+        return None
+
+
+def search_key(name):
+    return ' '.join(str(name).split()).casefold()
+
+
+def search_names(substance):
+    """물질의 (검색 키, 이름) 목록 - 대표 물질명과 동의어, 키 중복 제외"""
+    names = {}
+    for name in [substance.name, *(substance.synonyms or [])]:
+        key = search_key(name)
+        if key:
+            names.setdefault(key[:200], name[:200])
+    return list(names.items())
+
+
+def resolve(cas_numbers):
+    """정규화한 CAS 번호 목록 → {CAS 번호: 물질 ID} (등록부에 있는 번호만)
+
+    공급업체가 입력한 값으로 등록부에 물질을 만들지 않습니다. 올바른 CAS 번호가 아닌 값('N/A' 등)과
+    등록부에 없는 CAS 번호는 결과에 없으므로 유해물질 행은 연결되지 않은 채(substance=None) 남고,
+    운영자가 등록부에 물질을 추가한 뒤 backfill_substances 로 연결합니다.
+    """
+    cas_numbers = {
+        cas_number for cas_number in cas_numbers
+        if cas_number and normalize_cas_or_none(cas_number) == cas_number
+    }
+    if not cas_numbers:
+        return {}
+    return dict(Substance.objects.filter(cas_number__in=cas_numbers).values_list('cas_number', 'pk'))
+
+
+def _prefix(field, value):
+    return Q(**{f'{field}__gte': value, f'{field}__lt': value + _PREFIX_END})
+
+
+def search(query):
+    """CAS 번호 또는 물질명/동의어 앞부분으로 찾은 Substance queryset"""
+    query = ' '.join(str(query).split())
+    if not query:
+        return Substance.objects.none()
+    if re.fullmatch(r'[\d-]+', query):
+        cas_number = normalize_cas_or_none(query)
+        if cas_number:
+            return Substance.objects.filter(cas_number=cas_number)
+        return Substance.objects.filter(_prefix('cas_number', query))
+    return Substance.objects.filter(
+        pk__in=SubstanceName.objects.filter(_prefix('search_key', search_key(query))).values('substance_id')
+    )
+
+
+def backfill(chunk_size=1000):
+    """물질이 연결되지 않은 유해물질 행을 pk 순서로 chunk_size 개씩 등록부에 연결
+
+    (연결한 행 수, CAS 번호가 없거나 잘못되었거나 등록부에 없어 건너뛴 행 수) 를 반환합니다.
+    chunk 마다 조회 한 번, 물질 조회, 물질별 UPDATE 로 처리하므로 중간에 멈춰도 다시 실행하면 이어서 합니다.
+    """
+    unmapped = HazardousMaterial.objects.filter(substance__isnull=True).order_by('pk')
+    mapped = skipped = 0
+    last_pk = 0
+    while True:
+        rows = list(unmapped.filter(pk__gt=last_pk).values_list('pk', 'cas_number', 'material_name')[:chunk_size])
+        if not rows:
+            if mapped:
+                response_cache.invalidate_all(HazardousMaterial)
+            return mapped, skipped
+        last_pk = rows[-1][0]
+
+        entries = [(pk, normalize_cas_or_none(cas_number)) for pk, cas_number, _ in rows]
+        ids = resolve(cas_number for _, cas_number in entries)
+        by_substance = defaultdict(list)
+        for pk, cas_number in entries:
+            if cas_number in ids:
+                by_substance[ids[cas_number]].append(pk)
+            else:
+                skipped += 1
+        for substance_id, pks in by_substance.items():
+            mapped += HazardousMaterial.objects.filter(pk__in=pks, substance__isnull=True).update(
+                substance_id=substance_id, updated_at=timezone.now()
+            )
@@ -0,0 +1,253 @@
+"""
+대시보드 요약 건수
+
+PurchaseOrder / DeclarationRequest / Declaration 의 상태별 건수를 범위(전체, 고객사, 공급업체)마다
+StatusCount 에 저장하고, 대기 중인 신고서 요청은 마감일별로 DueDateCount 에 저장합니다.
+
+- 저장/삭제 시 signals 가 record_save / record_delete 로 변경분만 반영 (저장 1회당 INSERT IGNORE + UPDATE)
+- update() 로 customer_id 를 옮길 때는 reassign_customer 사용
+- rebuild() 는 GROUP BY 결과로 전체 재작성, find_mismatches() 는 두 결과를 비교
+"""
+from collections import Counter, defaultdict
+from functools import reduce
+from operator import or_
+
+from django.db import transaction
+from django.db.models import Case, Count, F, IntegerField, Q, Sum, Value, When
+from django.utils import timezone
+
+from .models import PurchaseOrder, DeclarationRequest, Declaration, StatusCount, DueDateCount
+
+# entity 이름 → (모델, 범위 컬럼)
+ENTITIES = {
+    'purchase_order': (PurchaseOrder, {'customer': 'customer_id'}),
+    'declaration_request': (DeclarationRequest, {'customer': 'customer_id', 'supplier': 'supplier_id'}),
+    'declaration': (Declaration, {'customer': 'customer_id', 'supplier': 'supplier_id'}),
+}
+ENTITY_BY_MODEL = {model: entity for entity, (model, _) in ENTITIES.items()}
+
+# 마감일이 지나면 지연으로 보는 신고서 요청 상태
+OPEN_REQUEST_STATUS = 'pending'
+
+STATUS_KEY = ('scope', 'scope_id', 'entity', 'status')
+DUE_DATE_KEY = ('scope', 'scope_id', 'due_date')
+
+# 쿼리 예산(ihm_backend.query_budget)용: record_changes 한 번의 쿼리 수
+RECORD_QUERIES = 2          # StatusCount INSERT IGNORE + UPDATE
+DUE_DATE_QUERIES = 2        # 대기 중인 요청의 마감일 건수가 바뀌면 DueDateCount 에도 같은 두 쿼리
+SUMMARY_QUERIES = 2         # summary_for: StatusCount 상태별 건수 + DueDateCount 마감 지연 합계
+
+
+def _scopes(entity, values):
+    yield 'all', 0
+    for scope, attname in ENTITIES[entity][1].items():
+        if values.get(attname) is not None:
+            yield scope, values[attname]
+
+
+def _keys(entity, values):
+    """행 하나가 속하는 StatusCount 키와 DueDateCount 키"""
+    status_keys = [(scope, scope_id, entity, values['status']) for scope, scope_id in _scopes(entity, values)]
+    due_keys = []
+    if (entity == 'declaration_request' and values['status'] == OPEN_REQUEST_STATUS
+            and values.get('due_date') is not None):
+        due_keys = [(scope, scope_id, values['due_date']) for scope, scope_id in _scopes(entity, values)]
+    return status_keys, due_keys
+
+
+def _deltas(entity, old, new):
+    status, due = Counter(), Counter()
+    for values, sign in ((old, -1), (new, 1)):
+        if values is None:
+            continue
+        status_keys, due_keys = _keys(entity, values)
+        for key in status_keys:
+            status[key] += sign
+        for key in due_keys:
+            due[key] += sign
+    return status, due
+
+
+def _apply(model, key_fields, deltas):
+    """키별 증감을 반영 - 없는 키는 0 으로 만든 뒤(INSERT IGNORE) CASE 식 UPDATE 한 번으로 더한다"""
+    deltas = {key: delta for key, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    model.objects.bulk_create(
+        [model(count=0, **dict(zip(key_fields, key))) for key in deltas], ignore_conflicts=True
+    )
+
+    by_delta = defaultdict(list)
+    for key, delta in deltas.items():
+        by_delta[delta].append(Q(**dict(zip(key_fields, key))))
+    conditions = {delta: reduce(or_, keys) for delta, keys in by_delta.items()}
+    increment = Case(
+        *[When(condition, then=Value(delta)) for delta, condition in conditions.items()],
+        output_field=IntegerField(),
+    )
+    model.objects.filter(reduce(or_, conditions.values())).update(count=F('count') + increment)
+
+
+def _apply_deltas(status, due):
+    _apply(StatusCount, STATUS_KEY, status)
+    _apply(DueDateCount, DUE_DATE_KEY, due)
+
+
+def row_values(instance):
+    """건수 계산에 쓰는 instance 의 현재 값"""
+    return {name: getattr(instance, name) for name in instance._tracked_attnames()}
+
+
+def record_changes(model, changes):
+    """여러 행의 변경을 한 번에 반영
+
+    changes 는 (변경 전 값, 변경 후 값) 목록으로, 생성은 변경 전이 None, 삭제는 변경 후가 None 입니다.
+    bulk_create / update() 처럼 signal 이 발생하지 않는 일괄 변경 후 호출합니다.
+    """
+    entity = ENTITY_BY_MODEL[model]
+    status, due = Counter(), Counter()
+    for old, new in changes:
+        row_status, row_due = _deltas(entity, old, new)
+        status.update(row_status)
+        due.update(row_due)
+    _apply_deltas(status, due)
+
+
+def record_save(instance, created):
+    if created:
+        old = None
+    else:
+        old = getattr(instance, 'loaded_values', None)
+        if not old or any(name not in old for name in instance._tracked_attnames()):
+            # 변경 전 값을 모르면 반영하지 않는다 (check_dashboard_summary 로 감지)
+            return
+    record_changes(type(instance), [(old, row_values(instance))])
+
+
+def record_delete(instance):
+    old = getattr(instance, 'loaded_values', None) or row_values(instance)
+    record_changes(type(instance), [(old, None)])
+
+
+def reassign_customer(queryset, customer_id):
+    """queryset 의 customer_id 를 일괄 변경하면서 건수도 옮긴다"""
+    queryset = queryset.exclude(customer_id=customer_id)
+    if queryset.model not in ENTITY_BY_MODEL:
+        return queryset.update(customer_id=customer_id)
+
+    changes = []
+    for row in queryset.values(*queryset.model._tracked_attnames()).annotate(n=Count('pk')).order_by():
+        n = row.pop('n')
+        changes.extend([(row, dict(row, customer_id=customer_id))] * n)
+    record_changes(queryset.model, changes)
+    return queryset.update(customer_id=customer_id)
+
+
+def expected_counts():
+    """원본 테이블의 GROUP BY 결과로 계산한 (StatusCount, DueDateCount) 건수"""
+    status, due = Counter(), Counter()
+    for entity, (model, scope_fields) in ENTITIES.items():
+        for scope, attname in [('all', None), *scope_fields.items()]:
+            group_by = [attname] if attname else []
+            rows = model.objects.values(*group_by, 'status').annotate(n=Count('pk')).order_by()
+            for row in rows:
+                scope_id = row[attname] if attname else 0
+                if scope_id is not None:
+                    status[(scope, scope_id, entity, row['status'])] += row['n']
+
+    open_requests = DeclarationRequest.objects.filter(status=OPEN_REQUEST_STATUS, due_date__isnull=False)
+    for scope, attname in [('all', None), *ENTITIES['declaration_request'][1].items()]:
+        group_by = [attname] if attname else []
+        for row in open_requests.values(*group_by, 'due_date').annotate(n=Count('pk')).order_by():
+            scope_id = row[attname] if attname else 0
+            if scope_id is not None:
+                due[(scope, scope_id, row['due_date'])] += row['n']
+    return status, due
+
+
+def stored_counts():
+    status = Counter({
+        key[:-1]: key[-1]
+        for key in StatusCount.objects.exclude(count=0).values_list(*STATUS_KEY, 'count')
+    })
+    due = Counter({
+        key[:-1]: key[-1]
+        for key in DueDateCount.objects.exclude(count=0).values_list(*DUE_DATE_KEY, 'count')
+    })
+    return status, due
+
+
+def find_mismatches():
+    """저장된 건수와 GROUP BY 결과가 다른 키 목록 [(테이블, 키, 저장값, 실제값)]"""
+    mismatches = []
+    for table, stored, expected in zip(('status', 'due_date'), stored_counts(), expected_counts()):
+        for key in sorted(set(stored) | set(expected), key=str):
+            if stored[key] != expected[key]:
+                mismatches.append((table, key, stored[key], expected[key]))
+    return mismatches
+
+
+@transaction.atomic
+def rebuild():
+    """요약 테이블을 원본 테이블로부터 다시 작성"""
+    status, due = expected_counts()
+    StatusCount.objects.all().delete()
+    DueDateCount.objects.all().delete()
+    StatusCount.objects.bulk_create(
+        StatusCount(count=n, **dict(zip(STATUS_KEY, key))) for key, n in status.items()
+    )
+    DueDateCount.objects.bulk_create(
+        DueDateCount(count=n, **dict(zip(DUE_DATE_KEY, key))) for key, n in due.items()
+    )
+    return len(status), len(due)
+
+
+def scope_for(user, entity):
+    """요청 사용자가 entity 목록에서 보는 범위 - 각 ViewSet 의 get_queryset 과 같은 규칙"""
+    scope_fields = ENTITIES[entity][1]
+    if user.user_type == 'customer' and 'customer' in scope_fields:
+        return 'customer', user.customer_id or 0
+    if user.user_type == 'supplier' and 'supplier' in scope_fields:
+        return 'supplier', user.supplier_id or 0
+    return 'all', 0
+
+
+def _summary_queries(user, today):
+    """(상태별 건수 조회, 마감 지연 건수 조회) - 아직 실행하지 않은 쿼리셋"""
+    today = today or timezone.localdate()
+    scopes = {entity: scope_for(user, entity) for entity in ENTITIES}
+    condition = reduce(or_, (
+        Q(scope=scope, scope_id=scope_id, entity=entity) for entity, (scope, scope_id) in scopes.items()
+    ))
+    scope, scope_id = scopes['declaration_request']
+    return (
+        StatusCount.objects.filter(condition).values_list('entity', 'status', 'count'),
+        DueDateCount.objects.filter(scope=scope, scope_id=scope_id, due_date__lt=today),
+    )
+
+
+def _summary(rows, overdue):
+    counts = {(entity, status): count for entity, status, count in rows}
+    summary = {}
+    for entity, (model, _) in ENTITIES.items():
+        by_status = {
+            status: counts.get((entity, status), 0)
+            for status, _ in model._meta.get_field('status').choices
+        }
+        by_status['total'] = sum(by_status.values())
+        summary[entity] = by_status
+    summary['declaration_request']['overdue'] = overdue or 0
+    return summary
+
+
+def summary_for(user, today=None):
+    """요청 사용자 범위의 상태별 건수와 마감 지연 건수"""
+    counts, overdue = _summary_queries(user, today)
+    return _summary(counts, overdue.aggregate(n=Sum('count'))['n'])
+
+
+async def asummary_for(user, today=None):
+    """summary_for 의 async ORM 버전"""
+    counts, overdue = _summary_queries(user, today)
+    rows = [row async for row in counts]
+    return _summary(rows, (await overdue.aaggregate(n=Sum('count')))['n'])
@@ -0,0 +1,40 @@
+"""
+declarations 앱의 백그라운드 작업 (run_worker 가 실행)
+
+- ship_report: 선박 IHM 보고서 생성 (reports.enqueue 가 선박 하나당 하나씩 등록)
+- rebuild_ship_inventory / rebuild_dashboard_summary / backfill_substances / reevaluate_compliance:
+  같은 이름의 관리 명령과 같은 작업 (reevaluate_compliance 는 적합성 기준값이 바뀌면 자동 등록)
+"""
+from jobs.registry import job
+from . import compliance, inventory, reports, substances, summary
+
+
+def _report_failed(failed_job):
+    reports.mark_failed(failed_job.payload['report_id'], failed_job.last_error)
+
+
+@job(reports.REPORT_JOB_TYPE, concurrency=4, max_attempts=3, retry_delay=30, on_failure=_report_failed)
+def generate_ship_report(report_id):
+    return {'report_id': report_id, 'content_hash': reports.generate(report_id)}
+
+
+@job('rebuild_ship_inventory', concurrency=1, priority=-10)
+def rebuild_ship_inventory(chunk_size=200):
+    return {'ships': inventory.rebuild(chunk_size=chunk_size)}
+
+
+@job('rebuild_dashboard_summary', concurrency=1, priority=-10)
+def rebuild_dashboard_summary():
+    status_rows, due_rows = summary.rebuild()
+    return {'status_rows': status_rows, 'due_rows': due_rows}
+
+
+@job('backfill_substances', concurrency=1, priority=-10)
+def backfill_substances(chunk_size=1000):
+    mapped, skipped = substances.backfill(chunk_size=chunk_size)
+    return {'mapped': mapped, 'skipped': skipped}
+
+
+@job('reevaluate_compliance', concurrency=1)
+def reevaluate_compliance(chunk_size=2000):
+    return {'changed': compliance.reevaluate(chunk_size=chunk_size)}
@@ -1,3 +1,1400 @@
-from django.test import TestCase
+import csv
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from importlib import import_module
+from io import BytesIO, StringIO
+from unittest import mock
+from xml.etree import ElementTree
 
-# Create your tests here.
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.apps import apps
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection, transaction
+from django.db.models import F
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import include, path, resolve
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory, APITestCase
+
+from ihm_backend.async_views import async_routes
+from ihm_backend.fast_list import compile_serializer
+from ihm_backend.query_budget import AUTH, QueryBudgetExceeded
+from ihm_backend.renderers import FastJSONRenderer
+from ihm_backend.testing import (
+    QueryCountTestMixin, make_user, make_customer, make_supplier, make_ship,
+    make_purchase_order, make_declaration_request, make_declaration_chain, make_cas, token_user,
+)
+from jobs.models import Job
+from jobs.queue import work
+from ships.urls import router as ship_router
+from users.authentication import ClaimsTokenObtainPairSerializer
+from . import bulk, compliance, inventory, reports, substances, summary, workflow
+from .models import (
+    PurchaseOrder, DeclarationRequest, Declaration, HazardousMaterial, ShipInventoryItem, StatusCount, Substance,
+    ComplianceThreshold, ShipReport,
+)
+from .query_plans import check_query_plans
+from .urls import router as declaration_router
+from .views import DashboardViewSet
+from .serializers import (
+    DeclarationListSerializer, DeclarationRequestSerializer, DeclarationSerializer, HazardousMaterialSerializer,
+    PurchaseOrderListSerializer,
+)
+from .summary import find_mismatches
+
+# 0016_regulated_substances 로 등록부에 들어 있는 CAS 번호 (납, 카드뮴, 수은)
+REGISTERED_CAS = ['7439-92-1', '7440-43-9', '7439-97-6']
+
+
+class DeclarationQueryCountTests(QueryCountTestMixin, APITestCase):
+    """declarations 앱 ViewSet 의 N+1 회귀 테스트"""
+
+    def setUp(self):
+        super().setUp()
+        self.operator = make_user('operator')
+        self.customer = make_customer()
+        self.ship = make_ship(self.customer)
+        self.supplier = make_supplier()
+
+    def seed_requests(self, n, status='pending'):
+        for _ in range(n):
+            po = make_purchase_order(make_ship(self.customer), status='requested')
+            make_declaration_request(po, self.supplier, status=status)
+
+    def seed_declarations(self, n, **kwargs):
+        for _ in range(n):
+            make_declaration_chain(make_ship(self.customer), self.supplier, hazmat_count=2, **kwargs)
+
+    def test_purchase_order_list(self):
+        seed = lambda n: [make_purchase_order(make_ship(self.customer)) for _ in range(n)]
+        for user in (self.operator, self.customer.user):
+            with self.subTest(user_type=user.user_type):
+                self.client.force_authenticate(token_user(user))
+                self.assertQueryCountStable('/api/purchase-orders/', seed)
+
+    def test_purchase_order_detail(self):
+        po = make_purchase_order(self.ship)
+        self.client.force_authenticate(token_user(self.operator))
+        self.count_queries(f'/api/purchase-orders/{po.id}/', expand='ship_info')
+
+    def test_declaration_request_list(self):
+        for user in (self.operator, self.supplier.user, self.customer.user):
+            with self.subTest(user_type=user.user_type):
+                self.client.force_authenticate(token_user(user))
+                self.assertQueryCountStable('/api/declaration-requests/', self.seed_requests)
+
+    def test_pending_requests(self):
+        self.client.force_authenticate(token_user(self.supplier.user))
+        self.assertQueryCountStable('/api/declaration-requests/pending/', self.seed_requests)
+
+    def test_pending_requests_paginated_and_pinned(self):
+        self.seed_requests(25)
+        self.seed_requests(3, status='submitted')
+        self.client.force_authenticate(token_user(self.supplier.user))
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/declaration-requests/pending/', {'page_size': 10})
+        self.assertEqual(response.data['count'], 25)
+        self.assertEqual(len(response.data['results']), 10)
+
+    def test_declaration_list(self):
+        for user in (self.operator, self.supplier.user, self.customer.user):
+            with self.subTest(user_type=user.user_type):
+                self.client.force_authenticate(token_user(user))
+                self.assertQueryCountStable('/api/declarations/', self.seed_declarations)
+
+    def test_my_ship_declarations(self):
+        self.client.force_authenticate(token_user(self.customer.user))
+        self.assertQueryCountStable(
+            '/api/declarations/my_ship_declarations/',
+            lambda n: self.seed_declarations(n, status='approved')
+        )
+
+    def test_my_ship_declarations_paginated_and_pinned(self):
+        self.seed_declarations(25, status='approved')
+        self.seed_declarations(3)
+        self.client.force_authenticate(token_user(self.customer.user))
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/declarations/my_ship_declarations/', {'page_size': 10})
+        self.assertEqual(response.data['count'], 25)
+        self.assertEqual(len(response.data['results']), 10)
+        self.assertIn('purchase_order_title', response.data['results'][0])
+
+    def test_declaration_detail(self):
+        declaration = make_declaration_chain(self.ship, self.supplier)
+        self.client.force_authenticate(token_user(self.operator))
+        self.assertQueryCountStable(
+            f'/api/declarations/{declaration.id}/',
+            lambda n: HazardousMaterial.objects.bulk_create(
+                HazardousMaterial(declaration=declaration, material_name='Lead') for _ in range(n)
+            ),
+            expand='declaration_request_info,supplier_info.user_info,ship_info,hazardous_materials'
+        )
+
+    def test_hazardous_material_list(self):
+        declaration = make_declaration_chain(self.ship, self.supplier)
+        self.client.force_authenticate(token_user(self.operator))
+        self.assertQueryCountStable(
+            '/api/hazardous-materials/',
+            lambda n: HazardousMaterial.objects.bulk_create(
+                HazardousMaterial(declaration=declaration, material_name='Lead') for _ in range(n)
+            )
+        )
+
+    def test_workflow_actions_within_budget(self):
+        """쓰기 액션의 가장 비싼 경로를 실제 토큰(인증 쿼리 포함)으로 실행 - 예산은 계획한 쿼리 구성"""
+        operator, supplier = self.operator, self.supplier.user
+        po = make_purchase_order(self.ship)
+        self.budget_request(operator, 'post', f'/api/purchase-orders/{po.id}/request_declaration/',
+                            {'supplier': self.supplier.id, 'due_date': '2030-01-01'})
+
+        for name in ('approve', 'reject'):
+            with self.subTest(declaration_request=name):
+                request = make_declaration_request(
+                    make_purchase_order(self.ship, status='requested'), self.supplier, due_date=date(2030, 1, 1)
+                )
+                self.budget_request(operator, 'post', f'/api/declaration-requests/{request.id}/{name}/')
+
+        # 승인된 신고서의 반려는 승인 취소(요청/발주 되돌리기)까지 포함
+        declaration = make_declaration_chain(self.ship, self.supplier, hazmat_count=3)
+        self.budget_request(operator, 'post', f'/api/declarations/{declaration.id}/approve/')
+        self.budget_request(operator, 'post', f'/api/declarations/{declaration.id}/reject/')
+
+        ids = [make_declaration_chain(make_ship(self.customer), self.supplier, hazmat_count=2).id for _ in range(3)]
+        self.budget_request(operator, 'post', '/api/declarations/bulk-approve/', {'ids': ids})
+        self.budget_request(operator, 'post', '/api/declarations/bulk-reject/', {'ids': ids})
+
+        orders = [make_purchase_order(self.ship, status='requested') for _ in range(3)]
+        make_declaration_request(orders[0], self.supplier, due_date=date(2030, 1, 1))
+        self.budget_request(supplier, 'post', '/api/declarations/bulk/', [
+            {'purchase_order': order.id, 'declaration_number': f'B-{order.id}', 'declaration_type': 'MD',
+             'hazardous_materials': [{'material_name': 'Lead', 'cas_number': REGISTERED_CAS[0],
+                                      'content_percentage': '0.01'}]}
+            for order in orders
+        ])
+
+
+class SparseFieldsetTests(APITestCase):
+    """?fields= / ?expand= 와 그에 맞춘 쿼리 축소"""
+
+    def setUp(self):
+        self.client.force_authenticate(token_user(make_user('operator')))
+        self.declaration = make_declaration_chain(make_ship(make_customer()), make_supplier(), hazmat_count=2)
+        self.url = f'/api/declarations/{self.declaration.id}/'
+
+    def test_nested_objects_are_opt_in(self):
+        with self.assertNumQueries(1):
+            data = self.client.get(self.url).data
+        for name in ('declaration_request_info', 'supplier_info', 'ship_info', 'hazardous_materials'):
+            self.assertNotIn(name, data)
+        self.assertEqual(data['declaration_number'], self.declaration.declaration_number)
+
+        with self.assertNumQueries(2):
+            data = self.client.get(self.url, {'expand': 'supplier_info.user_info,hazardous_materials'}).data
+        self.assertEqual(len(data['hazardous_materials']), 2)
+        self.assertEqual(data['supplier_info']['user_info']['id'], self.declaration.supplier.user_id)
+        self.assertNotIn('ship_info', data)
+
+        with self.assertNumQueries(1):
+            data = self.client.get(self.url, {'fields': 'id,declaration_number'}).data
+        self.assertEqual(data, {'id': self.declaration.id, 'declaration_number': self.declaration.declaration_number})
+
+    def test_supplier_info_without_user_info_skips_join(self):
+        data = self.client.get(self.url, {'expand': 'supplier_info'}).data
+        self.assertIn('company_name', data['supplier_info'])
+        self.assertNotIn('user_info', data['supplier_info'])
+        data = self.client.get(self.url, {'fields': 'supplier_info.company_name'}).data
+        self.assertEqual(data['supplier_info'], {'company_name': self.declaration.supplier.company_name})
+
+    def test_fields_selects_top_level_and_nested(self):
+        data = self.client.get(self.url, {'fields': 'id,status,ship_info.ship_name'}).data
+        self.assertEqual(set(data), {'id', 'status', 'ship_info'})
+        self.assertEqual(set(data['ship_info']), {'ship_name'})
+
+    def test_fields_on_list(self):
+        data = self.client.get('/api/declarations/', {'fields': 'id,ship_name'}).data
+        self.assertEqual(set(data['results'][0]), {'id', 'ship_name'})
+
+    def test_fields_ignored_on_write(self):
+        response = self.client.patch(
+            f'/api/purchase-orders/{self.declaration.declaration_request.purchase_order_id}/?fields=id',
+            {'title': 'Updated'}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['title'], 'Updated')
+
+
+class QueryPlannerTests(APITestCase):
+    """Serializer 로부터 구성된 조인/컬럼 목록"""
+
+    def setUp(self):
+        self.client.force_authenticate(token_user(make_user('operator')))
+        self.declaration = make_declaration_chain(make_ship(make_customer()), make_supplier(), hazmat_count=2)
+
+    def capture(self, url, **params):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return response.data, ctx.captured_queries
+
+    def test_list_reads_only_serialized_columns(self):
+        data, queries = self.capture('/api/purchase-orders/')
+        sql = queries[-1]['sql']
+        self.assertIn('"ships"."ship_name"', sql)
+        for column in ('item_description', 'description', 'delivery_date'):
+            self.assertNotIn(f'"purchase_orders"."{column}"', sql)
+        self.assertIn('ship_name', data['results'][0])
+
+    def test_declaration_list_joins_purchase_order(self):
+        data, queries = self.capture('/api/declarations/')
+        self.assertEqual(len(queries), 2)
+        sql = queries[-1]['sql']
+        self.assertIn('"purchase_orders"."title"', sql)
+        self.assertNotIn('hazardous_materials_json', sql)
+        self.assertEqual(
+            data['results'][0]['purchase_order_title'],
+            self.declaration.declaration_request.purchase_order.title
+        )
+
+    def test_fields_narrow_the_query(self):
+        _, queries = self.capture('/api/declarations/', fields='id,status')
+        self.assertNotIn('JOIN', queries[-1]['sql'])
+
+    def test_write_actions_load_full_rows(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(f'/api/declarations/{self.declaration.id}/approve/')
+        self.assertEqual(response.status_code, 200)
+        select = next(q['sql'] for q in ctx.captured_queries if q['sql'].startswith('SELECT'))
+        self.assertIn('"declarations"."manufacturer"', select)
+
+
+class DenormalizedCustomerTests(APITestCase):
+    """customer_id 비정규화 컬럼의 일관성"""
+
+    def setUp(self):
+        self.customer = make_customer()
+        self.ship = make_ship(self.customer)
+        self.declaration = make_declaration_chain(self.ship, make_supplier(), hazmat_count=2, status='approved')
+
+    def chain_customer_ids(self):
+        declaration = Declaration.objects.get(pk=self.declaration.pk)
+        request = declaration.declaration_request
+        return {
+            request.purchase_order.customer_id, request.customer_id, declaration.customer_id,
+            *declaration.hazardous_materials.values_list('customer_id', flat=True),
+        }
+
+    def test_customer_follows_parent_on_create(self):
+        self.assertEqual(self.chain_customer_ids(), {self.customer.id})
+
+    def test_ship_owner_change_propagates(self):
+        other = make_customer()
+        self.ship.customer = other
+        self.ship.save()
+        self.assertEqual(self.chain_customer_ids(), {other.id})
+
+    def test_purchase_order_ship_change_propagates(self):
+        other_ship = make_ship(make_customer())
+        purchase_order = PurchaseOrder.objects.get(pk=self.declaration.declaration_request.purchase_order_id)
+        purchase_order.ship = other_ship
+        purchase_order.save()
+        self.assertEqual(
+            DeclarationRequest.objects.get(pk=self.declaration.declaration_request_id).customer_id,
+            other_ship.customer_id
+        )
+
+    def test_customer_scoped_list_reads_single_table(self):
+        self.client.force_authenticate(token_user(self.customer.user))
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/api/declarations/my_ship_declarations/', {'fields': 'id,status'})
+        self.assertEqual([row['id'] for row in response.data['results']], [self.declaration.id])
+        for query in ctx.captured_queries:
+            self.assertNotIn('JOIN', query['sql'])
+
+    def test_backfill_migration(self):
+        backfill = import_module('declarations.migrations.0010_denormalized_customer').backfill_customer
+        for model in (PurchaseOrder, DeclarationRequest, Declaration, HazardousMaterial):
+            model.objects.update(customer=None)
+        backfill(apps, None)
+        self.assertEqual(self.chain_customer_ids(), {self.customer.id})
+
+
+class DashboardSummaryTests(QueryCountTestMixin, APITestCase):
+    """요약 테이블 증분 갱신과 GROUP BY 결과의 일치"""
+
+    def setUp(self):
+        super().setUp()
+        self.operator = make_user('operator')
+        self.customer = make_customer()
+        self.ship = make_ship(self.customer)
+        self.supplier = make_supplier()
+        today = date.today()
+        make_declaration_request(make_purchase_order(self.ship), self.supplier, due_date=today - timedelta(days=3))
+        make_declaration_request(make_purchase_order(self.ship), self.supplier, due_date=today + timedelta(days=3))
+        make_declaration_chain(self.ship, self.supplier, status='approved')
+        make_declaration_chain(make_ship(make_customer()), make_supplier())
+        make_purchase_order(self.ship)
+
+    def summary(self, user):
+        self.client.force_authenticate(token_user(user))
+        with self.assertNumQueries(summary.SUMMARY_QUERIES):
+            response = self.client.get('/api/dashboard/summary/')
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_within_budget_with_token_lookup(self):
+        for user in (self.operator, self.customer.user, self.supplier.user):
+            with self.subTest(user_type=user.user_type):
+                response = self.budget_request(user, 'get', '/api/dashboard/summary/')
+                self.assertEqual(int(response['X-Query-Count']), AUTH + summary.SUMMARY_QUERIES)
+
+    def test_counts_per_scope(self):
+        self.assertEqual(find_mismatches(), [])
+
+        data = self.summary(self.operator)
+        self.assertEqual(data['purchase_order']['total'], 5)
+        self.assertEqual(data['declaration']['approved'], 1)
+        self.assertEqual(data['declaration']['submitted'], 1)
+        self.assertEqual(data['declaration_request']['pending'], 2)
+        self.assertEqual(data['declaration_request']['overdue'], 1)
+
+        data = self.summary(self.customer.user)
+        self.assertEqual(data['purchase_order']['total'], 4)
+        self.assertEqual(data['declaration'], {'draft': 0, 'submitted': 0, 'approved': 1, 'rejected': 0, 'total': 1})
+
+        data = self.summary(self.supplier.user)
+        self.assertEqual(data['declaration_request']['total'], 3)
+        self.assertEqual(data['declaration']['total'], 1)
+
+    def test_workflow_keeps_counters_consistent(self):
+        self.client.force_authenticate(token_user(self.operator))
+        po = make_purchase_order(self.ship)
+        self.client.post(f'/api/purchase-orders/{po.id}/request_declaration/', {'supplier': self.supplier.id})
+
+        self.client.force_authenticate(token_user(self.supplier.user))
+        response = self.client.post('/api/declarations/', {'purchase_order': po.id}, format='json')
+        self.assertEqual(response.status_code, 201, response.content)
+        declaration = Declaration.objects.get(declaration_request__purchase_order=po)
+
+        self.client.force_authenticate(token_user(self.operator))
+        self.client.post(f'/api/declarations/{declaration.id}/approve/')
+        pending = Declaration.objects.filter(status='submitted').first()
+        self.client.post(f'/api/declarations/{pending.id}/reject/')
+        self.client.delete(f'/api/purchase-orders/{make_purchase_order(self.ship).id}/')
+        self.assertEqual(find_mismatches(), [])
+
+        self.ship.customer = make_customer()
+        self.ship.save()
+        self.assertEqual(find_mismatches(), [])
+
+    def test_check_command_detects_and_fixes_drift(self):
+        StatusCount.objects.filter(scope='all', entity='declaration').update(count=F('count') + 5)
+        with self.assertRaises(CommandError):
+            call_command('check_dashboard_summary', stdout=StringIO())
+
+        call_command('check_dashboard_summary', '--fix', stdout=StringIO())
+        self.assertEqual(find_mismatches(), [])
+
+        StatusCount.objects.all().delete()
+        call_command('rebuild_dashboard_summary', stdout=StringIO())
+        self.assertEqual(self.summary(self.operator)['purchase_order']['total'], 5)
+
+
+class BulkSubmitTests(QueryCountTestMixin, APITestCase):
+    """POST /api/declarations/bulk/ 일괄 제출"""
+
+    def setUp(self):
+        super().setUp()
+        self.supplier = make_supplier()
+        self.ship = make_ship(make_customer())
+        self.client.force_authenticate(token_user(self.supplier.user))
+
+    def payload(self, n, substances=3):
+        orders = [make_purchase_order(self.ship, status='requested') for _ in range(n)]
+        # 절반은 이미 요청이 있는 구매 주문
+        for po in orders[::2]:
+            make_declaration_request(po, self.supplier)
+        return [
+            {
+                'purchase_order': po.id,
+                'declaration_number': f'BULK-{po.order_number}',
+                'declaration_type': 'MD',
+                'hazardous_materials': [
+                    {'material_name': f'M{i}', 'cas_number': cas_number, 'content_percentage': '0.10'}
+                    for i, cas_number in enumerate(REGISTERED_CAS[:substances])
+                ],
+            }
+            for po in orders
+        ]
+
+    def post(self, data):
+        return self.client.post('/api/declarations/bulk/', data, format='json')
+
+    def test_creates_everything_with_constant_queries(self):
+        counts = []
+        for n in (2, 20):
+            data = self.payload(n)
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.post(data)
+            self.assertEqual(response.status_code, 201, response.content)
+            self.assertEqual(response.data['created'], n)
+            counts.append(len(ctx.captured_queries))
+        self.assertEqual(counts[0], counts[1])
+
+        self.assertEqual(Declaration.objects.filter(status='submitted', supplier=self.supplier).count(), 22)
+        self.assertEqual(HazardousMaterial.objects.filter(customer_id=self.ship.customer_id).count(), 66)
+        self.assertFalse(HazardousMaterial.objects.filter(substance__isnull=True).exists())
+        self.assertFalse(DeclarationRequest.objects.exclude(status='submitted').exists())
+        self.assertEqual(find_mismatches(), [])
+
+    def test_reports_per_item_errors_and_saves_nothing(self):
+        data = self.payload(3)
+        other = make_declaration_request(make_purchase_order(self.ship), make_supplier())
+        data[1]['declaration_number'] = data[0]['declaration_number']
+        data.append({'purchase_order': other.purchase_order_id, 'declaration_number': 'X-1'})
+        data.append({'purchase_order': 999999})
+        data.append({'purchase_order': data[2]['purchase_order'], 'declaration_number': 'X-2'})
+
+        response = self.post(data)
+        self.assertEqual(response.status_code, 400)
+        errors = {e['index']: e['errors'] for e in response.data['errors']}
+        self.assertEqual(set(errors), {1, 3, 4, 5})
+        self.assertIn('declaration_number', errors[1])
+        self.assertIn('purchase_order', errors[3])
+        self.assertIn('purchase_order', errors[5])
+        self.assertFalse(Declaration.objects.exists())
+
+        response = self.post([{'purchase_order': 'abc'}, {'purchase_order': data[0]['purchase_order']}])
+        self.assertEqual([e['index'] for e in response.data['errors']], [0])
+
+    def test_rejects_already_submitted_and_non_suppliers(self):
+        declaration = make_declaration_chain(self.ship, self.supplier)
+        response = self.post([{'purchase_order': declaration.declaration_request.purchase_order_id}])
+        self.assertEqual(response.status_code, 400)
+
+        # 신고서 없이 이미 제출/승인된 요청은 단건 제출처럼 전환 충돌로 거부
+        data = self.payload(3)
+        for item, request_status in zip(data, ('submitted', 'approved')):
+            DeclarationRequest.objects.filter(purchase_order_id=item['purchase_order']).update(status=request_status)
+        data[1]['purchase_order'] = make_declaration_request(
+            make_purchase_order(self.ship), self.supplier, status='approved'
+        ).purchase_order_id
+        response = self.post(data)
+        self.assertEqual(response.status_code, 400)
+        errors = {e['index']: e['errors'] for e in response.data['errors']}
+        self.assertEqual(set(errors), {0, 1})
+        self.assertIn('submitted', errors[0]['purchase_order'][0])
+        self.assertIn('approved', errors[1]['purchase_order'][0])
+        self.assertEqual(Declaration.objects.count(), 1)
+
+        self.client.force_authenticate(token_user(make_user('operator')))
+        self.assertEqual(self.post(self.payload(1)).status_code, 403)
+
+
+class BulkReviewTests(APITestCase):
+    """POST /api/declarations/bulk-approve/, bulk-reject/ 일괄 승인/거절"""
+
+    def setUp(self):
+        self.operator = make_user('operator')
+        self.supplier = make_supplier()
+        self.ships = [make_ship(make_customer()), make_ship(make_customer())]
+        self.client.force_authenticate(token_user(self.operator))
+
+    def submitted(self, n):
+        return [
+            make_declaration_chain(self.ships[i % 2], self.supplier, hazmat_count=2).id
+            for i in range(n)
+        ]
+
+    def inventory_rows(self):
+        return sorted(ShipInventoryItem.objects.values_list(
+            'ship_id', 'cas_number', 'item_count', 'declaration_count', 'declaration_ids'
+        ))
+
+    def test_approves_all_tables_with_constant_queries(self):
+        counts = []
+        for n in (2, 20):
+            ids = self.submitted(n)
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.post('/api/declarations/bulk-approve/', {'ids': ids}, format='json')
+            self.assertEqual(response.status_code, 200, response.content)
+            self.assertEqual(response.data['processed'], n)
+            counts.append(len(ctx.captured_queries))
+        self.assertEqual(counts[0], counts[1])
+
+        self.assertFalse(Declaration.objects.exclude(status='approved').exists())
+        self.assertEqual(Declaration.objects.filter(approved_by=self.operator).count(), 22)
+        self.assertFalse(DeclarationRequest.objects.exclude(status='approved').exists())
+        self.assertFalse(PurchaseOrder.objects.exclude(status='completed').exists())
+        self.assertEqual(find_mismatches(), [])
+
+        rows = self.inventory_rows()
+        self.assertEqual(len(rows), 4)
+        inventory.rebuild()
+        self.assertEqual(self.inventory_rows(), rows)
+
+    def test_reports_per_id_outcomes(self):
+        rejected = make_declaration_chain(self.ships[0], self.supplier, status='rejected')
+        ids = self.submitted(2)
+        response = self.client.post(
+            '/api/declarations/bulk-reject/',
+            {'ids': [ids[0], rejected.id, 999999, ids[1], ids[0]], 'rejection_reason': '서명 누락'},
+            format='json',
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.data['processed'], 2)
+        self.assertEqual(
+            [(r['id'], r['outcome']) for r in response.data['results']],
+            [(ids[0], 'rejected'), (rejected.id, 'invalid_status'), (999999, 'not_found'), (ids[1], 'rejected')],
+        )
+        self.assertEqual(
+            set(Declaration.objects.filter(pk__in=ids).values_list('status', 'rejection_reason')),
+            {('rejected', '서명 누락')},
+        )
+        self.assertEqual(DeclarationRequest.objects.filter(status='rejected').count(), 2)
+        self.assertFalse(PurchaseOrder.objects.filter(status='completed').exists())
+        self.assertFalse(ShipInventoryItem.objects.exists())
+        self.assertEqual(find_mismatches(), [])
+
+    def test_uses_workflow_transition_conditions(self):
+        ids = self.submitted(2)
+        read_rows = bulk._review_rows
+
+        def stale_rows(pks):
+            # 행을 읽은 뒤 다른 요청이 한 건을 먼저 거절 - 단건 전환처럼 조건부 UPDATE 가 막아야 한다
+            rows = read_rows(pks)
+            Declaration.objects.filter(pk=ids[1]).update(status='rejected')
+            return rows
+
+        with mock.patch.object(bulk, '_review_rows', stale_rows):
+            response = self.client.post('/api/declarations/bulk-approve/', {'ids': ids}, format='json')
+        self.assertEqual(response.status_code, 409)
+        self.assertIn('rejected', response.data['detail'])
+        self.assertEqual(Declaration.objects.get(pk=ids[0]).status, 'submitted')
+        self.assertFalse(PurchaseOrder.objects.filter(status='completed').exists())
+
+    def test_operator_only_and_validates_ids(self):
+        ids = self.submitted(1)
+        for body in ({}, {'ids': []}, {'ids': ['a']}, [1, 2]):
+            response = self.client.post('/api/declarations/bulk-approve/', body, format='json')
+            self.assertEqual(response.status_code, 400)
+
+        self.client.force_authenticate(token_user(self.supplier.user))
+        response = self.client.post('/api/declarations/bulk-approve/', {'ids': ids}, format='json')
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(Declaration.objects.get(pk=ids[0]).status, 'submitted')
+
+
+class WorkflowTransitionTests(APITestCase):
+    """조건부 UPDATE 상태 전환과 충돌(409)"""
+
+    def setUp(self):
+        self.operator = make_user('operator')
+        self.supplier = make_supplier()
+        self.ship = make_ship(make_customer())
+        self.declaration = make_declaration_chain(self.ship, self.supplier, hazmat_count=2)
+        self.client.force_authenticate(token_user(self.operator))
+
+    def test_request_rejection_stores_reason(self):
+        request = make_declaration_request(make_purchase_order(self.ship), self.supplier)
+        response = self.client.post(
+            f'/api/declaration-requests/{request.id}/reject/', {'rejection_reason': '공급업체 변경'}
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.data['rejection_reason'], '공급업체 변경')
+        request.refresh_from_db()
+        self.assertEqual((request.status, request.rejection_reason), ('rejected', '공급업체 변경'))
+
+    def test_repeated_or_illegal_transition_conflicts(self):
+        url = f'/api/declarations/{self.declaration.id}/approve/'
+        self.assertEqual(self.client.post(url).status_code, 200)
+        response = self.client.post(url)
+        self.assertEqual(response.status_code, 409)
+        self.assertIn('approved', response.data['detail'])
+
+        rejected = make_declaration_chain(self.ship, self.supplier, status='rejected')
+        self.assertEqual(self.client.post(f'/api/declarations/{rejected.id}/approve/').status_code, 409)
+        self.assertEqual(Declaration.objects.get(pk=rejected.pk).status, 'rejected')
+        self.assertEqual(find_mismatches(), [])
+
+    def test_conflict_rolls_back_earlier_steps(self):
+        PurchaseOrder.objects.filter(declaration_request__declaration=self.declaration).update(status='completed')
+        response = self.client.post(f'/api/declarations/{self.declaration.id}/approve/')
+        self.assertEqual(response.status_code, 409)
+
+        self.declaration.refresh_from_db()
+        self.assertEqual(self.declaration.status, 'submitted')
+        self.assertEqual(self.declaration.declaration_request.status, 'submitted')
+        self.assertFalse(ShipInventoryItem.objects.exists())
+
+    def test_stale_writers_conflict(self):
+        # 같은 행을 먼저 읽어 둔 여러 작업자가 차례로 전환을 시도 - 경쟁 상황을 결정적으로 재현
+        writers = [Declaration.objects.get(pk=self.declaration.pk) for _ in range(10)]
+        outcomes = []
+        for i, declaration in enumerate(writers):
+            name = 'approve' if i % 2 else 'reject'
+            try:
+                with transaction.atomic():
+                    workflow.transition(declaration, name)
+                outcomes.append(name)
+            except workflow.TransitionConflict:
+                outcomes.append('conflict')
+        self.assertEqual(outcomes, ['reject'] + ['conflict'] * 9)
+        self.assertEqual(Declaration.objects.get(pk=self.declaration.pk).status, 'rejected')
+        self.assertEqual(find_mismatches(), [])
+
+
+class ConcurrentTransitionTests(TransactionTestCase):
+    """여러 스레드가 동시에 같은 신고서를 승인/거절 - 정확히 하나만 성공
+
+    SQLite 는 파일 테스트 DB(ihm_backend.testing.TestRunner)에서 스레드마다 연결을 열어 실행합니다.
+    """
+
+    THREADS = 8
+
+    def setUp(self):
+        if connection.vendor == 'sqlite' and connection.is_in_memory_db():
+            self.skipTest('메모리 SQLite 테스트 DB 는 스레드 간에 연결을 나눌 수 없음')
+
+    def test_concurrent_reviews(self):
+        operator = make_user('operator')
+        ship = make_ship(make_customer())
+        supplier = make_supplier()
+        declarations = [make_declaration_chain(ship, supplier, hazmat_count=2) for _ in range(5)]
+
+        def review(declaration, decision, barrier):
+            client = APIClient()
+            client.force_authenticate(token_user(operator))
+            try:
+                barrier.wait()
+                return client.post(f'/api/declarations/{declaration.id}/{decision}/').status_code
+            finally:
+                connection.close()
+
+        def race(declaration, decisions):
+            barrier = threading.Barrier(self.THREADS)
+            with ThreadPoolExecutor(self.THREADS) as pool:
+                codes = list(pool.map(
+                    lambda i: review(declaration, decisions[i % len(decisions)], barrier), range(self.THREADS)
+                ))
+            return {
+                decision: sorted(codes[i::len(decisions)]) for i, decision in enumerate(decisions)
+            }
+
+        # 같은 전환끼리는 하나만 성공
+        for declaration in declarations[:2]:
+            self.assertEqual(race(declaration, ['approve'])['approve'], [200] + [409] * (self.THREADS - 1))
+        self.assertEqual(Declaration.objects.filter(status='approved').count(), 2)
+        self.assertEqual(PurchaseOrder.objects.filter(status='completed').count(), 2)
+        self.assertEqual(find_mismatches(), [])
+
+        # 승인과 거절이 겹치면 거절(승인 취소 포함)은 정확히 하나, 승인은 거절보다 먼저일 때만 하나 성공
+        half = self.THREADS // 2
+        for declaration in declarations:
+            codes = race(declaration, ['approve', 'reject'])
+            self.assertEqual(codes['reject'], [200] + [409] * (half - 1))
+            self.assertIn(codes['approve'], ([409] * half, [200] + [409] * (half - 1)))
+            declaration.refresh_from_db()
+            self.assertEqual(declaration.status, 'rejected')
+
+        self.assertEqual(find_mismatches(), [])
+        self.assertFalse(ShipInventoryItem.objects.exists())
+
+
+class ExportTests(APITestCase):
+    """신고서/유해물질 CSV·XLSX 스트리밍 내보내기"""
+
+    def setUp(self):
+        self.customer = make_customer()
+        self.ship = make_ship(self.customer)
+        self.supplier = make_supplier()
+        self.declarations = [
+            make_declaration_chain(self.ship, self.supplier, hazmat_count=2, status=status)
+            for status in ('submitted', 'approved', 'approved')
+        ]
+        make_declaration_chain(make_ship(make_customer()), make_supplier(), hazmat_count=2)
+        self.client.force_authenticate(token_user(self.customer.user))
+
+    def csv_rows(self, response):
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        content = b''.join(response.streaming_content).decode('utf-8-sig')
+        return list(csv.reader(StringIO(content)))
+
+    def test_csv_is_scoped_and_filtered(self):
+        rows = self.csv_rows(self.client.get('/api/declarations/export/', {'status': 'approved'}))
+        self.assertEqual(rows[0][:2], ['ID', '신고서 번호'])
+        self.assertEqual(sorted(int(row[0]) for row in rows[1:]), [d.id for d in self.declarations[1:]])
+        self.assertEqual({row[5] for row in rows[1:]}, {self.ship.ship_name})
+
+        rows = self.csv_rows(self.client.get('/api/hazardous-materials/export/', {'ship': self.ship.id}))
+        self.assertEqual(len(rows), 1 + 6)
+        self.client.force_authenticate(token_user(self.supplier.user))
+        rows = self.csv_rows(self.client.get('/api/hazardous-materials/export/'))
+        self.assertEqual({row[5] for row in rows[1:]}, {self.supplier.company_name})
+
+    def test_header_is_sent_before_querying(self):
+        response = self.client.get('/api/declarations/export/')
+        chunks = iter(response.streaming_content)
+        with CaptureQueriesContext(connection) as ctx:
+            first = next(chunks)
+        self.assertEqual(len(ctx.captured_queries), 0)
+        self.assertTrue(first.startswith('\ufeffID,'.encode('utf-8')))
+        with CaptureQueriesContext(connection) as ctx:
+            rest = list(chunks)
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertEqual(len(rest), 3)
+
+    def test_xlsx(self):
+        response = self.client.get('/api/hazardous-materials/export/', {'export_format': 'xlsx'})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('hazardous-materials.xlsx', response['Content-Disposition'])
+        with zipfile.ZipFile(BytesIO(b''.join(response.streaming_content))) as archive:
+            self.assertIn('xl/workbook.xml', archive.namelist())
+            sheet = ElementTree.fromstring(archive.read('xl/worksheets/sheet1.xml'))
+        ns = {'s': 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'}
+        rows = sheet.findall('s:sheetData/s:row', ns)
+        self.assertEqual(len(rows), 1 + 6)
+        self.assertEqual(rows[0].find('s:c/s:is/s:t', ns).text, 'ID')
+
+        response = self.client.get('/api/declarations/export/', {'export_format': 'pdf'})
+        self.assertEqual(response.status_code, 400)
+
+
+class KeysetPaginationTests(APITestCase):
+    """?pagination=cursor 키셋 페이지네이션"""
+
+    def setUp(self):
+        self.client.force_authenticate(token_user(make_user('operator')))
+        ship = make_ship(make_customer())
+        for i in range(45):
+            make_purchase_order(ship, status='pending' if i % 3 else 'requested')
+        # created_at 이 같은 행이 있어도 id 로 순서가 결정되어야 한다
+        tied = PurchaseOrder.objects.order_by('id').values_list('id', flat=True)[10:30]
+        PurchaseOrder.objects.filter(id__in=list(tied)).update(
+            created_at=PurchaseOrder.objects.get(id=tied[0]).created_at
+        )
+
+    def walk(self, url, direction='next'):
+        ids = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            page_ids = [row['id'] for row in response.data['results']]
+            ids = ids + page_ids if direction == 'next' else page_ids + ids
+            last = response.data
+            url = response.data[direction]
+        return ids, last
+
+    def test_forward_and_backward_walk(self):
+        expected = list(PurchaseOrder.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+        ids, last_page = self.walk('/api/purchase-orders/?pagination=cursor')
+        self.assertEqual(ids, expected)
+        self.assertNotIn('count', last_page)
+
+        back, first_page = self.walk(last_page['previous'], direction='previous')
+        self.assertEqual(back + [row['id'] for row in last_page['results']], expected)
+        self.assertIsNone(first_page['previous'])
+
+    def test_filters_survive_cursor_links(self):
+        expected = list(
+            PurchaseOrder.objects.filter(status='pending')
+            .order_by('-created_at', '-id').values_list('id', flat=True)
+        )
+        response = self.client.get('/api/purchase-orders/', {'pagination': 'cursor', 'status': 'pending'})
+        self.assertIn('status=pending', response.data['next'])
+        ids, _ = self.walk(response.data['next'])
+        self.assertEqual([row['id'] for row in response.data['results']] + ids, expected)
+
+    def test_no_count_query(self):
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get('/api/purchase-orders/', {'pagination': 'cursor'})
+        self.assertFalse(any('COUNT(' in q['sql'] for q in ctx.captured_queries))
+
+    def test_invalid_cursor(self):
+        response = self.client.get('/api/declarations/', {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 404)
+
+    def test_page_number_mode_is_default(self):
+        response = self.client.get('/api/declaration-requests/')
+        self.assertIn('count', response.data)
+
+
+class QueryPlanTests(TestCase):
+    """목록 쿼리가 복합 인덱스를 사용하는지 EXPLAIN 으로 검사"""
+
+    def test_known_list_queries_use_indexes(self):
+        for name, index_name, ok, plan in check_query_plans():
+            with self.subTest(query=name):
+                self.assertTrue(ok, f'{index_name} not used:\n{plan}')
+
+
+class SubstanceRegistryTests(APITestCase):
+    """물질 등록부: CAS 번호 정규화/검증, 유해물질 연결, 색인 검색, 기존 행 연결(backfill)"""
+
+    def setUp(self):
+        self.customer = make_customer()
+        self.supplier = make_supplier()
+        self.declaration = make_declaration_chain(make_ship(self.customer), self.supplier)
+
+    def add_material(self, cas_number, name='', **kwargs):
+        return HazardousMaterial.objects.create(
+            declaration=self.declaration, material_name=name, cas_number=cas_number, **kwargs
+        )
+
+    def test_normalize_cas(self):
+        self.assertEqual(substances.normalize_cas('7439-92-1'), '7439-92-1')
+        self.assertEqual(substances.normalize_cas(' 7439921 '), '7439-92-1')
+        self.assertEqual(substances.normalize_cas('0007439-92-1'), '7439-92-1')
+        for invalid in ('7439-92-2', '7439921-1', 'lead', ''):
+            with self.assertRaises(ValueError):
+                substances.normalize_cas(invalid)
+
+        # CAS 번호가 아닌 값은 그대로 받는다 (등록부에는 연결하지 않음)
+        for free_text in ('7439-92-2', 'N/A', 'unknown'):
+            serializer = HazardousMaterialSerializer(data={'material_name': 'Lead', 'cas_number': free_text})
+            self.assertTrue(serializer.is_valid(), serializer.errors)
+            self.assertEqual(serializer.validated_data['cas_number'], free_text)
+        serializer = HazardousMaterialSerializer(data={'material_name': 'Lead', 'cas_number': '7439921'})
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        self.assertEqual(serializer.validated_data['cas_number'], '7439-92-1')
+
+    def test_materials_link_to_registry(self):
+        lead = Substance.objects.get(cas_number='7439-92-1')
+        material = self.add_material('7439-92-1', 'Pb solder')
+        self.assertEqual(material.substance_id, lead.pk)
+
+        # 등록부에 없는 CAS 번호는 연결하지 않고, 공급업체가 적은 이름으로 물질을 만들지도 않는다
+        unknown = self.add_material(make_cas(4321), 'Some Compound')
+        self.assertIsNone(unknown.substance_id)
+        self.assertFalse(Substance.objects.filter(cas_number=make_cas(4321)).exists())
+
+        material.cas_number = '7439-97-6'
+        material.save(update_fields=['cas_number'])
+        material.refresh_from_db()
+        self.assertEqual(material.substance.name, 'Mercury')
+        self.assertIsNone(self.add_material('not-a-cas').substance_id)
+
+    def test_search_by_cas_and_synonym(self):
+        def names(query):
+            return set(substances.search(query).values_list('name', flat=True))
+
+        self.assertEqual(names('7439-92-1'), {'Lead'})
+        self.assertEqual(names('7439'), {'Lead', 'Mercury'})
+        self.assertEqual(names('납'), {'Lead'})
+        self.assertEqual(names('  HALON '), {'Bromochlorodifluoromethane', 'Bromotrifluoromethane'})
+        self.assertEqual(names('tributyltin'), {'Bis(tributyltin) oxide'})
+
+        lead = Substance.objects.get(cas_number='7439-92-1')
+        lead.synonyms = [*lead.synonyms, 'Plumbum']
+        lead.save()
+        self.assertEqual(names('plumb'), {'Lead'})
+
+    def test_api_search_and_scope(self):
+        self.add_material('7439-92-1', 'Pb solder')
+        self.add_material('7440-43-9', 'Cd plating')
+        other = make_declaration_chain(make_ship(make_customer()), self.supplier)
+        HazardousMaterial.objects.create(declaration=other, material_name='Lead', cas_number='7439-92-1')
+
+        self.client.force_authenticate(token_user(self.customer.user))
+        response = self.client.get('/api/hazardous-materials/', {'q': 'lead'})
+        self.assertEqual([m['material_name'] for m in response.data['results']], ['Pb solder'])
+        response = self.client.get('/api/hazardous-materials/', {'material_name': '7440-43-9'})
+        self.assertEqual([m['material_name'] for m in response.data['results']], ['Cd plating'])
+
+        # 등록부 검색은 연결되지 않은 행을 찾지 않는다 - 물질명 일부 검색은 ?material_name_contains= 로 요청
+        unlinked = self.add_material('N/A', 'Unlabelled lead paint')
+        self.assertIsNone(unlinked.substance_id)
+        response = self.client.get('/api/hazardous-materials/', {'q': 'lead'})
+        self.assertEqual([m['material_name'] for m in response.data['results']], ['Pb solder'])
+        response = self.client.get('/api/hazardous-materials/', {'material_name_contains': 'lead'})
+        self.assertEqual([m['material_name'] for m in response.data['results']], ['Unlabelled lead paint'])
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get('/api/hazardous-materials/', {'q': 'lead'})
+        self.assertFalse(any('LIKE' in query['sql'] for query in ctx.captured_queries))
+
+        response = self.client.get('/api/substances/', {'q': 'cfc', 'hkc_table': 'A'})
+        self.assertEqual({s['cas_number'] for s in response.data['results']}, {'75-69-4', '75-71-8'})
+
+    def test_backfill_links_existing_rows(self):
+        linked = [self.add_material(cas, 'x') for cas in (*REGISTERED_CAS, '7439921', make_cas(5555))]
+        skipped = [self.add_material('1234-56-0'), self.add_material(make_cas(6666))]
+        HazardousMaterial.objects.update(substance=None)
+        # 운영자가 나중에 등록부에 추가한 물질
+        Substance.objects.create(cas_number=make_cas(5555), name='Later Compound')
+
+        out = StringIO()
+        call_command('backfill_substances', '--chunk-size', '2', stdout=out)
+        self.assertIn('Linked 5', out.getvalue())
+        self.assertIn('skipped 2', out.getvalue())
+        for material in linked:
+            material.refresh_from_db()
+            self.assertIsNotNone(material.substance_id)
+        self.assertEqual(linked[3].substance.name, 'Lead')
+        for material in skipped:
+            material.refresh_from_db()
+            self.assertIsNone(material.substance_id)
+
+
+class DeclarationConditionalGetTests(APITestCase):
+    """신고서/유해물질/보고서 조건부 조회 - 응답에 포함되는 값이 바뀌면 ETag 도 바뀐다"""
+
+    def test_material_change_invalidates_etag(self):
+        customer = make_customer()
+        declaration = make_declaration_chain(make_ship(customer), make_supplier(), hazmat_count=1)
+        self.client.force_authenticate(token_user(customer.user))
+        url = f'/api/declarations/{declaration.id}/'
+        params = {'expand': 'hazardous_materials'}
+        etag = self.client.get(url, params)['ETag']
+        self.assertEqual(self.client.get(url, params, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        material = declaration.hazardous_materials.get()
+        material.location_in_product = 'Gasket'
+        material.save()
+        response = self.client.get(url, params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['hazardous_materials'][0]['location_in_product'], 'Gasket')
+
+        etag = response['ETag']
+        material.delete()
+        self.assertEqual(self.client.get(url, params, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_materials_and_reports(self):
+        customer = make_customer()
+        ship = make_ship(customer)
+        declaration = make_declaration_chain(ship, make_supplier(), hazmat_count=2)
+        material = declaration.hazardous_materials.first()
+        report = ShipReport.objects.create(ship=ship)
+        self.client.force_authenticate(token_user(customer.user))
+
+        def changes(url, change):
+            etag = self.client.get(url)['ETag']
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+            change()
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+        def edit_material():
+            material.remarks = 'checked'
+            material.save()
+
+        for url in ('/api/hazardous-materials/', f'/api/hazardous-materials/{material.id}/'):
+            with self.subTest(url=url):
+                changes(url, edit_material)
+        # 워커는 update() 로 상태를 바꾼다
+        for url in ('/api/reports/', f'/api/reports/{report.id}/'):
+            with self.subTest(url=url):
+                changes(url, lambda: reports.mark_failed(report.id, 'boom'))
+
+
+class ComplianceTests(APITestCase):
+    """적합성 판정: 제출 시 판정, 유해물질 수정 시 재판정, 기준값 변경 시 전체 재판정"""
+
+    ASBESTOS, PCB, CFC_11, LEAD, PFOS = '1332-21-4', '1336-36-3', '75-69-4', '7439-92-1', '1763-23-1'
+
+    def setUp(self):
+        self.customer = make_customer()
+        self.supplier = make_supplier()
+        self.ship = make_ship(self.customer)
+        self.client.force_authenticate(token_user(self.supplier.user))
+
+    def submit(self, materials, **extra):
+        po = make_purchase_order(self.ship)
+        response = self.client.post('/api/declarations/', {
+            'purchase_order': po.id,
+            'declaration_number': f'MD-{po.order_number}',
+            'hazardous_materials': [
+                {'material_name': f'M{i}', 'cas_number': cas_number, 'content_percentage': content}
+                for i, (cas_number, content) in enumerate(materials)
+            ],
+            **extra,
+        }, format='json')
+        self.assertEqual(response.status_code, 201, response.content)
+        return Declaration.objects.get(declaration_request__purchase_order=po)
+
+    def add_declaration(self, materials, **kwargs):
+        declaration = make_declaration_chain(self.ship, self.supplier, compliance_status='compliant', **kwargs)
+        for cas_number, content in materials:
+            HazardousMaterial.objects.create(declaration=declaration, cas_number=cas_number, content_percentage=content)
+        return declaration
+
+    def test_free_text_cas_number(self):
+        declaration = self.submit([('N/A', '1.00'), ('unknown', None)])
+        self.assertEqual(
+            list(declaration.hazardous_materials.order_by('pk').values_list('cas_number', 'substance')),
+            [('N/A', None), ('unknown', None)],
+        )
+        self.assertFalse(Substance.objects.filter(cas_number__in=['N/A', 'unknown']).exists())
+        self.assertEqual(declaration.compliance_status, 'compliant')
+
+    def test_submit_derives_status(self):
+        cases = [
+            ([(self.ASBESTOS, '0.10'), (self.LEAD, '5.00')], 'compliant'),
+            ([(self.ASBESTOS, '0.11')], 'non_compliant'),
+            # 50 mg/kg = 0.005%, 10 mg/kg = 0.001% - 함유율은 소수점 넷째 자리까지 저장
+            ([(self.PCB, '0.01')], 'non_compliant'),
+            ([(self.PCB, '0.003')], 'compliant'),
+            ([(self.PCB, '0.0051')], 'non_compliant'),
+            ([(self.PFOS, '0.0009')], 'compliant'),
+            ([(self.PFOS, '0.0011')], 'non_compliant'),
+            # 오존층 파괴 물질은 함유 자체가 미준수, 함유율이 없으면 초과로 본다
+            ([(self.CFC_11, '0.01')], 'non_compliant'),
+            ([(self.ASBESTOS, None)], 'non_compliant'),
+            ([], 'compliant'),
+        ]
+        for materials, expected in cases:
+            with self.subTest(materials=materials):
+                self.assertEqual(self.submit(materials, compliance_status='compliant').compliance_status, expected)
+
+        orders = [make_purchase_order(self.ship) for _ in range(2)]
+        response = self.client.post('/api/declarations/bulk/', [
+            {'purchase_order': orders[0].id, 'declaration_number': 'B-1',
+             'hazardous_materials': [{'cas_number': self.PCB, 'content_percentage': '0.00'}]},
+            {'purchase_order': orders[1].id, 'declaration_number': 'B-2',
+             'hazardous_materials': [{'cas_number': self.PCB, 'content_percentage': '0.01'}]},
+        ], format='json')
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(
+            dict(Declaration.objects.filter(declaration_number__startswith='B-').values_list(
+                'declaration_number', 'compliance_status'
+            )),
+            {'B-1': 'compliant', 'B-2': 'non_compliant'},
+        )
+
+    def test_material_changes_reevaluate(self):
+        declaration = self.submit([(self.ASBESTOS, '0.05'), (self.LEAD, '1.00')])
+        material = declaration.hazardous_materials.get(cas_number=self.ASBESTOS)
+
+        response = self.client.patch(f'/api/hazardous-materials/{material.id}/', {'content_percentage': '0.50'})
+        self.assertEqual(response.status_code, 200, response.content)
+        declaration.refresh_from_db()
+        self.assertEqual(declaration.compliance_status, 'non_compliant')
+
+        response = self.client.patch(f'/api/declarations/{declaration.id}/', {'compliance_status': 'compliant'})
+        declaration.refresh_from_db()
+        self.assertEqual(declaration.compliance_status, 'non_compliant')
+
+        self.client.delete(f'/api/hazardous-materials/{material.id}/')
+        declaration.refresh_from_db()
+        self.assertEqual(declaration.compliance_status, 'compliant')
+
+    def test_threshold_change_reevaluates_all(self):
+        lead_high = self.add_declaration([(self.LEAD, '0.20'), (make_cas(1001), '9.00')])
+        lead_low = self.add_declaration([(self.LEAD, '0.05')])
+        unknown = self.add_declaration([(self.LEAD, None)])
+        draft = self.add_declaration([(self.LEAD, '0.20')], status='draft')
+        asbestos = self.add_declaration([(self.ASBESTOS, '1.00')])
+        before = Declaration.objects.get(pk=lead_high.pk).updated_at
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ComplianceThreshold.objects.create(substance=Substance.objects.get(cas_number=self.LEAD), value='1000', unit='mg_kg')
+        with self.captureOnCommitCallbacks(execute=True):
+            ComplianceThreshold.objects.filter(substance__cas_number=self.LEAD).get().save()
+        self.assertEqual(Job.objects.filter(job_type='reevaluate_compliance', status='queued').count(), 1)
+
+        work('test-worker', burst=True)
+        statuses = dict(Declaration.objects.values_list('pk', 'compliance_status'))
+        self.assertEqual(
+            [statuses[d.pk] for d in (lead_high, lead_low, unknown, draft, asbestos)],
+            ['non_compliant', 'compliant', 'non_compliant', 'compliant', 'non_compliant'],
+        )
+        self.assertEqual(Job.objects.get(job_type='reevaluate_compliance').result, {'changed': 3})
+        self.assertGreater(Declaration.objects.get(pk=lead_high.pk).updated_at, before)
+
+        ComplianceThreshold.objects.filter(substance__cas_number=self.LEAD).delete()
+        out = StringIO()
+        call_command('reevaluate_compliance', '--chunk-size', '2', stdout=out)
+        self.assertIn('Updated compliance status of 2 declarations', out.getvalue())
+        self.assertEqual(compliance.reevaluate(chunk_size=2), 0)
+
+    def test_migration_queues_reevaluation(self):
+        # 마이그레이션으로 넣은 기준값은 signal 이 없으므로 마이그레이션이 재판정 작업을 등록한다
+        queue = import_module('declarations.migrations.0018_content_percentage_precision').queue_reevaluation
+        queue(apps, None)
+        self.assertFalse(Job.objects.exists())
+        declaration = self.add_declaration([(self.PCB, '0.0100')])
+        queue(apps, None)
+        queue(apps, None)
+        self.assertEqual(Job.objects.filter(job_type='reevaluate_compliance', status='queued').count(), 1)
+        work('test-worker', burst=True)
+        declaration.refresh_from_db()
+        self.assertEqual(declaration.compliance_status, 'non_compliant')
+
+
+@override_settings(RESPONSE_CACHE_TIMEOUT=60)
+class ResponseCacheTests(APITestCase):
+    """역할 범위별 응답 캐시 - 적중, 행이 보이는 범위만 무효화, 통계"""
+
+    def setUp(self):
+        cache.clear()
+        self.operator = make_user('operator')
+        self.supplier = make_supplier()
+        self.customers = [make_customer(), make_customer()]
+        self.declarations = [
+            make_declaration_chain(make_ship(customer), self.supplier, hazmat_count=1)
+            for customer in self.customers
+        ]
+
+    def get(self, user, url='/api/declarations/', **params):
+        self.client.force_authenticate(token_user(user))
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response
+
+    def test_hit_and_scoped_invalidation(self):
+        first, second = (customer.user for customer in self.customers)
+        self.assertEqual(self.get(first)['X-Cache'], 'MISS')
+        # 적중하면 조건부 조회의 검증 쿼리만 실행된다
+        with self.assertNumQueries(1):
+            response = self.get(first)
+        self.assertEqual(response['X-Cache'], 'HIT')
+        self.assertEqual([row['id'] for row in response.data['results']], [self.declarations[0].id])
+        # 같은 URL 이라도 다른 고객사는 자기 범위의 응답을 받는다
+        response = self.get(second)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual([row['id'] for row in response.data['results']], [self.declarations[1].id])
+        self.assertEqual(self.get(self.supplier.user)['X-Cache'], 'MISS')
+
+        declaration = self.declarations[0]
+        declaration.title = 'Updated'
+        declaration.save()
+        response = self.get(first)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['results'][0]['title'], 'Updated')
+        self.assertEqual(self.get(second)['X-Cache'], 'HIT')
+        self.assertEqual(self.get(self.supplier.user)['X-Cache'], 'MISS')
+
+    def test_material_and_bulk_review_invalidate(self):
+        customer = self.customers[0].user
+        url = f'/api/declarations/{self.declarations[0].id}/'
+        self.get(customer, url, expand='hazardous_materials')
+        material = self.declarations[0].hazardous_materials.get()
+        material.location_in_product = 'Gasket'
+        material.save()
+        response = self.get(customer, url, expand='hazardous_materials')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['hazardous_materials'][0]['location_in_product'], 'Gasket')
+        # 캐시된 상세 응답에도 검증 헤더가 붙는다
+        self.assertEqual(self.get(customer, url, expand='hazardous_materials')['X-Cache'], 'HIT')
+        self.assertIn('ETag', self.get(customer, url, expand='hazardous_materials'))
+
+        self.get(customer)
+        self.client.force_authenticate(token_user(self.operator))
+        self.client.post('/api/declarations/bulk-approve/', {'ids': [self.declarations[0].id]}, format='json')
+        response = self.get(customer)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['results'][0]['status'], 'approved')
+        self.assertEqual(self.get(self.customers[1].user)['X-Cache'], 'MISS')
+        self.assertEqual(self.get(self.customers[1].user)['X-Cache'], 'HIT')
+
+    def test_purchase_orders_and_requests_invalidate(self):
+        supplier = self.supplier.user
+        self.get(supplier, '/api/purchase-orders/')
+        self.get(supplier, '/api/declaration-requests/pending/')
+        self.assertEqual(self.get(supplier, '/api/purchase-orders/')['X-Cache'], 'HIT')
+        self.assertEqual(self.get(supplier, '/api/declaration-requests/pending/')['X-Cache'], 'HIT')
+
+        purchase_order = PurchaseOrder.objects.get(pk=self.declarations[0].declaration_request.purchase_order_id)
+        purchase_order.title = 'Updated'
+        purchase_order.save()
+        response = self.get(supplier, '/api/purchase-orders/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertIn('Updated', [row['title'] for row in response.data['results']])
+
+        # 일괄 승인은 update() 로 전환하고 캐시를 직접 무효화한다
+        customer = self.customers[0].user
+        self.get(customer, '/api/declaration-requests/')
+        self.client.force_authenticate(token_user(self.operator))
+        self.client.post('/api/declarations/bulk-approve/', {'ids': [self.declarations[0].id]}, format='json')
+        response = self.get(customer, '/api/declaration-requests/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['results'][0]['status'], 'approved')
+        self.assertEqual(self.get(customer, '/api/purchase-orders/')['X-Cache'], 'MISS')
+
+    def test_stats(self):
+        self.get(self.operator)
+        self.get(self.operator)
+        self.get(self.operator, f'/api/declarations/{self.declarations[0].id}/')
+        response = self.get(self.operator, '/api/cache/stats/')
+        self.assertEqual(response.data['endpoints']['DeclarationViewSet.list'], {'hits': 1, 'misses': 1, 'hit_rate': 0.5})
+        self.assertEqual(response.data['endpoints']['DeclarationViewSet.retrieve']['misses'], 1)
+        self.assertIn('CustomerViewSet.my_company', response.data['endpoints'])
+
+        self.client.force_authenticate(token_user(self.supplier.user))
+        self.assertEqual(self.client.get('/api/cache/stats/').status_code, 403)
+
+    @override_settings(RESPONSE_CACHE_TIMEOUT=0)
+    def test_disabled(self):
+        self.assertNotIn('X-Cache', self.get(self.operator))
+        self.assertNotIn('X-Cache', self.get(self.operator))
+
+
+class FastListTests(APITestCase):
+    """평면 목록 Serializer 의 .values() + 컴파일한 변환 함수 경로와 orjson 렌더러"""
+
+    def setUp(self):
+        self.operator = make_user('operator')
+        self.client.force_authenticate(token_user(self.operator))
+        ship = make_ship(make_customer())
+        supplier = make_supplier()
+        make_declaration_chain(ship, supplier, status='approved', approved_date='2026-01-02T03:04:05.678901Z')
+        make_declaration_chain(ship, supplier)
+        make_purchase_order(ship, order_date='2026-03-04')
+
+    def serializer_data(self, serializer_class, queryset):
+        return serializer_class(queryset, many=True).data
+
+    def test_matches_serializer_output(self):
+        cases = [
+            ('/api/declarations/', DeclarationListSerializer, Declaration.objects.all()),
+            ('/api/purchase-orders/', PurchaseOrderListSerializer, PurchaseOrder.objects.all()),
+        ]
+        for url, serializer_class, queryset in cases:
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.json()['results'], self.serializer_data(serializer_class, queryset))
+
+    def test_nullable_relation_and_fallback(self):
+        # created_by 가 없으면 Serializer 처럼 created_by_username 이 응답에서 빠진다
+        request = DeclarationRequest.objects.first()
+        DeclarationRequest.objects.filter(pk=request.pk).update(created_by=None)
+        queryset = DeclarationRequest.objects.order_by('pk')
+        compiled = compile_serializer(DeclarationRequestSerializer(), DeclarationRequest)
+        self.assertEqual(
+            compiled.serialize(compiled.values(queryset)),
+            self.serializer_data(DeclarationRequestSerializer, queryset),
+        )
+        self.assertNotIn('created_by_username', compiled.serialize(compiled.values(queryset.filter(pk=request.pk)))[0])
+
+        # 중첩 Serializer 를 확장하면 기존 경로로 처리
+        for params, flat in (({}, True), ({'expand': 'hazardous_materials'}, False)):
+            context = {'request': Request(APIRequestFactory().get('/', params))}
+            compiled = compile_serializer(DeclarationSerializer(context=context), Declaration)
+            self.assertEqual(compiled is not None, flat)
+
+    def test_cursor_pagination(self):
+        first = self.client.get('/api/declarations/', {'pagination': 'cursor', 'page_size': 1}).data
+        second = self.client.get(first['next']).data
+        self.assertEqual(
+            [first['results'][0]['id'], second['results'][0]['id']],
+            list(Declaration.objects.order_by('-created_at', '-id').values_list('id', flat=True)),
+        )
+
+    def test_renderer_matches_json_renderer(self):
+        data = {
+            'text': '선박 \u2028 line', 'decimal': Decimal('1.50'), 'none': None, 'flag': True,
+            'at': datetime(2026, 1, 2, 3, 4, 5, 678901, tzinfo=dt_timezone.utc), 'day': date(2026, 1, 2),
+            'lazy': gettext_lazy('Name'), 'rows': [{'id': 1}, (2, 3)],
+        }
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+        self.assertEqual(FastJSONRenderer().render(None), b'')
+        indented = FastJSONRenderer().render(data, 'application/json; indent=2')
+        self.assertEqual(indented, JSONRenderer().render(data, 'application/json; indent=2'))
+
+
+# AsyncReadViewTests 용 URLconf - ASYNC_READ_VIEWS 와 관계없이 조회 라우트를 async view 로
+urlpatterns = [
+    path('api/', include(async_routes(ship_router.urls, enabled=True))),
+    path('api/', include(async_routes(declaration_router.urls, enabled=True))),
+]
+
+
+class AsyncReadViewTests(APITestCase):
+    """async 조회 엔드포인트 - sync view 와 같은 응답, JWT 인증, 역할 범위"""
+
+    def setUp(self):
+        cache.clear()
+        self.customer, other = make_customer(), make_customer()
+        self.supplier = make_supplier()
+        self.ship = make_ship(self.customer)
+        self.declaration = make_declaration_chain(self.ship, self.supplier, hazmat_count=1, status='approved')
+        self.other = make_declaration_chain(make_ship(other), self.supplier)
+        inventory.rebuild()
+        self.users = [make_user('operator'), self.customer.user, self.supplier.user]
+        self.tokens = {
+            user.pk: str(ClaimsTokenObtainPairSerializer.get_token(user).access_token) for user in self.users
+        }
+
+    def get(self, url, user=None, asynchronous=True, method='get', **headers):
+        if user is not None:
+            headers['authorization'] = f'Bearer {self.tokens[user.pk]}'
+        if not asynchronous:
+            return getattr(self.client, method)(url, headers=headers)
+        with override_settings(ROOT_URLCONF=__name__):
+            return async_to_sync(getattr(self.async_client, method))(url, headers=headers)
+
+    def test_routes_are_async(self):
+        ship = f'/api/ships/{self.ship.id}/'
+        for url in ('/api/declarations/', ship, f'{ship}inventory/', '/api/dashboard/summary/'):
+            self.assertTrue(iscoroutinefunction(resolve(url, __name__).func), url)
+        # a<액션> 이 없는 ViewSet 은 그대로
+        self.assertFalse(iscoroutinefunction(resolve('/api/hazardous-materials/', __name__).func))
+
+    @override_settings(QUERY_BUDGET_MODE='raise')
+    def test_matches_sync_view(self):
+        ship, declaration = f'/api/ships/{self.ship.id}/', f'/api/declarations/{self.declaration.id}/'
+        urls = [
+            '/api/ships/', ship, f'{ship}inventory/', '/api/ships/my_ships/', '/api/purchase-orders/',
+            '/api/declaration-requests/', '/api/declarations/', '/api/declarations/?pagination=cursor&page_size=1',
+            '/api/declarations/?count=none', '/api/declarations/?count=estimate', declaration,
+            f'{declaration}?expand=hazardous_materials', '/api/declarations/my_ship_declarations/',
+            f'/api/declarations/{self.other.id}/', '/api/declarations/?page=9', '/api/dashboard/summary/',
+        ]
+        for user in self.users:
+            for url in urls:
+                with self.subTest(user=user.user_type, url=url):
+                    cache.clear()
+                    expected = self.get(url, user, asynchronous=False)
+                    cache.clear()
+                    response = self.get(url, user)
+                    self.assertEqual(response.status_code, expected.status_code)
+                    self.assertEqual(response.json(), expected.json())
+                    # 쿼리 예산은 async 경로에도 적용되고 같은 수를 센다
+                    self.assertEqual(response['X-Query-Count'], expected['X-Query-Count'])
+
+    @override_settings(QUERY_BUDGET_MODE='raise')
+    def test_budget_enforced(self):
+        operator = self.users[0]
+        with mock.patch.dict(DashboardViewSet.query_budgets, {'summary': 1}):
+            with self.assertRaises(QueryBudgetExceeded):
+                self.get('/api/dashboard/summary/', operator)
+
+    def test_authentication(self):
+        for headers in ({}, {'authorization': 'Bearer invalid'}):
+            expected = self.get('/api/declarations/', asynchronous=False, **headers)
+            response = self.get('/api/declarations/', **headers)
+            self.assertEqual(response.status_code, 401)
+            self.assertEqual(response.json(), expected.json())
+            self.assertEqual(response['WWW-Authenticate'], expected['WWW-Authenticate'])
+
+    @override_settings(RESPONSE_CACHE_TIMEOUT=60)
+    def test_conditional_get_and_cache(self):
+        operator = self.users[0]
+        url = f'/api/declarations/{self.declaration.id}/'
+        first = self.get(url, operator)
+        self.assertEqual(first['X-Cache'], 'MISS')
+        second = self.get(url, operator)
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertEqual(second['ETag'], first['ETag'])
+        self.assertEqual(self.get(url, operator, if_none_match=first['ETag']).status_code, 304)
+        self.assertEqual(self.get('/api/declarations/', operator, method='head').status_code, 200)
+
+    def test_writes_use_sync_view(self):
+        operator = self.users[0]
+        response = self.get('/api/dashboard/summary/', operator, method='post')
+        self.assertEqual(response.status_code, 405)
+        url = f'/api/declarations/{self.other.id}/reject/'
+        with override_settings(ROOT_URLCONF=__name__):
+            response = async_to_sync(self.async_client.post)(
+                url, {'rejection_reason': '자료 부족'}, content_type='application/json',
+                headers={'authorization': f'Bearer {self.tokens[operator.pk]}'},
+            )
+        self.assertEqual(response.status_code, 200, response.content)
+        self.other.refresh_from_db()
+        self.assertEqual(self.other.status, 'rejected')
@@ -1,8 +1,9 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
+from ihm_backend.async_views import async_routes
 from .views import (
     PurchaseOrderViewSet, DeclarationRequestViewSet,
-    DeclarationViewSet, HazardousMaterialViewSet
+    DeclarationViewSet, HazardousMaterialViewSet, DashboardViewSet, ShipReportViewSet, SubstanceViewSet
 )
 
 router = DefaultRouter()
@@ -10,7 +11,10 @@ router.register('purchase-orders', PurchaseOrderViewSet, basename='purchaseorder
 router.register('declaration-requests', DeclarationRequestViewSet, basename='declarationrequest')
 router.register('declarations', DeclarationViewSet, basename='declaration')
 router.register('hazardous-materials', HazardousMaterialViewSet, basename='hazardousmaterial')
+router.register('dashboard', DashboardViewSet, basename='dashboard')
+router.register('reports', ShipReportViewSet, basename='shipreport')
+router.register('substances', SubstanceViewSet, basename='substance')
 
 urlpatterns = [
-    path('', include(router.urls)),
+    path('', include(async_routes(router.urls))),
 ]
@@ -2,20 +2,84 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from django.db import transaction
+from django.http import HttpResponse
 from django.utils import timezone
-from .models import PurchaseOrder, DeclarationRequest, Declaration, HazardousMaterial
+from ihm_backend.async_views import AsyncReadMixin
+from ihm_backend.conditional import ConditionalGetMixin
+from ihm_backend.export import export_response
+from ihm_backend.fast_list import FastListMixin
+from ihm_backend.pagination import KeysetOptInPagination
+from ihm_backend.query_budget import AUTH, PAGE, QueryBudgetMixin
+from ihm_backend.query_planner import QueryPlannerMixin
+from ihm_backend.response_cache import ResponseCacheMixin
+from ships.models import Ship
+from users.authentication import scope_filter
+from users.models import Customer, Supplier
+from .bulk import BULK_MAX_ITEMS, BulkValidationError, review_declarations, submit_declarations
+from . import compliance, inventory, substances, summary, workflow
+from .summary import asummary_for, summary_for
+from .models import PurchaseOrder, DeclarationRequest, Declaration, HazardousMaterial, ShipReport, Substance
 from .serializers import (
     PurchaseOrderSerializer, PurchaseOrderListSerializer,
     DeclarationRequestSerializer, DeclarationSerializer,
     DeclarationListSerializer, DeclarationCreateSerializer,
-    HazardousMaterialSerializer
+    HazardousMaterialSerializer, ShipReportSerializer, SubstanceSerializer
 )
 
+# 내보내기 열: (머리글, values_list 경로)
+DECLARATION_EXPORT_COLUMNS = [
+    ('ID', 'id'),
+    ('신고서 번호', 'declaration_number'),
+    ('제목', 'title'),
+    ('유형', 'declaration_type'),
+    ('상태', 'status'),
+    ('선박명', 'ship__ship_name'),
+    ('IMO 번호', 'ship__imo_number'),
+    ('공급업체', 'supplier__company_name'),
+    ('주문번호', 'declaration_request__purchase_order__order_number'),
+    ('품목명', 'item_name'),
+    ('제조사', 'manufacturer'),
+    ('모델번호', 'model_number'),
+    ('적합성 상태', 'compliance_status'),
+    ('제출일', 'submitted_date'),
+    ('승인일', 'approved_date'),
+    ('거절 사유', 'rejection_reason'),
+]
+HAZARDOUS_MATERIAL_EXPORT_COLUMNS = [
+    ('ID', 'id'),
+    ('신고서 번호', 'declaration__declaration_number'),
+    ('신고서 상태', 'declaration__status'),
+    ('선박명', 'declaration__ship__ship_name'),
+    ('IMO 번호', 'declaration__ship__imo_number'),
+    ('공급업체', 'declaration__supplier__company_name'),
+    ('물질명', 'material_name'),
+    ('CAS 번호', 'cas_number'),
+    ('함유율 (%)', 'content_percentage'),
+    ('제품 내 위치', 'location_in_product'),
+    ('비고', 'remarks'),
+]
 
-class PurchaseOrderViewSet(viewsets.ModelViewSet):
+
+class PurchaseOrderViewSet(QueryBudgetMixin, QueryPlannerMixin, ConditionalGetMixin, ResponseCacheMixin, FastListMixin,
+                           AsyncReadMixin, viewsets.ModelViewSet):
     """구매 주문 ViewSet"""
     queryset = PurchaseOrder.objects.all()
     permission_classes = [IsAuthenticated]
+    query_budgets = {
+        'list': AUTH + PAGE,
+        'retrieve': AUTH + 1,
+        # 구매 주문(기존 요청 조인) + 주문 전환 + 요청 INSERT 와 건수 + 응답용 요청 조회
+        'request_declaration': (
+            AUTH + 1 + workflow.TRANSITION_QUERIES
+            + 1 + summary.RECORD_QUERIES + summary.DUE_DATE_QUERIES + 1
+        ),
+    }
+    # 선박 정보(ship_info)에 고객사명이 들어간다
+    cache_models = (PurchaseOrder, Ship, Customer)
+    pagination_class = KeysetOptInPagination
+    # 액션 코드가 이미 요청이 있는지 확인
+    action_select_related = {'request_declaration': ['declaration_request']}
     
     def get_serializer_class(self):
         if self.action == 'list':
@@ -23,11 +87,11 @@ class PurchaseOrderViewSet(viewsets.ModelViewSet):
         return PurchaseOrderSerializer
     
     def get_queryset(self):
-        queryset = PurchaseOrder.objects.select_related('ship', 'created_by')
+        queryset = PurchaseOrder.objects.all()
         
         # 고객사는 자신의 선박 PO만 조회
         if self.request.user.user_type == 'customer':
-            queryset = queryset.filter(ship__customer__user=self.request.user)
+            queryset = scope_filter(queryset, customer_id=self.request.user.customer_id)
         
         # 필터링
         status_filter = self.request.query_params.get('status', None)
@@ -38,12 +102,13 @@ class PurchaseOrderViewSet(viewsets.ModelViewSet):
         if ship_id:
             queryset = queryset.filter(ship_id=ship_id)
         
-        return queryset
+        return self.plan_queryset(queryset)
     
     def perform_create(self, serializer):
-        serializer.save(created_by=self.request.user)
+        serializer.save(created_by_id=self.request.user.id)
     
     @action(detail=True, methods=['post'])
+    @transaction.atomic
     def request_declaration(self, request, pk=None):
         """신고서 요청 생성"""
         po = self.get_object()
@@ -59,115 +124,159 @@ class PurchaseOrderViewSet(viewsets.ModelViewSet):
             return Response({'detail': '공급업체를 선택해주세요.'},
                           status=status.HTTP_400_BAD_REQUEST)
         
+        # PO 상태를 먼저 전환하여 동시 요청은 409 로 끝나게 함
+        workflow.transition(po, 'request')
+        
         # 신고서 요청 생성
         declaration_request = DeclarationRequest.objects.create(
             purchase_order=po,
             supplier_id=supplier_id,
             due_date=request.data.get('due_date'),
-            created_by=request.user
+            created_by_id=request.user.id
         )
         
-        # PO 상태 업데이트
-        po.status = 'requested'
-        po.save()
-        
+        # 응답에 필요한 공급업체/선박/작성자를 한 번에 조회
+        declaration_request = DeclarationRequest.objects.select_related(
+            'purchase_order__ship', 'supplier', 'created_by'
+        ).get(pk=declaration_request.pk)
         serializer = DeclarationRequestSerializer(declaration_request)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
 
-class DeclarationRequestViewSet(viewsets.ModelViewSet):
+class DeclarationRequestViewSet(QueryBudgetMixin, QueryPlannerMixin, ConditionalGetMixin, ResponseCacheMixin,
+                                AsyncReadMixin, viewsets.ModelViewSet):
     """신고서 요청 ViewSet"""
     queryset = DeclarationRequest.objects.all()
     serializer_class = DeclarationRequestSerializer
     permission_classes = [IsAuthenticated]
+    query_budgets = {
+        'list': AUTH + PAGE,
+        'retrieve': AUTH + 1,
+        'pending': AUTH + PAGE,
+        # 대기 중인 요청이면 마감일 건수도 바뀐다
+        'approve': AUTH + 1 + workflow.TRANSITION_QUERIES + summary.DUE_DATE_QUERIES,
+        'reject': AUTH + 1 + workflow.TRANSITION_QUERIES + summary.DUE_DATE_QUERIES,
+    }
+    cache_actions = ('list', 'retrieve', 'pending')
+    cache_models = (DeclarationRequest, PurchaseOrder, Supplier, Ship)
+    pagination_class = KeysetOptInPagination
     
     def get_queryset(self):
-        queryset = DeclarationRequest.objects.select_related(
-            'purchase_order', 'supplier', 'created_by'
-        )
+        queryset = DeclarationRequest.objects.all()
         
         # 공급업체는 자신에게 온 요청만 조회
         if self.request.user.user_type == 'supplier':
-            queryset = queryset.filter(supplier__user=self.request.user)
+            queryset = scope_filter(queryset, supplier_id=self.request.user.supplier_id)
         
         # 고객사는 자신의 선박 관련 요청만 조회
         elif self.request.user.user_type == 'customer':
-            queryset = queryset.filter(purchase_order__ship__customer__user=self.request.user)
+            queryset = scope_filter(queryset, customer_id=self.request.user.customer_id)
         
         # 필터링
         status_filter = self.request.query_params.get('status', None)
         if status_filter:
             queryset = queryset.filter(status=status_filter)
         
-        return queryset
+        return self.plan_queryset(queryset)
     
     @action(detail=False, methods=['get'])
     def pending(self, request):
         """대기중인 신고서 요청 (공급업체용)"""
         if request.user.user_type != 'supplier':
             return Response({'detail': '공급업체 사용자만 접근 가능합니다.'}, status=403)
-        
-        requests_list = DeclarationRequest.objects.filter(
-            supplier__user=request.user,
-            status='pending'
-        )
-        serializer = self.get_serializer(requests_list, many=True)
-        return Response(serializer.data)
+        return self.cached_response(request, self._pending)
+    
+    def _pending(self, request):
+        # get_queryset 이 이미 공급업체 범위로 제한하고 필요한 관계를 조인함
+        queryset = self.get_queryset().filter(status='pending')
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
     
     @action(detail=True, methods=['post'])
+    @transaction.atomic
     def approve(self, request, pk=None):
         """신고서 요청 승인 (운영자 전용)"""
         if request.user.user_type != 'operator':
             return Response({'detail': '운영자만 승인할 수 있습니다.'},
                           status=status.HTTP_403_FORBIDDEN)
         
-        declaration_request = self.get_object()
-        declaration_request.status = 'approved'
-        declaration_request.save()
+        declaration_request = workflow.transition(self.get_object(), 'approve')
         
         serializer = self.get_serializer(declaration_request)
         return Response(serializer.data)
     
     @action(detail=True, methods=['post'])
+    @transaction.atomic
     def reject(self, request, pk=None):
         """신고서 요청 거절 (운영자 전용)"""
         if request.user.user_type != 'operator':
             return Response({'detail': '운영자만 거절할 수 있습니다.'},
                           status=status.HTTP_403_FORBIDDEN)
         
-        declaration_request = self.get_object()
-        declaration_request.status = 'rejected'
-        declaration_request.rejection_reason = request.data.get('rejection_reason', '')
-        declaration_request.save()
+        declaration_request = workflow.transition(
+            self.get_object(), 'reject', rejection_reason=request.data.get('rejection_reason', '')
+        )
         
         serializer = self.get_serializer(declaration_request)
         return Response(serializer.data)
 
 
-class DeclarationViewSet(viewsets.ModelViewSet):
+class DeclarationViewSet(QueryBudgetMixin, QueryPlannerMixin, ConditionalGetMixin, ResponseCacheMixin, FastListMixin,
+                         AsyncReadMixin, viewsets.ModelViewSet):
     """신고서 ViewSet"""
     queryset = Declaration.objects.all()
     permission_classes = [IsAuthenticated]
+    query_budgets = {
+        'list': AUTH + PAGE,
+        # 신고서(관계 조인) + 유해물질
+        'retrieve': AUTH + 2,
+        # 신고서 + 신고서/요청/주문 전환 + 인벤토리 + 응답의 유해물질과 승인자
+        'approve': AUTH + 1 + 3 * workflow.TRANSITION_QUERIES + inventory.REFRESH_QUERIES + 2,
+        'reject': AUTH + 1 + 2 * workflow.TRANSITION_QUERIES + inventory.REFRESH_QUERIES + 2,
+        # 구매 주문 + 신고서 번호 확인, 요청 INSERT + 전환, 물질 등록부 + 기준값, 신고서 + 유해물질 INSERT
+        # (유해물질 HAZMAT_BATCH_SIZE 행까지), 요청/신고서 건수, 검색 색인
+        'bulk': (
+            AUTH + 2 + 2 + 2 + 2 + summary.RECORD_QUERIES + summary.DUE_DATE_QUERIES
+            + summary.RECORD_QUERIES + 1
+        ),
+        # 신고서 행 잠금 + 테이블별 전환 + (신고서, CAS 번호) 조회 + 인벤토리
+        'bulk_approve': AUTH + 1 + 3 * workflow.TRANSITION_QUERIES + 1 + inventory.REFRESH_MANY_QUERIES,
+        'bulk_reject': AUTH + 1 + 2 * workflow.TRANSITION_QUERIES + 1 + inventory.REFRESH_MANY_QUERIES,
+        # 스트리밍 응답의 조회는 dispatch 가 끝난 뒤 실행된다
+        'export': AUTH,
+        'my_ship_declarations': AUTH + PAGE,
+    }
+    cache_actions = ('list', 'retrieve', 'my_ship_declarations')
+    cache_models = (Declaration, DeclarationRequest, PurchaseOrder, Supplier, Ship, HazardousMaterial)
+    pagination_class = KeysetOptInPagination
+    # 승인/거절 코드가 직접 갱신하는 관계
+    action_select_related = {
+        'approve': ['declaration_request__purchase_order'],
+        'reject': ['declaration_request'],
+    }
     
     def get_serializer_class(self):
-        if self.action == 'list':
+        if self.action in ('list', 'my_ship_declarations'):
             return DeclarationListSerializer
         elif self.action == 'create':
             return DeclarationCreateSerializer
         return DeclarationSerializer
     
     def get_queryset(self):
-        queryset = Declaration.objects.select_related(
-            'declaration_request', 'supplier', 'ship', 'approved_by'
-        ).prefetch_related('hazardous_materials')
+        queryset = Declaration.objects.all()
         
         # 공급업체는 자신이 제출한 신고서만 조회
         if self.request.user.user_type == 'supplier':
-            queryset = queryset.filter(supplier__user=self.request.user)
+            queryset = scope_filter(queryset, supplier_id=self.request.user.supplier_id)
         
         # 고객사는 자신의 선박 신고서만 조회
         elif self.request.user.user_type == 'customer':
-            queryset = queryset.filter(ship__customer__user=self.request.user)
+            queryset = scope_filter(queryset, customer_id=self.request.user.customer_id)
+        
+        # 고객사용 목록은 승인된 신고서만
+        if self.action == 'my_ship_declarations':
+            queryset = queryset.filter(status='approved')
         
         # 필터링
         status_filter = self.request.query_params.get('status', None)
@@ -182,94 +291,270 @@ class DeclarationViewSet(viewsets.ModelViewSet):
         if ship_id:
             queryset = queryset.filter(ship_id=ship_id)
         
-        return queryset
+        return self.plan_queryset(queryset)
     
+    @transaction.atomic
     def perform_create(self, serializer):
         declaration = serializer.save(
             submitted_date=timezone.now(),
             status='submitted'
         )
         # DeclarationRequest 상태 업데이트
-        declaration.declaration_request.status = 'submitted'
-        declaration.declaration_request.save()
+        workflow.transition(declaration.declaration_request, 'submit')
     
     @action(detail=True, methods=['post'])
+    @transaction.atomic
     def approve(self, request, pk=None):
         """신고서 승인 (운영자 전용)"""
         if request.user.user_type != 'operator':
             return Response({'detail': '운영자만 승인할 수 있습니다.'},
                           status=status.HTTP_403_FORBIDDEN)
         
-        declaration = self.get_object()
-        declaration.status = 'approved'
-        declaration.approved_by = request.user
-        declaration.approved_date = timezone.now()
-        declaration.save()
-        
-        # DeclarationRequest 상태 업데이트
-        declaration.declaration_request.status = 'approved'
-        declaration.declaration_request.save()
+        declaration = workflow.transition(
+            self.get_object(), 'approve', approved_by_id=request.user.id, approved_date=timezone.now()
+        )
         
-        # PurchaseOrder 상태 업데이트
-        po = declaration.declaration_request.purchase_order
-        po.status = 'completed'
-        po.save()
+        # DeclarationRequest / PurchaseOrder 상태 업데이트
+        workflow.transition(declaration.declaration_request, 'approve')
+        workflow.transition(declaration.declaration_request.purchase_order, 'complete')
         
         serializer = self.get_serializer(declaration)
         return Response(serializer.data)
     
     @action(detail=True, methods=['post'])
+    @transaction.atomic
     def reject(self, request, pk=None):
         """신고서 거절 (운영자 전용)"""
         if request.user.user_type != 'operator':
             return Response({'detail': '운영자만 거절할 수 있습니다.'},
                           status=status.HTTP_403_FORBIDDEN)
         
-        declaration = self.get_object()
-        declaration.status = 'rejected'
-        declaration.approved_by = request.user
-        declaration.approved_date = timezone.now()
-        declaration.rejection_reason = request.data.get('rejection_reason', '')
-        declaration.save()
+        declaration = workflow.transition(
+            self.get_object(), 'reject', approved_by_id=request.user.id, approved_date=timezone.now(),
+            rejection_reason=request.data.get('rejection_reason', ''),
+        )
         
         # DeclarationRequest 상태 업데이트
-        declaration.declaration_request.status = 'rejected'
-        declaration.declaration_request.save()
+        workflow.transition(declaration.declaration_request, 'reject')
         
         serializer = self.get_serializer(declaration)
         return Response(serializer.data)
     
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk(self, request):
+        """신고서 일괄 제출 (공급업체 전용) - 하나라도 오류가 있으면 전체를 저장하지 않음"""
+        if request.user.user_type != 'supplier':
+            return Response({'detail': '공급업체 사용자만 제출할 수 있습니다.'},
+                          status=status.HTTP_403_FORBIDDEN)
+        
+        items = request.data
+        if not isinstance(items, list) or not items:
+            return Response({'detail': '신고서 목록(배열)을 보내주세요.'},
+                          status=status.HTTP_400_BAD_REQUEST)
+        if len(items) > BULK_MAX_ITEMS:
+            return Response({'detail': f'한 번에 최대 {BULK_MAX_ITEMS}건까지 제출할 수 있습니다.'},
+                          status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            declarations = submit_declarations(request.user, items, self.get_serializer_context())
+        except BulkValidationError as exc:
+            errors = [{'index': i, 'errors': e} for i, e in enumerate(exc.errors) if e]
+            return Response({'detail': f'{len(errors)}건의 신고서에 오류가 있습니다.', 'errors': errors},
+                          status=status.HTTP_400_BAD_REQUEST)
+        
+        results = [
+            {'index': i, 'id': d.id, 'declaration_number': d.declaration_number}
+            for i, d in enumerate(declarations)
+        ]
+        return Response({'created': len(results), 'results': results}, status=status.HTTP_201_CREATED)
+    
+    def _review(self, request, decision):
+        if request.user.user_type != 'operator':
+            return Response({'detail': '운영자만 승인/거절할 수 있습니다.'},
+                          status=status.HTTP_403_FORBIDDEN)
+        
+        ids = request.data.get('ids') if isinstance(request.data, dict) else None
+        if (not isinstance(ids, list) or not ids
+                or not all(isinstance(pk, int) and not isinstance(pk, bool) for pk in ids)):
+            return Response({'detail': '신고서 ID 목록(ids)을 보내주세요.'},
+                          status=status.HTTP_400_BAD_REQUEST)
+        if len(ids) > BULK_MAX_ITEMS:
+            return Response({'detail': f'한 번에 최대 {BULK_MAX_ITEMS}건까지 처리할 수 있습니다.'},
+                          status=status.HTTP_400_BAD_REQUEST)
+        
+        results = review_declarations(
+            request.user, ids, decision, request.data.get('rejection_reason', '')
+        )
+        processed = sum(1 for result in results if result['outcome'] in ('approved', 'rejected'))
+        return Response({'processed': processed, 'results': results})
+    
+    @action(detail=False, methods=['post'], url_path='bulk-approve')
+    def bulk_approve(self, request):
+        """제출된 신고서 일괄 승인 (운영자 전용) - 신고서별 처리 결과 반환"""
+        return self._review(request, 'approve')
+    
+    @action(detail=False, methods=['post'], url_path='bulk-reject')
+    def bulk_reject(self, request):
+        """제출된 신고서 일괄 거절 (운영자 전용) - 신고서별 처리 결과 반환"""
+        return self._review(request, 'reject')
+    
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """신고서 목록 CSV/XLSX 내보내기 (?export_format=csv|xlsx, 목록과 같은 범위와 필터)"""
+        return export_response(
+            request, self.get_queryset(), DECLARATION_EXPORT_COLUMNS, 'declarations', sheet_name='신고서'
+        )
+    
     @action(detail=False, methods=['get'])
     def my_ship_declarations(self, request):
         """내 선박의 신고서 목록 (고객사용)"""
         if request.user.user_type != 'customer':
             return Response({'detail': '고객사 사용자만 접근 가능합니다.'}, status=403)
         
-        declarations = Declaration.objects.filter(
-            ship__customer__user=request.user,
-            status='approved'
-        )
-        serializer = DeclarationListSerializer(declarations, many=True)
-        return Response(serializer.data)
+        # get_queryset 이 이미 고객사 선박 범위, 승인된 신고서로 제한함
+        return self.list(request)
+    
+    async def amy_ship_declarations(self, request):
+        if request.user.user_type != 'customer':
+            return Response({'detail': '고객사 사용자만 접근 가능합니다.'}, status=403)
+        return await self.alist(request)
 
 
-class HazardousMaterialViewSet(viewsets.ModelViewSet):
+class HazardousMaterialViewSet(QueryBudgetMixin, QueryPlannerMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     """유해물질 ViewSet"""
     queryset = HazardousMaterial.objects.all()
     serializer_class = HazardousMaterialSerializer
     permission_classes = [IsAuthenticated]
+    query_budgets = {'list': AUTH + PAGE, 'retrieve': AUTH + 1, 'export': AUTH}
     
     def get_queryset(self):
-        queryset = HazardousMaterial.objects.select_related('declaration')
+        queryset = HazardousMaterial.objects.all()
+        
+        # 공급업체는 자신이 제출한 신고서의 유해물질만, 고객사는 자신의 선박 유해물질만 조회
+        if self.request.user.user_type == 'supplier':
+            queryset = scope_filter(queryset, declaration__supplier_id=self.request.user.supplier_id)
+        elif self.request.user.user_type == 'customer':
+            queryset = scope_filter(queryset, customer_id=self.request.user.customer_id)
         
         # 신고서 ID로 필터링
         declaration_id = self.request.query_params.get('declaration', None)
         if declaration_id:
             queryset = queryset.filter(declaration_id=declaration_id)
         
-        # 물질명으로 검색
-        material_name = self.request.query_params.get('material_name', None)
-        if material_name:
-            queryset = queryset.filter(material_name__icontains=material_name)
+        # 물질 등록부(CAS 번호 또는 물질명/동의어 앞부분)로 검색 (?material_name= 는 이전 이름)
+        query = self.request.query_params.get('q', None) or self.request.query_params.get('material_name', None)
+        if query:
+            queryset = queryset.filter(substance__in=substances.search(query).values('pk'))
+        
+        # 행에 적힌 물질명 일부 - 등록부에 연결되지 않은 행용, 색인을 쓰지 못하므로 명시적으로 요청할 때만
+        contains = self.request.query_params.get('material_name_contains', None)
+        if contains:
+            queryset = queryset.filter(material_name__icontains=contains)
+        
+        substance_id = self.request.query_params.get('substance', None)
+        if substance_id:
+            queryset = queryset.filter(substance_id=substance_id)
+        
+        ship_id = self.request.query_params.get('ship', None)
+        if ship_id:
+            queryset = queryset.filter(declaration__ship_id=ship_id)
+        
+        return self.plan_queryset(queryset)
+    
+    # 유해물질이 바뀌면 해당 신고서의 적합성을 다시 판정
+    @transaction.atomic
+    def perform_update(self, serializer):
+        material = serializer.save()
+        compliance.evaluate([material.declaration_id])
+    
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        instance.delete()
+        compliance.evaluate([instance.declaration_id])
+    
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """유해물질 목록 CSV/XLSX 내보내기 (?export_format=csv|xlsx, 목록과 같은 범위와 필터)"""
+        return export_response(
+            request, self.get_queryset().order_by('declaration_id', 'pk'), HAZARDOUS_MATERIAL_EXPORT_COLUMNS, 'hazardous-materials',
+            sheet_name='유해물질',
+        )
+
+
+class SubstanceViewSet(QueryBudgetMixin, ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
+    """물질 등록부 조회 (?q= CAS 번호 또는 물질명/동의어 앞부분, ?hkc_table=A|B, ?eu_srr_annex=I|II)
+
+    등록/수정은 관리 화면에서 합니다.
+    """
+    queryset = Substance.objects.all()
+    serializer_class = SubstanceSerializer
+    permission_classes = [IsAuthenticated]
+    query_budgets = {'list': AUTH + PAGE, 'retrieve': AUTH + 1}
+    
+    def get_queryset(self):
+        query = self.request.query_params.get('q', None)
+        queryset = substances.search(query) if query else Substance.objects.all()
+        
+        for param in ('hkc_table', 'eu_srr_annex'):
+            value = self.request.query_params.get(param, None)
+            if value:
+                queryset = queryset.filter(**{param: value})
         
         return queryset
+
+
+class DashboardViewSet(QueryBudgetMixin, AsyncReadMixin, viewsets.ViewSet):
+    """대시보드 ViewSet"""
+    permission_classes = [IsAuthenticated]
+    query_budgets = {'summary': AUTH + summary.SUMMARY_QUERIES}
+    
+    @action(detail=False, methods=['get'])
+    def summary(self, request):
+        """내 범위의 상태별 건수와 마감 지연 건수 (요약 테이블에서 조회)"""
+        return Response(summary_for(request.user))
+    
+    async def asummary(self, request):
+        return Response(await asummary_for(request.user))
+
+
+class ShipReportViewSet(QueryBudgetMixin, QueryPlannerMixin, ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
+    """선박 보고서 생성 상태 조회 / 결과 다운로드
+
+    생성 요청은 POST /api/ships/{id}/reports/ (선박 하나), POST /api/ships/reports/ (선단 전체)
+    """
+    queryset = ShipReport.objects.all()
+    serializer_class = ShipReportSerializer
+    permission_classes = [IsAuthenticated]
+    query_budgets = {'list': AUTH + PAGE, 'retrieve': AUTH + 1, 'download': AUTH + 1}
+    action_select_related = {'download': ['artifact']}
+    
+    def get_queryset(self):
+        queryset = ShipReport.objects.all()
+        
+        # 고객사는 자신의 선박 보고서만, 공급업체는 조회 불가
+        if self.request.user.user_type == 'customer':
+            queryset = scope_filter(queryset, ship__customer_id=self.request.user.customer_id)
+        elif self.request.user.user_type == 'supplier':
+            queryset = queryset.none()
+        
+        ship_id = self.request.query_params.get('ship', None)
+        if ship_id:
+            queryset = queryset.filter(ship_id=ship_id)
+        
+        return self.plan_queryset(queryset)
+    
+    @action(detail=True, methods=['get'])
+    def download(self, request, pk=None):
+        """생성된 보고서 (?output=json|html, 기본 json) - html 은 브라우저에서 PDF 로 인쇄"""
+        report = self.get_object()
+        if report.status != 'done' or report.artifact is None:
+            return Response({'detail': '보고서가 아직 생성되지 않았습니다.', 'status': report.status},
+                          status=status.HTTP_409_CONFLICT)
+        
+        output = request.query_params.get('output', 'json')
+        if output == 'html':
+            return HttpResponse(report.artifact.html, content_type='text/html; charset=utf-8')
+        if output != 'json':
+            return Response({'detail': 'output 은 json 또는 html 이어야 합니다.'},
+                          status=status.HTTP_400_BAD_REQUEST)
+        return Response(report.artifact.document)
@@ -0,0 +1,110 @@
+"""
+신고서 업무 흐름 상태 전환
+
+구매 주문 / 신고서 요청 / 신고서의 허용된 상태 전환을 TRANSITIONS 한 곳에 정의합니다.
+
+transition() 은 읽은 시점의 상태를 조건으로 한 UPDATE ... WHERE id=? AND status=<기대 상태> 하나로
+지정한 컬럼만 갱신합니다. 다른 요청이 먼저 상태를 바꿔 갱신된 행이 없으면 TransitionConflict(409)
+를 발생시키고, 바깥 트랜잭션(뷰의 transaction.atomic)과 함께 앞선 전환도 되돌려집니다.
+update() 는 signal 을 발생시키지 않으므로 성공하면 post_save 를 직접 보내 요약 건수와 인벤토리를 갱신합니다.
+
+일괄 처리(bulk)는 can_transition() 으로 항목별 허용 여부를 판단하고 transition_many() 의
+UPDATE ... WHERE id IN (...) AND status IN (<허용 상태>) 로 여러 행을 한 번에 전환합니다.
+"""
+from django.db import router, transaction
+from django.db.models.signals import post_save
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from . import summary
+from .models import PurchaseOrder, DeclarationRequest, Declaration
+
+# 모델 → 전환 이름 → (허용되는 현재 상태, 전환 후 상태)
+TRANSITIONS = {
+    PurchaseOrder: {
+        'request': (('pending',), 'requested'),
+        'complete': (('pending', 'requested'), 'completed'),
+    },
+    DeclarationRequest: {
+        'submit': (('pending', 'rejected'), 'submitted'),
+        'approve': (('pending', 'submitted'), 'approved'),
+        'reject': (('pending', 'submitted', 'approved'), 'rejected'),
+    },
+    Declaration: {
+        'approve': (('submitted',), 'approved'),
+        # 승인된 신고서도 거절(승인 취소)할 수 있으며, 인벤토리에서 빠진다
+        'reject': (('submitted', 'approved'), 'rejected'),
+    },
+}
+
+
+# 쿼리 예산(ihm_backend.query_budget)용: 조건부 UPDATE + 요약 건수 반영 (transition, transition_many 모두)
+TRANSITION_QUERIES = 1 + summary.RECORD_QUERIES
+
+
+class TransitionConflict(APIException):
+    """현재 상태에서 허용되지 않거나 다른 요청이 먼저 상태를 바꾼 전환"""
+    status_code = status.HTTP_409_CONFLICT
+    default_code = 'conflict'
+
+    def __init__(self, instance, name, current_status):
+        super().__init__(
+            f"{instance._meta.verbose_name}의 현재 상태({current_status})에서는 '{name}' 전환을 할 수 없습니다."
+        )
+        self.current_status = current_status
+
+
+def can_transition(model, name, current_status):
+    """current_status 에서 name 전환이 허용되는지"""
+    return current_status in TRANSITIONS[model][name][0]
+
+
+def _update_fields(model, values):
+    return frozenset(model._meta.get_field(attname).name for attname in values)
+
+
+@transaction.atomic(savepoint=False)
+def transition(instance, name, **values):
+    """instance 에 name 전환을 적용하고 values 컬럼도 함께 갱신, instance 반환"""
+    model = type(instance)
+    new_status = TRANSITIONS[model][name][1]
+    expected = getattr(instance, 'loaded_values', {}).get('status', instance.status)
+    if not can_transition(model, name, expected):
+        raise TransitionConflict(instance, name, expected)
+
+    values = {**values, 'status': new_status, 'updated_at': timezone.now()}
+    manager = model._base_manager
+    if not manager.filter(pk=instance.pk, status=expected).update(**values):
+        current = manager.filter(pk=instance.pk).values_list('status', flat=True).first()
+        raise TransitionConflict(instance, name, current)
+
+    for attname, value in values.items():
+        setattr(instance, attname, value)
+    post_save.send(
+        sender=model, instance=instance, created=False, raw=False,
+        using=router.db_for_write(model, instance=instance),
+        update_fields=_update_fields(model, values),
+    )
+    instance.loaded_values = instance._current_values()
+    return instance
+
+
+def transition_many(model, name, pks, **values):
+    """pks 행 모두에 name 전환을 UPDATE 한 번으로 적용하고 values 컬럼도 함께 갱신
+
+    허용되는 현재 상태를 WHERE 조건으로 걸어, 갱신된 행 수가 pks 보다 적으면(다른 요청이 먼저
+    상태를 바꿈) TransitionConflict 를 발생시킵니다. signal 은 보내지 않으므로 요약 건수 등은
+    호출하는 쪽이 반영합니다.
+    """
+    allowed, new_status = TRANSITIONS[model][name]
+    pks = set(pks)
+    manager = model._base_manager
+    updated = manager.filter(pk__in=pks, status__in=allowed).update(
+        **values, status=new_status, updated_at=timezone.now()
+    )
+    if updated != len(pks):
+        current = manager.filter(pk__in=pks).exclude(status=new_status).values_list('status', flat=True).first()
+        # 모두 전환 후 상태라면 다른 요청이 같은 전환을 먼저 적용한 것
+        raise TransitionConflict(model, name, current or new_status)
+    return new_status
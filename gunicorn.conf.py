@@ -0,0 +1,81 @@
+"""
+gunicorn 설정 (Procfile 의 web 프로세스)
+
+워커 수/종류/스레드, 앱 preload, 워커 재시작(max-requests)을 환경 변수로 조정합니다.
+
+  WEB_CONCURRENCY            워커 프로세스 수 (기본 2)
+  GUNICORN_WORKER_CLASS      워커 종류 (기본 gthread, ASGI 는 uvicorn_worker.UvicornWorker)
+                             uvicorn 워커면 ihm_backend.asgi, 아니면 ihm_backend.wsgi 를 실행
+  GUNICORN_THREADS           gthread 워커의 스레드 수 (기본 4) - 워커당 DB 연결 수와 같다
+  GUNICORN_PRELOAD           마스터에서 앱을 한 번 로드하고 fork (기본 True)
+  GUNICORN_MAX_REQUESTS      이 요청 수를 처리한 워커는 새 워커로 교체 (기본 1000, 0 이면 끔)
+  GUNICORN_MAX_REQUESTS_JITTER  워커들이 한꺼번에 재시작하지 않도록 더하는 임의 값 (기본 100)
+  GUNICORN_TIMEOUT           요청 처리 제한 시간(초, 기본 30)
+  GUNICORN_KEEPALIVE         keep-alive 연결 유지 시간(초, 기본 5)
+
+DB 연결 유지(DB_CONN_MAX_AGE, DB_CONN_HEALTH_CHECKS)는 settings.py 에서 정하며,
+시작할 때 워커 구성과 함께 실제 적용된 값을 로그로 남깁니다.
+"""
+import os
+
+# gunicorn 은 이 파일의 전역 이름을 설정으로 읽고 'config' 도 설정 이름이므로 decouple.config 로 부른다
+import decouple
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'ihm_backend.settings')
+
+bind = f'0.0.0.0:{decouple.config("PORT", default="8000")}'
+workers = decouple.config('WEB_CONCURRENCY', default=2, cast=int)
+worker_class = decouple.config('GUNICORN_WORKER_CLASS', default='gthread')
+# Procfile 은 앱을 지정하지 않고 워커 종류에 맞는 진입점을 쓴다 (ASGI 는 async 조회 view 를 켠다)
+wsgi_app = 'ihm_backend.asgi:application' if 'uvicorn' in worker_class.lower() else 'ihm_backend.wsgi:application'
+threads = decouple.config('GUNICORN_THREADS', default=4, cast=int)
+preload_app = decouple.config('GUNICORN_PRELOAD', default=True, cast=bool)
+max_requests = decouple.config('GUNICORN_MAX_REQUESTS', default=1000, cast=int)
+max_requests_jitter = decouple.config('GUNICORN_MAX_REQUESTS_JITTER', default=100, cast=int)
+timeout = decouple.config('GUNICORN_TIMEOUT', default=30, cast=int)
+graceful_timeout = timeout
+keepalive = decouple.config('GUNICORN_KEEPALIVE', default=5, cast=int)
+accesslog = '-'
+errorlog = '-'
+
+
+def _threaded(worker_class):
+    return worker_class == 'gthread' or worker_class.endswith('ThreadWorker')
+
+
+def _connections_per_worker(cfg):
+    if _threaded(cfg.worker_class_str):
+        return cfg.threads
+    # sync 워커는 요청을 하나씩 처리하므로 연결도 하나, async 워커는 요청마다 연결
+    return 1 if cfg.worker_class_str == 'sync' else 'per request'
+
+
+def when_ready(server):
+    cfg = server.cfg
+    server.log.info(
+        'workers=%s worker_class=%s threads=%s preload_app=%s max_requests=%s (+jitter %s) timeout=%ss',
+        cfg.workers, cfg.worker_class_str, cfg.threads if _threaded(cfg.worker_class_str) else '-',
+        cfg.preload_app, cfg.max_requests, cfg.max_requests_jitter, cfg.timeout,
+    )
+
+
+def post_fork(server, worker):
+    # preload 중 마스터에서 열린 DB 연결을 워커들이 함께 쓰지 않도록 닫는다
+    from django.db import connections
+    connections.close_all()
+
+
+def post_worker_init(worker):
+    from django.conf import settings
+    from django.db import connections
+
+    cfg = worker.cfg
+    # 스레드마다 연결 하나 - 워커당 최대 연결 수는 gthread 스레드 수
+    per_worker = _connections_per_worker(cfg)
+    for alias in connections:
+        db = connections.settings[alias]
+        worker.log.info(
+            'database %s: engine=%s conn_max_age=%s conn_health_checks=%s connections/worker=%s async_read_views=%s',
+            alias, db['ENGINE'].rsplit('.', 1)[-1], db['CONN_MAX_AGE'], db['CONN_HEALTH_CHECKS'], per_worker,
+            settings.ASYNC_READ_VIEWS,
+        )
@@ -0,0 +1,18 @@
+// CSV/XLSX 내보내기 다운로드 헬퍼
+// 인증 헤더가 필요하므로 링크 대신 api 로 받아 Blob 으로 저장한다.
+import api from '@/services/api'
+
+export const downloadExport = async (path, params = {}, exportFormat = 'csv') => {
+  const response = await api.get(path, {
+    params: { ...params, export_format: exportFormat },
+    responseType: 'blob'
+  })
+  const disposition = response.headers['content-disposition'] || ''
+  const match = disposition.match(/filename="([^"]+)"/)
+  const url = URL.createObjectURL(response.data)
+  const link = document.createElement('a')
+  link.href = url
+  link.download = match ? match[1] : `export.${exportFormat}`
+  link.click()
+  URL.revokeObjectURL(url)
+}
@@ -0,0 +1,15 @@
+// 키셋(커서) 페이지네이션 헬퍼
+// 백엔드의 next/previous 링크에서 불투명 커서만 꺼내고,
+// 필터는 페이지의 현재 상태로 다시 보내므로 페이지 이동 중에도 유지된다.
+
+export const cursorFromLink = (link) => {
+  if (!link) return null
+  return new URL(link).searchParams.get('cursor')
+}
+
+export const pageParams = ({ cursorMode, cursor, page, pageSize }) => {
+  if (cursorMode) {
+    return { pagination: 'cursor', cursor: cursor || undefined, page_size: pageSize }
+  }
+  return { page, page_size: pageSize }
+}
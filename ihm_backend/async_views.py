@@ -0,0 +1,131 @@
+"""
+async 조회 엔드포인트
+
+대시보드 화면은 목록/요약/인벤토리 GET 을 동시에 여러 개 보내므로, ASGI 로 실행할 때는 자주 쓰는 조회 액션을
+Django async ORM 으로 처리해 DB 응답을 기다리는 동안 워커를 붙잡지 않습니다.
+
+- AsyncReadMixin: ViewSet 에 async 디스패치(adispatch)와 alist / aretrieve / aget_object / apaginate_queryset 을 제공
+  ConditionalGetMixin, ResponseCacheMixin, FastListMixin 은 같은 이름의 async 메서드로 sync 와 같은 처리를 하고,
+  그 밖의 액션은 a<액션> 메서드를 정의하면 async 로 처리됩니다 (예: DashboardViewSet.asummary).
+- async_routes(router.urls): a<액션> 이 있는 GET/HEAD 라우트를 async view 로 바꾼 URL 패턴 목록
+  ASYNC_READ_VIEWS 설정이 꺼져 있으면(WSGI) 패턴을 그대로 반환하며, asgi.py 가 이 설정을 켭니다.
+
+인증/권한 확인(initial)과 역할 범위(get_queryset)는 sync view 와 같은 코드를 쓰고,
+토큰 버전 확인처럼 캐시/DB 를 읽는 인증 단계만 스레드에서 실행합니다.
+쓰기 요청과 a<액션> 이 없는 액션은 기존 sync view 가 스레드에서 처리합니다.
+쿼리 예산(QueryBudgetMixin.adispatch)은 async ORM 이 쓰는 스레드의 연결에서 쿼리를 세므로 sync view 와 같이 적용됩니다.
+
+비용: async ORM 쿼리는 요청마다 sync_to_async 스레드에서 실행되고, ASGI 에서는 요청이 끝날 때 연결을 닫으므로
+(DB_CONN_MAX_AGE 기본 0) 요청마다 DB 연결을 새로 엽니다. benchmark_async_reads --threads 4 (gunicorn 워커 1개,
+SQLite) 측정에서 동시 요청 1/8/32 개일 때 WSGI gthread 는 53/151/143 req/s, ASGI 는 41/86/83 req/s 로
+스레드 수만큼 동시 처리되는 WSGI 가 빨랐고, ASGI 는 동시 요청 32 개에서 p95 지연만 낮았습니다 (1307 ms -> 402 ms).
+그래서 기본 실행은 WSGI 이며, DB 응답이 느린 원격 DB 처럼 대기 시간이 긴 환경에서만 ASGI 를 고려합니다.
+"""
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.http import Http404
+from django.urls import URLPattern
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.response import Response
+
+ASYNC_METHODS = ('get', 'head')
+
+
+class AsyncReadMixin:
+    """async 조회 액션을 지원하는 ViewSet Mixin (viewsets 기본 클래스 바로 앞에 둡니다)"""
+
+    async def adispatch(self, request, *args, **kwargs):
+        """APIView.dispatch 의 async 버전 - self.action 의 a<액션> 메서드를 await"""
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            handler = getattr(self, f'a{self.action}')
+            response = await handler(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    async def alist(self, request, *args, **kwargs):
+        # FastListMixin 이 처리하지 않는 목록(중첩 Serializer 등)은 sync list 를 스레드에서 실행
+        return await sync_to_async(super().list)(request, *args, **kwargs)
+
+    async def aretrieve(self, request, *args, **kwargs):
+        instance = await self.aget_object()
+        serializer = self.get_serializer(instance)
+        return Response(serializer.data)
+
+    async def aget_object(self):
+        """GenericAPIView.get_object 의 async ORM 버전"""
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            obj = await queryset.aget(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        except (queryset.model.DoesNotExist, TypeError, ValueError, ValidationError):
+            raise Http404(f'No {queryset.model._meta.object_name} matches the given query.')
+        self.check_object_permissions(self.request, obj)
+        return obj
+
+    async def apaginate_queryset(self, queryset):
+        if self.paginator is None:
+            return None
+        return await self.paginator.apaginate_queryset(queryset, self.request, view=self)
+
+
+def async_routes(patterns, enabled=None):
+    """router.urls 중 a<액션> 이 있는 ViewSet 라우트를 async view 로 바꾼 URL 패턴 목록"""
+    if enabled is None:
+        enabled = settings.ASYNC_READ_VIEWS
+    if not enabled:
+        return patterns
+
+    routes = []
+    for pattern in patterns:
+        callback = pattern.callback if isinstance(pattern, URLPattern) else None
+        cls = getattr(callback, 'cls', None)
+        actions = getattr(callback, 'actions', None) or {}
+        if cls is not None and issubclass(cls, AsyncReadMixin) and _async_action(cls, actions, 'get'):
+            pattern = URLPattern(pattern.pattern, async_view(callback), pattern.default_args, pattern.name)
+        routes.append(pattern)
+    return routes
+
+
+def _async_action(cls, actions, method):
+    action = actions.get(method) or (actions.get('get') if method == 'head' else None)
+    return action if action and hasattr(cls, f'a{action}') else None
+
+
+def async_view(sync_view):
+    """ViewSet 의 sync view(as_view 결과) → GET/HEAD 를 a<액션> 으로 처리하는 async view"""
+    cls, actions, initkwargs = sync_view.cls, sync_view.actions, sync_view.initkwargs
+    to_thread = sync_to_async(sync_view)
+
+    async def view(request, *args, **kwargs):
+        method = request.method.lower()
+        if method not in ASYNC_METHODS or not _async_action(cls, actions, method):
+            return await to_thread(request, *args, **kwargs)
+
+        # ViewSetMixin.as_view 의 view 와 같은 초기화
+        self = cls(**initkwargs)
+        action_map = dict(actions)
+        if 'get' in action_map:
+            action_map.setdefault('head', action_map['get'])
+        self.action_map = action_map
+        for name, action in action_map.items():
+            setattr(self, name, getattr(self, action))
+        self.request = request
+        self.args = args
+        self.kwargs = kwargs
+        return await self.adispatch(request, *args, **kwargs)
+
+    view.cls = cls
+    view.initkwargs = initkwargs
+    view.actions = actions
+    return csrf_exempt(view)
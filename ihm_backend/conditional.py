@@ -0,0 +1,178 @@
+"""
+조건부 조회(Conditional GET) - ETag / Last-Modified 와 304 Not Modified
+
+목록과 상세 응답에 ETag, Last-Modified 헤더를 붙이고, 요청의 If-None-Match / If-Modified-Since 가
+맞으면 Serializer 를 실행하지 않고 바로 304 를 반환합니다.
+
+검증 값은 쿼리 한 번으로 구합니다.
+- 상세: 해당 행의 updated_at - 조건부 요청이 아니면 조회한 객체의 값을 써서 쿼리를 추가하지 않음
+- 목록: 범위/필터가 적용된 쿼리셋의 MAX(updated_at) 와 COUNT(*) (삭제는 건수로 드러난다)
+  구한 건수는 페이지네이션이 그대로 쓰므로 COUNT(*) 를 다시 실행하지 않습니다.
+  전체 건수를 세지 않는 페이지네이션(?pagination=cursor, ?count=estimate|none)은 큰 테이블용이므로
+  전체를 읽는 검증 쿼리를 실행하지 않고 조건부 조회도 하지 않습니다.
+
+ETag 는 요청 경로(쿼리 문자열 포함)와 사용자, 검증 값의 해시이므로
+페이지, ?fields= / ?expand=, 역할 범위가 다르면 서로 다른 ETag 가 됩니다.
+응답에 함께 나오는 관계 객체(예: 선박명)의 변경은 반영하지 않습니다.
+
+async view(ihm_backend.async_views)에서는 alist / aretrieve 가 같은 규칙으로 검증 값을 await 로 조회합니다.
+"""
+import hashlib
+
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+
+CONDITIONAL_METHODS = ('GET', 'HEAD')
+
+
+class ConditionalGetMixin:
+    """list / retrieve 에 조건부 조회를 적용하는 ViewSet Mixin
+
+    모델에 conditional_field(기본 updated_at) 가 있어야 합니다.
+    list 를 그대로 쓰는 다른 목록 액션(예: my_ships)도 self.list(request) 를 반환하면 적용됩니다.
+    """
+    conditional_field = 'updated_at'
+    # 목록 검증 쿼리에서 센 건수 (페이지네이션이 COUNT(*) 대신 사용)
+    conditional_count = None
+
+    def list(self, request, *args, **kwargs):
+        if not self._list_is_conditional(request):
+            return super().list(request, *args, **kwargs)
+        return self._conditional_response(request, super().list, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._conditional_response(request, super().retrieve, *args, **kwargs)
+
+    async def alist(self, request, *args, **kwargs):
+        if not self._list_is_conditional(request):
+            return await super().alist(request, *args, **kwargs)
+        return await self._aconditional_response(request, super().alist, *args, **kwargs)
+
+    async def aretrieve(self, request, *args, **kwargs):
+        return await self._aconditional_response(request, super().aretrieve, *args, **kwargs)
+
+    def get_object(self):
+        obj = super().get_object()
+        self.conditional_object = obj
+        return obj
+
+    async def aget_object(self):
+        obj = await super().aget_object()
+        self.conditional_object = obj
+        return obj
+
+    def _list_is_conditional(self, request):
+        counts_rows = getattr(self.paginator, 'counts_rows', None)
+        return self.paginator is None or bool(counts_rows and counts_rows(request))
+
+    def _conditional_queryset(self):
+        """(검증 값 조회 쿼리셋, 집계) - 목록은 MAX/COUNT 집계, 상세는 한 행의 conditional_field
+
+        상세의 pk 가 잘못되었으면 None (retrieve 가 404 로 처리한다)
+        """
+        queryset = self.filter_queryset(self.get_queryset()).prefetch_related(None).order_by()
+        if not self.detail:
+            return queryset, {'last_modified': Max(self.conditional_field), 'count': Count('pk')}
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            return queryset.filter(
+                **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+            ).values_list(self.conditional_field, flat=True), None
+        except (TypeError, ValueError, ValidationError):
+            return None, None
+
+    def _conditional_values(self, result):
+        if not self.detail:
+            self.conditional_count = result['count']
+            return result['last_modified'], result['count']
+        return None if result is None else (result, 1)
+
+    def get_conditional_values(self):
+        """(최종 수정 시각, 건수) - 상세는 건수가 1, 대상이 없으면 None"""
+        queryset, aggregates = self._conditional_queryset()
+        if queryset is None:
+            return None
+        return self._conditional_values(queryset.aggregate(**aggregates) if aggregates else queryset.first())
+
+    async def aget_conditional_values(self):
+        """get_conditional_values 의 async ORM 버전"""
+        queryset, aggregates = self._conditional_queryset()
+        if queryset is None:
+            return None
+        return self._conditional_values(await queryset.aaggregate(**aggregates) if aggregates else await queryset.afirst())
+
+    def _conditional_response(self, request, handler, *args, **kwargs):
+        if request.method not in CONDITIONAL_METHODS:
+            return handler(request, *args, **kwargs)
+        if self.detail and not _is_conditional(request):
+            response = handler(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+            values = self._fetched_values()
+            values = values if values is not None else self.get_conditional_values()
+            return self._add_validators(request, response, *values) if values else response
+
+        values = self.get_conditional_values()
+        if values is None:
+            return handler(request, *args, **kwargs)
+        response = self._not_modified(request, values)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+        return self._add_validators(request, response, *values)
+
+    async def _aconditional_response(self, request, handler, *args, **kwargs):
+        if request.method not in CONDITIONAL_METHODS:
+            return await handler(request, *args, **kwargs)
+        if self.detail and not _is_conditional(request):
+            response = await handler(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+            values = self._fetched_values()
+            values = values if values is not None else await self.aget_conditional_values()
+            return self._add_validators(request, response, *values) if values else response
+
+        values = await self.aget_conditional_values()
+        if values is None:
+            return await handler(request, *args, **kwargs)
+        response = self._not_modified(request, values)
+        if response is None:
+            response = await handler(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+        return self._add_validators(request, response, *values)
+
+    def _fetched_values(self):
+        """retrieve 가 읽은 객체의 검증 값
+
+        객체를 읽지 않았거나(응답 캐시) only() 로 읽지 않은 컬럼이면 None
+        """
+        obj = getattr(self, 'conditional_object', None)
+        modified = obj.__dict__.get(self.conditional_field) if obj is not None else None
+        return (modified, 1) if modified is not None else None
+
+    def _not_modified(self, request, values):
+        etag, last_modified = self._validators(request, *values)
+        return get_conditional_response(request, etag=etag, last_modified=last_modified)
+
+    def _validators(self, request, modified, count):
+        key = f'{request.get_full_path()}|{request.user.user_type}|{request.user.pk}|{modified}|{count}'
+        etag = '"%s"' % hashlib.md5(key.encode('utf-8'), usedforsecurity=False).hexdigest()
+        return etag, int(modified.timestamp()) if modified is not None else None
+
+    def _add_validators(self, request, response, modified, count):
+        etag, last_modified = self._validators(request, modified, count)
+        response.headers['ETag'] = etag
+        if last_modified is not None:
+            response.headers['Last-Modified'] = http_date(last_modified)
+        # 인증된 응답이므로 공유 캐시에는 저장하지 않고, 브라우저는 매번 재검증
+        patch_cache_control(response, private=True, no_cache=True)
+        patch_vary_headers(response, ['Authorization'])
+        return response
+
+
+def _is_conditional(request):
+    return 'HTTP_IF_NONE_MATCH' in request.META or 'HTTP_IF_MODIFIED_SINCE' in request.META
@@ -0,0 +1,193 @@
+"""
+평면(flat) 목록 Serializer 의 빠른 직렬화
+
+PurchaseOrderListSerializer 처럼 모든 필드가 모델 컬럼(또는 FK 로 이어진 관계의 컬럼)인 Serializer 는
+모델 인스턴스를 만들고 필드 객체를 행마다 순회할 필요가 없습니다.
+
+- 조회: 필드의 source 경로를 .values('id', 'ship__ship_name', ...) 로 바꿔 관계 컬럼도 SQL 조인으로 읽음
+- 변환: Serializer 마다 행(dict) → 응답 dict 함수를 한 번 생성(compile)해 재사용
+  문자열/정수/불리언처럼 값이 그대로 나가는 필드는 변환 없이 복사하고,
+  날짜/Decimal 등은 해당 필드의 to_representation 을 호출하므로 응답은 Serializer 와 같습니다.
+  null 허용 관계를 거치는 필드는 관계가 없으면 Serializer 처럼 응답에서 빠집니다.
+
+중첩 Serializer, SerializerMethodField, 모델 필드가 아닌 source(프로퍼티/메서드)가 하나라도 있으면
+compile_serializer 는 None 을 반환하고 ViewSet 은 기존 Serializer 경로로 처리합니다.
+"""
+import copy
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import fields, serializers
+from rest_framework.relations import PrimaryKeyRelatedField
+from rest_framework.response import Response
+
+# to_representation 이 DB 값을 그대로 반환하는 (Serializer 필드, 모델 필드 타입)
+IDENTITY_TYPES = {
+    fields.CharField.to_representation: {'CharField', 'TextField', 'SlugField'},
+    fields.IntegerField.to_representation: {
+        'AutoField', 'BigAutoField', 'SmallAutoField', 'IntegerField', 'BigIntegerField', 'SmallIntegerField',
+        'PositiveIntegerField', 'PositiveBigIntegerField', 'PositiveSmallIntegerField',
+    },
+    fields.BooleanField.to_representation: {'BooleanField'},
+    fields.ChoiceField.to_representation: {'CharField', 'TextField', 'SlugField'},
+    fields.ReadOnlyField.to_representation: None,
+}
+_compiled = {}
+
+
+class CompiledSerializer:
+    """values() 경로 목록과 행 변환 함수"""
+
+    def __init__(self, paths, to_dict):
+        self.paths = paths
+        self.to_dict = to_dict
+
+    def values(self, queryset):
+        """queryset → 필요한 컬럼만 읽는 .values() 쿼리셋
+
+        정렬 컬럼과 pk 는 키셋 페이지네이션이 커서를 만들 때 읽는다.
+        """
+        model = queryset.model
+        ordering = [name.lstrip('-') for name in model._meta.ordering]
+        names = dict.fromkeys([*self.paths, *ordering, model._meta.pk.attname])
+        return queryset.prefetch_related(None).values(*names)
+
+    def serialize(self, rows):
+        to_dict = self.to_dict
+        return [to_dict(row) for row in rows]
+
+
+def compile_serializer(serializer, model):
+    """Serializer 인스턴스 → CompiledSerializer, 평면 Serializer 가 아니면 None
+
+    ?fields= 로 고른 필드 구성마다 한 번만 생성합니다.
+    """
+    key = (type(serializer), model, tuple(serializer.fields))
+    try:
+        return _compiled[key]
+    except KeyError:
+        compiled = _compiled[key] = _compile(serializer, model)
+        return compiled
+
+
+def _resolve(field, model):
+    """필드 → (values 경로, null 허용 관계 경로 목록, 모델 필드), 컬럼으로 읽을 수 없으면 None"""
+    if isinstance(field, (serializers.BaseSerializer, serializers.SerializerMethodField, serializers.HiddenField)):
+        return None
+    if field.source == '*':
+        return None
+    path, guards = [], []
+    for i, attr in enumerate(field.source_attrs):
+        try:
+            model_field = model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            return None
+        path.append(attr)
+        last = i == len(field.source_attrs) - 1
+        if not model_field.is_relation:
+            return ('__'.join(path), guards, model_field) if last else None
+        if not model_field.concrete or not (model_field.many_to_one or model_field.one_to_one):
+            return None
+        if last:
+            # PrimaryKeyRelatedField 는 FK 컬럼(ship_id) 값을 그대로 출력
+            if isinstance(field, PrimaryKeyRelatedField) and field.pk_field is None:
+                return '__'.join(path), guards, model_field.target_field
+            return None
+        if model_field.null:
+            guards.append('__'.join(path))
+        model = model_field.related_model
+    return None
+
+
+def _is_identity(field, model_field):
+    to_representation = type(field).to_representation
+    if isinstance(field, PrimaryKeyRelatedField):
+        return True
+    if to_representation not in IDENTITY_TYPES:
+        return False
+    internal_types = IDENTITY_TYPES[to_representation]
+    if internal_types is not None and model_field.get_internal_type() not in internal_types:
+        return False
+    if isinstance(field, fields.ChoiceField):
+        # 선택지 키가 문자열이면 choice_strings_to_values 조회 결과가 값 자신
+        return all(isinstance(value, str) for value in field.choice_strings_to_values.values())
+    return True
+
+
+def _compile(serializer, model):
+    namespace = {}
+    statements = []
+    paths = {}
+    guarded = False
+    for index, (name, field) in enumerate(serializer.fields.items()):
+        if field.write_only:
+            continue
+        resolved = _resolve(field, model)
+        if resolved is None:
+            return None
+        path, guards, model_field = resolved
+        if guards and field.default is not fields.empty:
+            return None
+        paths.update(dict.fromkeys([*guards, path]))
+
+        value = f'r[{path!r}]'
+        if not _is_identity(field, model_field):
+            # None 이면 Serializer 처럼 to_representation 을 호출하지 않는다
+            # (요청/Serializer 를 붙잡지 않도록 바인딩되지 않은 복사본의 메서드를 사용)
+            namespace[f'c{index}'] = copy.deepcopy(field).to_representation
+            value = f'None if (v := {value}) is None else c{index}(v)'
+        statements.append((name, value, guards, field.allow_null))
+        guarded = guarded or bool(guards)
+
+    if not guarded:
+        items = ', '.join(f'{name!r}: {value}' for name, value, _, _ in statements)
+        source = f'def to_dict(r):\n    return {{{items}}}\n'
+    else:
+        lines = ['def to_dict(r):', '    d = {}']
+        for name, value, guards, allow_null in statements:
+            if not guards:
+                lines.append(f'    d[{name!r}] = {value}')
+                continue
+            condition = ' and '.join(f'r[{guard!r}] is not None' for guard in guards)
+            lines.append(f'    if {condition}:')
+            lines.append(f'        d[{name!r}] = {value}')
+            if allow_null:
+                lines.append('    else:')
+                lines.append(f'        d[{name!r}] = None')
+        lines.append('    return d')
+        source = '\n'.join(lines) + '\n'
+
+    exec(compile(source, f'<{type(serializer).__name__}.to_dict>', 'exec'), namespace)
+    return CompiledSerializer(list(paths), namespace['to_dict'])
+
+
+class FastListMixin:
+    """list 응답을 평면 Serializer 이면 .values() + 컴파일한 변환 함수로 만드는 ViewSet Mixin
+
+    list 를 그대로 쓰는 다른 목록 액션(예: my_ships)에도 적용됩니다.
+    get_queryset 의 필터/범위 조건과 페이지네이션은 그대로 사용합니다.
+    """
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        compiled = compile_serializer(self.get_serializer(), queryset.model)
+        if compiled is None:
+            return super().list(request, *args, **kwargs)
+
+        rows = compiled.values(queryset)
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(compiled.serialize(page))
+        return Response(compiled.serialize(rows))
+
+    async def alist(self, request, *args, **kwargs):
+        """list 의 async ORM 버전 (ihm_backend.async_views)"""
+        queryset = self.filter_queryset(self.get_queryset())
+        compiled = compile_serializer(self.get_serializer(), queryset.model)
+        if compiled is None:
+            return await super().alist(request, *args, **kwargs)
+
+        rows = compiled.values(queryset)
+        page = await self.apaginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(compiled.serialize(page))
+        return Response(compiled.serialize([row async for row in rows]))
@@ -0,0 +1,70 @@
+"""
+희소 필드셋(?fields=)과 선택적 확장(?expand=)
+
+- ?fields=id,title,ship_info.ship_name : 응답에 포함할 필드 (GET 요청에만 적용)
+- ?expand=supplier_info.user_info      : Meta.expandable_fields 의 중첩 객체 포함
+
+중첩 Serializer 는 expand(또는 fields)로 요청할 때만 계산되며,
+ViewSet 의 조인은 ihm_backend.query_planner 가 남은 필드로부터 구성합니다.
+"""
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+
+def _split_paths(value):
+    if not value:
+        return []
+    return [path.strip().split('.') for path in value.split(',') if path.strip()]
+
+
+def requested_paths(request):
+    """요청의 ?fields=, ?expand= 를 점(.) 경로 목록으로 파싱"""
+    if request is None:
+        return [], []
+    params = request.query_params
+    return _split_paths(params.get('fields')), _split_paths(params.get('expand'))
+
+
+def _children(paths, prefix):
+    depth = len(prefix)
+    return {path[depth] for path in paths if len(path) > depth and path[:depth] == prefix}
+
+
+class DynamicFieldsMixin:
+    """?fields= / ?expand= 를 지원하는 Serializer Mixin
+
+    Meta.expandable_fields 에 나열한 중첩 필드는 요청된 경우에만 포함됩니다.
+    중첩 Serializer 에서는 점(.) 경로로 하위 필드를 지정합니다.
+    """
+
+    def _field_path(self):
+        path, node = [], self
+        while node.parent is not None:
+            if node.field_name:
+                path.append(node.field_name)
+            node = node.parent
+        return path[::-1]
+
+    def get_fields(self):
+        fields = super().get_fields()
+        request = self.context.get('request')
+        if request is None:
+            return fields
+
+        prefix = self._field_path()
+        field_paths, expand_paths = requested_paths(request)
+        selected = _children(field_paths, prefix) if request.method in SAFE_METHODS else set()
+        expanded = _children(expand_paths, prefix) | selected
+
+        expandable = getattr(self.Meta, 'expandable_fields', ())
+        for name in list(fields):
+            if name in expandable and name not in expanded:
+                del fields[name]
+            elif selected and name not in expanded:
+                del fields[name]
+        return fields
+
+
+class DynamicFieldsModelSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    """프로젝트 공통 ModelSerializer"""
+
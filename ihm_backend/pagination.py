@@ -0,0 +1,349 @@
+"""
+프로젝트 공통 페이지네이션
+
+- StandardPagination: 기본 페이지 번호 방식. ?page_size= 로 페이지 크기를 고를 수 있고
+  (max_page_size 로 상한 제한), ?count=estimate|none 으로 COUNT(*) 를 생략하거나 근사합니다.
+  조건부 조회(ihm_backend.conditional)가 이미 센 건수가 있으면 COUNT(*) 를 다시 실행하지 않습니다.
+  정렬이 없는 쿼리셋은 pk 순으로 정렬하여 페이지 크기나 count 모드와 관계없이 같은 행이 나오게 합니다.
+- KeysetPagination: (created_at, id) 기준 키셋(커서) 페이지네이션.
+  OFFSET 과 COUNT(*) 없이 인덱스 범위 검색만으로 다음/이전 페이지를 가져옵니다.
+- KeysetOptInPagination: 기본은 페이지 번호 방식이고,
+  ?pagination=cursor 또는 ?cursor=... 가 있으면 키셋 방식으로 동작합니다.
+
+async view(ihm_backend.async_views)는 같은 규칙의 apaginate_queryset 으로 건수와 페이지 행을 await 로 조회합니다.
+"""
+import base64
+import binascii
+import hashlib
+import json
+from types import SimpleNamespace
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet, ValidationError
+from django.core.paginator import EmptyPage, InvalidPage, Page, PageNotAnInteger, Paginator
+from django.db import connections
+from django.db.models import Q, QuerySet
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def estimate_count(queryset, timeout=60):
+    """COUNT(*) 근사값
+
+    필터가 없는 MySQL 테이블은 information_schema 의 통계 행 수를 사용하고,
+    그 외에는 같은 쿼리의 정확한 COUNT 결과를 timeout 초 동안 캐시합니다.
+    """
+    connection = connections[queryset.db]
+    if not queryset.query.where and connection.vendor == 'mysql':
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT TABLE_ROWS FROM information_schema.TABLES '
+                'WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s',
+                [queryset.model._meta.db_table]
+            )
+            row = cursor.fetchone()
+        if row and row[0] is not None:
+            return int(row[0])
+
+    try:
+        sql, params = queryset.order_by().query.sql_with_params()
+    except EmptyResultSet:
+        return 0
+    key = 'pagination:count:' + hashlib.md5(repr((queryset.db, sql, params)).encode()).hexdigest()
+    return cache.get_or_set(key, queryset.count, timeout)
+
+
+class CountFreePage(Page):
+    def __init__(self, object_list, number, paginator, has_next):
+        super().__init__(object_list, number, paginator)
+        self._has_next = has_next
+
+    def has_next(self):
+        return self._has_next
+
+
+class CountFreePaginator(Paginator):
+    """COUNT(*) 없이 page_size + 1 행을 읽어 다음 페이지 존재 여부를 판단"""
+
+    def __init__(self, object_list, per_page, count_func=None):
+        super().__init__(object_list, per_page)
+        self.count_func = count_func
+
+    @cached_property
+    def count(self):
+        return self.count_func() if self.count_func else None
+
+    def validate_number(self, number):
+        try:
+            if isinstance(number, float) and not number.is_integer():
+                raise ValueError
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger(self.error_messages['invalid_page'])
+        if number < 1:
+            raise EmptyPage(self.error_messages['min_page'])
+        return number
+
+    def _rows(self, number):
+        """page_size + 1 행을 읽는 쿼리셋"""
+        bottom = (number - 1) * self.per_page
+        return self.object_list[bottom:bottom + self.per_page + 1]
+
+    def _page(self, rows, number):
+        if not rows and number > 1:
+            raise EmptyPage(self.error_messages['no_results'])
+        return CountFreePage(rows[:self.per_page], number, self, has_next=len(rows) > self.per_page)
+
+    def page(self, number):
+        number = self.validate_number(number)
+        return self._page(list(self._rows(number)), number)
+
+    async def apage(self, number):
+        number = self.validate_number(number)
+        return self._page([row async for row in self._rows(number)], number)
+
+
+class StandardPagination(PageNumberPagination):
+    """프로젝트 기본 페이지네이션
+
+    ?count=exact (기본) : COUNT(*) 로 정확한 전체 건수
+    ?count=estimate     : 테이블 통계 또는 캐시된 건수 (근사값)
+    ?count=none         : 전체 건수 생략 (count 는 null)
+    """
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    count_query_param = 'count'
+    count_modes = ('exact', 'estimate', 'none')
+    count_cache_timeout = 60
+    # 조건부 조회 검증 쿼리에서 이미 센 건수
+    known_count = None
+
+    @staticmethod
+    def ordered(queryset):
+        """정렬이 없는 쿼리셋은 pk 순으로"""
+        if isinstance(queryset, QuerySet) and not queryset.ordered:
+            return queryset.order_by('pk')
+        return queryset
+
+    def get_count_mode(self, request):
+        mode = request.query_params.get(self.count_query_param)
+        return mode if mode in self.count_modes else 'exact'
+
+    def counts_rows(self, request):
+        """요청이 전체 건수를 정확히 세는 모드인지"""
+        return self.get_count_mode(request) == 'exact'
+
+    def django_paginator_class(self, object_list, per_page):
+        paginator = Paginator(object_list, per_page)
+        if self.known_count is not None:
+            paginator.count = self.known_count
+        return paginator
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self.ordered(queryset)
+        count_mode = self.get_count_mode(request)
+        if count_mode == 'exact':
+            self.known_count = getattr(view, 'conditional_count', None)
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        count_func = None
+        if count_mode == 'estimate':
+            count_func = lambda: estimate_count(queryset, self.count_cache_timeout)
+        paginator = CountFreePaginator(queryset, page_size, count_func)
+        page_number = request.query_params.get(self.page_query_param) or 1
+        try:
+            self.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            raise self._invalid_page(page_number, exc)
+        return list(self.page)
+
+    def _invalid_page(self, page_number, exc):
+        return NotFound(self.invalid_page_message.format(page_number=page_number, message=str(exc)))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """paginate_queryset 의 async ORM 버전"""
+        queryset = self.ordered(queryset)
+        self.request = request
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        count_mode = self.get_count_mode(request)
+        if count_mode == 'exact':
+            self.known_count = getattr(view, 'conditional_count', None)
+            if self.known_count is None:
+                self.known_count = await queryset.acount()
+            paginator = self.django_paginator_class(queryset, page_size)
+            page_number = self.get_page_number(request, paginator)
+            try:
+                self.page = paginator.page(page_number)
+            except InvalidPage as exc:
+                raise self._invalid_page(page_number, exc)
+            if paginator.num_pages > 1 and self.template is not None:
+                self.display_page_controls = True
+            self.page.object_list = [row async for row in self.page.object_list]
+            return list(self.page)
+
+        count_func = None
+        if count_mode == 'estimate':
+            # get_paginated_response 에서 DB 를 읽지 않도록 미리 계산
+            count = await sync_to_async(estimate_count)(queryset, self.count_cache_timeout)
+            count_func = lambda: count
+        paginator = CountFreePaginator(queryset, page_size, count_func)
+        page_number = request.query_params.get(self.page_query_param) or 1
+        try:
+            self.page = await paginator.apage(page_number)
+        except InvalidPage as exc:
+            raise self._invalid_page(page_number, exc)
+        return list(self.page)
+
+
+class KeysetPagination(BasePagination):
+    """(created_at, id) 내림차순 키셋 페이지네이션
+
+    커서는 마지막(또는 첫) 행의 키 값과 방향을 base64 로 인코딩한 불투명 문자열입니다.
+    """
+    page_size = api_settings.PAGE_SIZE
+    cursor_query_param = 'cursor'
+    keyset_fields = ('created_at', 'id')
+    invalid_cursor_message = '유효하지 않은 커서입니다.'
+
+    def get_page_size(self, request):
+        return self.page_size
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset, position, reverse = self._seek_queryset(queryset, request)
+        return self._page(list(queryset[:self.page_size + 1]), position, reverse)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """paginate_queryset 의 async ORM 버전"""
+        queryset, position, reverse = self._seek_queryset(queryset, request)
+        return self._page([row async for row in queryset[:self.page_size + 1]], position, reverse)
+
+    def _seek_queryset(self, queryset, request):
+        """커서 위치부터 키 순서로 정렬한 쿼리셋, 커서 위치, 방향"""
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.fields = [queryset.model._meta.get_field(name) for name in self.keyset_fields]
+
+        position, reverse = self.decode_cursor(request)
+
+        if reverse:
+            queryset = queryset.order_by(*self.keyset_fields)
+        else:
+            queryset = queryset.order_by(*[f'-{name}' for name in self.keyset_fields])
+        if position is not None:
+            queryset = queryset.filter(self._seek(position, reverse))
+        return queryset, position, reverse
+
+    def _page(self, results, position, reverse):
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+        if reverse:
+            results.reverse()
+
+        # 커서를 따라 이동했다면 반대 방향에는 항상 행이 존재한다
+        self.has_next = position is not None if reverse else has_more
+        self.has_previous = has_more if reverse else position is not None
+        self.page = results
+        return results
+
+    def _seek(self, position, reverse):
+        """(a, b) < (x, y) 를 a < x OR (a = x AND b < y) 형태로 전개"""
+        op = 'gt' if reverse else 'lt'
+        condition = Q()
+        for i, name in enumerate(self.keyset_fields):
+            term = Q(**{f'{name}__{op}': position[i]})
+            for prev_name, prev_value in zip(self.keyset_fields[:i], position[:i]):
+                term &= Q(**{prev_name: prev_value})
+            condition |= term
+        return condition
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')))
+            values = payload['v']
+            if len(values) != len(self.fields):
+                raise ValueError
+            position = [field.to_python(value) for field, value in zip(self.fields, values)]
+            return position, bool(payload.get('r'))
+        except (TypeError, ValueError, KeyError, binascii.Error, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, obj, reverse):
+        if isinstance(obj, dict):
+            # .values() 행 (ihm_backend.fast_list)
+            obj = SimpleNamespace(**obj)
+        payload = {'v': [field.value_to_string(obj) for field in self.fields]}
+        if reverse:
+            payload['r'] = 1
+        encoded = base64.urlsafe_b64encode(json.dumps(payload).encode('ascii')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+
+class KeysetOptInPagination(StandardPagination):
+    """페이지 번호 방식 기본, ?pagination=cursor 로 키셋 방식 선택"""
+    mode_query_param = 'pagination'
+    keyset_class = KeysetPagination
+
+    def use_keyset(self, request):
+        params = request.query_params
+        return (params.get(self.mode_query_param) == 'cursor'
+                or self.keyset_class.cursor_query_param in params)
+
+    def counts_rows(self, request):
+        return not self.use_keyset(request) and super().counts_rows(request)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        if self.use_keyset(request):
+            self.keyset = self.keyset_class()
+            self.keyset.page_size = self.get_page_size(request)
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        if self.use_keyset(request):
+            self.keyset = self.keyset_class()
+            self.keyset.page_size = self.get_page_size(request)
+            return await self.keyset.apaginate_queryset(queryset, request, view)
+        return await super().apaginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
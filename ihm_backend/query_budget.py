@@ -0,0 +1,105 @@
+"""
+ViewSet 별 SQL 쿼리 예산(query budget)
+
+각 ViewSet 은 ``query_budgets`` 에 액션별 최대 쿼리 수를 선언합니다.
+``QUERY_BUDGET_MODE`` 설정에 따라 요청마다 실행된 쿼리 수를 세고,
+예산을 넘으면 경고를 남기거나(warn) 예외를 발생시킵니다(raise).
+
+예산은 실행해 보고 나온 수가 아니라 계획한 쿼리 구성의 합으로 적습니다.
+예) 'list': AUTH + PAGE, 'approve': AUTH + 1 + 3 * workflow.TRANSITION_QUERIES + ...
+쓰기 단위의 쿼리 수는 해당 모듈에 둡니다 (workflow.TRANSITION_QUERIES, summary.RECORD_QUERIES,
+inventory.REFRESH_QUERIES). 구성이 바뀌면 예산 식을 고치고, 테스트는 raise 모드로 예산을 검사합니다.
+"""
+import logging
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+# 인증: 캐시에 없을 때 토큰 버전 조회 1회 (users.authentication.ClaimsJWTAuthentication)
+AUTH = 1
+# 페이지네이션: COUNT + 페이지 SELECT
+PAGE = 2
+
+# 트랜잭션 제어문은 세지 않는다 - 바깥 트랜잭션 안(테스트)에서만 생기는 SAVEPOINT 때문에 수가 달라지지 않도록
+TRANSACTION_CONTROL = ('SAVEPOINT', 'RELEASE SAVEPOINT', 'ROLLBACK TO SAVEPOINT')
+
+
+class QueryBudgetExceeded(AssertionError):
+    """선언된 쿼리 예산을 초과함"""
+
+
+class QueryCounter:
+    """connection.execute_wrapper 로 실행된 쿼리 수를 센다"""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        if not sql.startswith(TRANSACTION_CONTROL):
+            self.count += 1
+        return execute(sql, params, many, context)
+
+
+def _add_counter(counter):
+    # connection 은 스레드별 - 호출한 스레드(sync_to_async 의 실행 스레드)의 연결에 붙인다
+    connection.execute_wrappers.append(counter)
+
+
+def _remove_counter(counter):
+    connection.execute_wrappers.remove(counter)
+
+
+class QueryBudgetMixin:
+    """액션별 쿼리 예산을 검사하는 ViewSet Mixin
+
+    예) query_budgets = {'list': AUTH + PAGE, 'retrieve': AUTH + 1}
+    예산에는 JWT 인증의 토큰 버전 조회(AUTH)가 포함되어야 합니다.
+    """
+    query_budgets = {}
+
+    def get_query_budget(self):
+        return self.query_budgets.get(getattr(self, 'action', None))
+
+    def dispatch(self, request, *args, **kwargs):
+        mode = getattr(settings, 'QUERY_BUDGET_MODE', 'off')
+        if mode == 'off':
+            return super().dispatch(request, *args, **kwargs)
+
+        counter = QueryCounter()
+        with connection.execute_wrapper(counter):
+            response = super().dispatch(request, *args, **kwargs)
+        return self.check_query_budget(response, counter, mode)
+
+    async def adispatch(self, request, *args, **kwargs):
+        """async 조회(ihm_backend.async_views)의 쿼리 예산 검사
+
+        async ORM 과 인증 단계는 요청마다 같은 스레드(thread_sensitive sync_to_async)에서 실행되므로
+        그 스레드의 연결에 QueryCounter 를 붙였다가 뗀다.
+        """
+        mode = getattr(settings, 'QUERY_BUDGET_MODE', 'off')
+        if mode == 'off':
+            return await super().adispatch(request, *args, **kwargs)
+
+        counter = QueryCounter()
+        await sync_to_async(_add_counter)(counter)
+        try:
+            response = await super().adispatch(request, *args, **kwargs)
+        finally:
+            await sync_to_async(_remove_counter)(counter)
+        return self.check_query_budget(response, counter, mode)
+
+    def check_query_budget(self, response, counter, mode):
+        response['X-Query-Count'] = str(counter.count)
+        budget = self.get_query_budget()
+        if budget is not None and counter.count > budget:
+            message = (
+                f'{self.__class__.__name__}.{self.action}: '
+                f'{counter.count} queries (budget {budget})'
+            )
+            if mode == 'raise':
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+        return response
@@ -0,0 +1,117 @@
+"""
+Serializer 기반 쿼리 계획
+
+현재 액션의 Serializer 가 실제로 읽는 source 경로를 따라가
+select_related / prefetch_related / only() 를 자동으로 구성합니다.
+?fields= / ?expand= 로 제외된 필드는 Serializer 에 없으므로 조인도 함께 빠집니다.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.relations import RelatedField
+
+
+class QueryPlan:
+    def __init__(self):
+        self.select_related = set()
+        self.prefetch_related = {}
+        self.only = set()
+        # source 를 모델 필드로 해석할 수 없으면 어떤 컬럼이 필요한지 모르므로 only() 를 쓰지 않는다
+        self.complete = True
+
+
+def plan_serializer(serializer, model):
+    """Serializer 가 읽는 경로로부터 QueryPlan 생성"""
+    plan = QueryPlan()
+    _walk_serializer(serializer, model, '', plan)
+    return plan
+
+
+def _walk_serializer(serializer, model, prefix, plan):
+    for field in serializer.fields.values():
+        if field.write_only:
+            continue
+        if field.source == '*':
+            if isinstance(field, serializers.BaseSerializer):
+                _walk_serializer(field, model, prefix, plan)
+            else:
+                plan.complete = False
+            continue
+        _walk_source(field, model, prefix, plan)
+
+
+def _walk_source(field, model, prefix, plan):
+    attrs = field.source_attrs
+    for i, attr in enumerate(attrs):
+        try:
+            model_field = model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            plan.complete = False
+            return
+        path = prefix + attr
+        if not model_field.is_relation:
+            plan.only.add(path)
+            return
+        if model_field.one_to_many or model_field.many_to_many:
+            _plan_prefetch(field, model_field, path, plan)
+            return
+        if model_field.concrete:
+            plan.only.add(path)
+            # PrimaryKeyRelatedField 는 FK 컬럼(ship_id)만 읽으므로 조인이 필요 없다
+            if i == len(attrs) - 1 and isinstance(field, RelatedField):
+                return
+        plan.select_related.add(path)
+        model = model_field.related_model
+        prefix = path + '__'
+
+    if isinstance(field, serializers.BaseSerializer):
+        _walk_serializer(field, model, prefix, plan)
+    else:
+        # 관계 객체 자체를 문자열 등으로 출력 - 어떤 컬럼을 쓰는지 알 수 없음
+        plan.complete = False
+
+
+def _plan_prefetch(field, model_field, path, plan):
+    if not isinstance(field, serializers.ListSerializer):
+        plan.prefetch_related[path] = path
+        return
+
+    related_model = model_field.related_model
+    child_plan = plan_serializer(field.child, related_model)
+    queryset = related_model._default_manager.all()
+    if child_plan.select_related:
+        queryset = queryset.select_related(*child_plan.select_related)
+    if child_plan.complete and model_field.one_to_many:
+        # prefetch 결과를 부모에 연결하려면 역방향 FK 컬럼이 필요하다
+        queryset = queryset.only(model_field.field.name, *child_plan.only)
+    plan.prefetch_related[path] = Prefetch(path, queryset=queryset)
+
+
+class QueryPlannerMixin:
+    """현재 액션의 Serializer 로부터 쿼리셋의 조인과 컬럼 목록을 구성하는 ViewSet Mixin
+
+    get_queryset 마지막에 self.plan_queryset(queryset) 을 호출합니다.
+    Serializer 외에 액션 코드가 직접 접근하는 관계는 action_select_related 에 선언합니다.
+    """
+    action_select_related = {}
+
+    def plan_queryset(self, queryset):
+        model = queryset.model
+        plan = plan_serializer(self.get_serializer(), model)
+        extra = self.action_select_related.get(self.action, ())
+
+        select_related = plan.select_related | set(extra)
+        if select_related:
+            queryset = queryset.select_related(*sorted(select_related))
+        if plan.prefetch_related:
+            queryset = queryset.prefetch_related(*plan.prefetch_related.values())
+
+        # 쓰기 액션은 지연 로딩된 컬럼을 저장할 수 있으므로 조회 요청에서만 컬럼을 줄인다
+        if plan.complete and plan.only and not extra and self.request.method in SAFE_METHODS:
+            # 정렬 컬럼은 커서 페이지네이션이 커서를 만들 때 읽는다
+            ordering = [name.lstrip('-') for name in model._meta.ordering]
+            # ConditionalGetMixin 의 검증 컬럼은 상세 응답 후 다시 조회하지 않도록 함께 읽는다
+            validator = [self.conditional_field] if hasattr(self, 'conditional_field') else []
+            queryset = queryset.only(*plan.only, *ordering, *validator)
+        return queryset
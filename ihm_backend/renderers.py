@@ -0,0 +1,38 @@
+"""
+JSON 렌더러
+
+orjson 이 설치되어 있으면 orjson 으로, 없으면 DRF JSONRenderer(표준 json 모듈)로 직렬화합니다.
+출력은 DRF JSONRenderer 와 같습니다: UTF-8, 공백 없음, UTC 시각은 'Z',
+orjson 이 직접 처리하지 못하는 값(Decimal, 지연 번역 문자열 등)은 DRF JSONEncoder 의 규칙을 따릅니다.
+
+들여쓰기를 요청(Accept: application/json; indent=4)하거나 orjson 이 처리하지 못하는 값
+(64비트를 넘는 정수, 문자열이 아닌 dict 키 등)이 있으면 표준 렌더러로 처리합니다.
+"""
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_default = JSONEncoder().default
+
+
+class FastJSONRenderer(JSONRenderer):
+    """orjson 기반 JSONRenderer (orjson 이 없으면 JSONRenderer 와 같음)"""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if (orjson is None or self.ensure_ascii or not self.compact
+                or self.get_indent(accepted_media_type, renderer_context or {})):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, default=_default, option=orjson.OPT_UTC_Z)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # JSONRenderer 처럼 JavaScript 에서 줄바꿈으로 해석되는 문자는 이스케이프
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
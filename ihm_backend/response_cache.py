@@ -0,0 +1,206 @@
+"""
+역할 범위별 응답 캐시
+
+같은 역할 범위(운영자 전체 / 고객사 하나 / 공급업체 하나)의 사용자에게는 목록과 상세 응답이 같으므로
+(엔드포인트, 정렬한 쿼리 파라미터, 역할 범위) 를 키로 응답 데이터를 Django 캐시(CACHES)에 저장합니다.
+
+무효화는 버전 키로 합니다. 캐시 키에는 ViewSet 이 읽는 모델(cache_models)마다
+  response-cache:v:<모델>:<역할>            예) response-cache:v:declarations.declaration:customer
+  response-cache:v:<모델>:<역할:회사 ID>    예) response-cache:v:declarations.declaration:customer:12
+의 현재 값이 들어가고, 행이 저장/삭제되면 invalidate() 가 그 행이 보이는 범위의 버전만 올립니다.
+역할 전체('supplier')의 버전을 올리면 모든 공급업체의 캐시가, 'supplier:3' 이면 그 공급업체의 캐시만 무효화됩니다.
+운영자 범위는 모든 행이 보이므로 항상 무효화합니다.
+
+signal 이 발생하지 않는 bulk_create / update() 경로는 invalidate() 를 직접 호출합니다.
+locmem 캐시는 프로세스별이라 다른 워커의 무효화가 보이지 않으므로, 워커가 여럿이면 공유 캐시를 지정합니다.
+
+ConditionalGetMixin 보다 안쪽에서 동작하므로 적중해도 조건부 조회의 검증 쿼리(한 번)는 실행되고,
+If-None-Match 가 맞으면 캐시를 읽지 않고 304 를 반환합니다.
+
+적중/실패 건수는 ViewSet.액션 별로 캐시에 세며 GET /api/cache/stats/ (운영자 전용)로 조회합니다.
+"""
+import hashlib
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+KEY_PREFIX = 'response-cache'
+OPERATOR_SCOPE = 'operator'
+CACHED_METHODS = ('GET', 'HEAD')
+# 응답 캐시를 쓰는 'ViewSet.액션' 이름 (적중/실패 통계 조회용)
+ENDPOINTS = []
+_MISSING = object()
+
+
+def scope_for(user):
+    """사용자의 역할 범위 - 'operator', 'customer:<ID>', 'supplier:<ID>'"""
+    if user.user_type == 'customer':
+        return f'customer:{user.customer_id}'
+    if user.user_type == 'supplier':
+        return f'supplier:{user.supplier_id}'
+    if user.user_type == 'operator':
+        return OPERATOR_SCOPE
+    return f'user:{user.pk}'
+
+
+def _version_key(model, scope):
+    return f'{KEY_PREFIX}:v:{model._meta.label_lower}:{scope}'
+
+
+def _versions(models, scope):
+    role = scope.split(':', 1)[0]
+    keys = [_version_key(model, name) for model in models for name in dict.fromkeys((role, scope))]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            # 처음이거나 캐시에서 밀려난 버전은 이전 값과 겹치지 않도록 현재 시각에서 시작
+            cache.add(key, time.time_ns(), None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def _bump(keys):
+    for key in keys:
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), None)
+
+
+def invalidate(model, scopes=()):
+    """model 의 행이 바뀌었을 때 그 행이 보이는 범위의 응답 캐시 무효화
+
+    scopes 는 역할 전체('customer') 또는 역할:회사 ID('customer:12') 목록입니다.
+    """
+    keys = [_version_key(model, scope) for scope in {OPERATOR_SCOPE, *scopes}]
+    _bump(keys)
+    # 커밋 전에 다른 요청이 이전 데이터를 새 버전으로 저장했을 수 있으므로 커밋 후 한 번 더 올린다
+    transaction.on_commit(lambda: _bump(keys))
+
+
+def invalidate_all(model):
+    invalidate(model, ['customer', 'supplier'])
+
+
+def _stat_key(name, stat):
+    return f'{KEY_PREFIX}:stats:{name}:{stat}'
+
+
+def _count(name, stat):
+    key = _stat_key(name, stat)
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, None):
+            cache.incr(key)
+
+
+def stats():
+    """{'ViewSet.액션': {'hits', 'misses', 'hit_rate'}} - 캐시 백엔드에 저장된 누적 건수"""
+    counts = cache.get_many([_stat_key(name, stat) for name in ENDPOINTS for stat in ('hits', 'misses')])
+    result = {}
+    for name in ENDPOINTS:
+        hits = counts.get(_stat_key(name, 'hits'), 0)
+        misses = counts.get(_stat_key(name, 'misses'), 0)
+        result[name] = {
+            'hits': hits, 'misses': misses,
+            'hit_rate': round(hits / (hits + misses), 4) if hits + misses else None,
+        }
+    return result
+
+
+class ResponseCacheMixin:
+    """cache_actions 의 GET 응답을 역할 범위별로 캐시하는 ViewSet Mixin
+
+    cache_models 에는 응답에 나오는 모델을 모두 선언합니다 (기본은 queryset 의 모델).
+    list / retrieve 는 자동으로 적용되고, list 를 그대로 쓰는 목록 액션은 cache_actions 에 이름만 추가합니다.
+    그 밖의 액션은 self.cached_response(request, handler) 를 반환합니다.
+    """
+    cache_actions = ('list', 'retrieve')
+    cache_models = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        ENDPOINTS.extend(
+            name for name in (f'{cls.__name__}.{action}' for action in cls.cache_actions) if name not in ENDPOINTS
+        )
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(request, super().list, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(request, super().retrieve, *args, **kwargs)
+
+    async def alist(self, request, *args, **kwargs):
+        return await self.acached_response(request, super().alist, *args, **kwargs)
+
+    async def aretrieve(self, request, *args, **kwargs):
+        return await self.acached_response(request, super().aretrieve, *args, **kwargs)
+
+    def get_cache_key(self, request, scope):
+        models = self.cache_models or (self.queryset.model,)
+        params = sorted((name, value) for name, values in request.query_params.lists() for value in values)
+        # 페이지 링크는 절대 URL 이므로 scheme/host 도 키에 넣는다
+        raw = repr((
+            type(self).__name__, self.action, request.build_absolute_uri(request.path), params, scope,
+            _versions(models, scope),
+        ))
+        return f'{KEY_PREFIX}:{hashlib.md5(raw.encode("utf-8"), usedforsecurity=False).hexdigest()}'
+
+    def _caches(self, request):
+        timeout = settings.RESPONSE_CACHE_TIMEOUT
+        return bool(timeout) and request.method in CACHED_METHODS and self.action in self.cache_actions
+
+    def _lookup(self, request):
+        """(캐시 키, 캐시된 응답 데이터 또는 _MISSING) - 적중/실패 건수도 센다"""
+        name = f'{type(self).__name__}.{self.action}'
+        key = self.get_cache_key(request, scope_for(request.user))
+        data = cache.get(key, _MISSING)
+        _count(name, 'misses' if data is _MISSING else 'hits')
+        return key, data
+
+    def _store(self, key, response):
+        if response.status_code == 200 and isinstance(response, Response):
+            cache.set(key, response.data, settings.RESPONSE_CACHE_TIMEOUT)
+            response['X-Cache'] = 'MISS'
+        return response
+
+    def cached_response(self, request, handler, *args, **kwargs):
+        if not self._caches(request):
+            return handler(request, *args, **kwargs)
+        key, data = self._lookup(request)
+        if data is not _MISSING:
+            return _hit(data)
+        return self._store(key, handler(request, *args, **kwargs))
+
+    async def acached_response(self, request, handler, *args, **kwargs):
+        """cached_response 의 async 버전 (캐시 백엔드 접근은 스레드에서)"""
+        if not self._caches(request):
+            return await handler(request, *args, **kwargs)
+        key, data = await sync_to_async(self._lookup)(request)
+        if data is not _MISSING:
+            return _hit(data)
+        response = await handler(request, *args, **kwargs)
+        return await sync_to_async(self._store)(key, response)
+
+
+def _hit(data):
+    response = Response(data)
+    response['X-Cache'] = 'HIT'
+    return response
+
+
+class ResponseCacheStatsView(APIView):
+    """응답 캐시 적중/실패 통계 (운영자 전용)"""
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        if request.user.user_type != 'operator':
+            return Response({'detail': '운영자만 조회할 수 있습니다.'}, status=403)
+        return Response({'timeout': settings.RESPONSE_CACHE_TIMEOUT, 'endpoints': stats()})
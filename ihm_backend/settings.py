@@ -52,6 +52,8 @@ INSTALLED_APPS = [
     'users',
     'ships',
     'declarations',
+    'jobs',
+    'search',
 ]
 
 MIDDLEWARE = [
@@ -89,11 +91,24 @@ WSGI_APPLICATION = 'ihm_backend.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# 조회 엔드포인트(목록/상세/대시보드/인벤토리)를 async view 로 처리 (ihm_backend.async_views)
+# ASGI 서버로 실행할 때 켭니다. asgi.py 가 기본값을 True 로 지정하므로 WSGI 에서는 꺼진 상태로 남는다
+ASYNC_READ_VIEWS = config('ASYNC_READ_VIEWS', default=False, cast=bool)
+
+# DB 연결 유지: 스레드별 연결을 DB_CONN_MAX_AGE 초 동안 재사용 (0 이면 요청마다 연결을 열고 닫음)
+# 재사용 전에 DB_CONN_HEALTH_CHECKS 로 끊긴 연결(MySQL wait_timeout, 서버 재시작)을 확인해 다시 연결한다
+# 워커당 연결 수는 gunicorn 스레드 수와 같다 (gunicorn.conf.py).
+# ASGI 는 요청마다 다른 스레드에서 ORM 을 실행해 연결이 쌓이므로 기본값이 0
+DB_CONN_MAX_AGE = config('DB_CONN_MAX_AGE', default=0 if ASYNC_READ_VIEWS else 60, cast=int)
+DB_CONN_HEALTH_CHECKS = config('DB_CONN_HEALTH_CHECKS', default=True, cast=bool)
+
 # Railway MySQL Database
 DATABASE_URL = config('DATABASE_URL', default='')
 if DATABASE_URL:
     DATABASES = {
-        'default': dj_database_url.parse(DATABASE_URL)
+        'default': dj_database_url.parse(
+            DATABASE_URL, conn_max_age=DB_CONN_MAX_AGE, conn_health_checks=DB_CONN_HEALTH_CHECKS
+        )
     }
 else:
     # Fallback to SQLite for local development
@@ -104,6 +119,9 @@ else:
         }
     }
 
+# 테스트 실행기 - SQLite 테스트 DB 설정은 ihm_backend.testing.TestRunner 참고
+TEST_RUNNER = 'ihm_backend.testing.TestRunner'
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -156,19 +174,23 @@ AUTH_USER_MODEL = 'users.User'
 # Django REST Framework
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'users.authentication.ClaimsJWTAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        # orjson 이 설치되어 있으면 orjson 으로 렌더링 (없으면 JSONRenderer 와 같음)
+        'ihm_backend.renderers.FastJSONRenderer',
     ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'ihm_backend.pagination.StandardPagination',
     'PAGE_SIZE': 20,
 }
 
+# ViewSet 쿼리 예산 검사 (off / warn / raise)
+QUERY_BUDGET_MODE = config('QUERY_BUDGET_MODE', default='warn' if DEBUG else 'off')
+
 # Simple JWT Settings
 from datetime import timedelta
 SIMPLE_JWT = {
@@ -177,8 +199,31 @@ SIMPLE_JWT = {
     'ROTATE_REFRESH_TOKENS': True,
     'BLACKLIST_AFTER_ROTATION': True,
     'AUTH_HEADER_TYPES': ('Bearer',),
+    'TOKEN_OBTAIN_SERIALIZER': 'users.authentication.ClaimsTokenObtainPairSerializer',
+    'TOKEN_REFRESH_SERIALIZER': 'users.authentication.ClaimsTokenRefreshSerializer',
+    'TOKEN_USER_CLASS': 'users.authentication.ClaimsUser',
+}
+
+# 캐시 - 기본은 프로세스별 메모리(locmem). 여러 워커/서버가 응답 캐시와 무효화 버전을 공유하려면
+# CACHE_BACKEND=django.core.cache.backends.redis.RedisCache, CACHE_LOCATION=redis://... 처럼 공유 캐시를 지정
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default=''),
+    }
 }
 
+# 역할 범위별 응답 캐시 보관 시간(초), 0 이면 사용하지 않음 (ihm_backend.response_cache)
+RESPONSE_CACHE_TIMEOUT = config('RESPONSE_CACHE_TIMEOUT', default=60, cast=int)
+
+# 토큰 버전 캐시 시간(초). 프로세스별 캐시(LocMem)에서는 다른 워커의 폐기가 이 시간 안에 반영된다
+TOKEN_VERSION_CACHE_TIMEOUT = config('TOKEN_VERSION_CACHE_TIMEOUT', default=30, cast=int)
+
+# 백그라운드 작업 큐 (run_worker): 대기 작업이 없을 때 다시 확인하는 간격(초),
+# 이 시간(초)이 지나도록 running 인 작업은 워커가 죽은 것으로 보고 다시 대기시킨다
+JOB_POLL_INTERVAL = config('JOB_POLL_INTERVAL', default=2, cast=float)
+JOB_LOCK_TIMEOUT = config('JOB_LOCK_TIMEOUT', default=1800, cast=int)
+
 # CORS settings for frontend integration
 CORS_ALLOWED_ORIGINS = config(
     'CORS_ALLOWED_ORIGINS',
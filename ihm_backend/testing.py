@@ -0,0 +1,177 @@
+"""
+테스트용 데이터 생성 헬퍼와 쿼리 수 검사 Mixin
+"""
+import itertools
+from datetime import date
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection, connections
+from django.test import override_settings
+from django.test.runner import DiscoverRunner
+from django.test.utils import CaptureQueriesContext
+
+from users.authentication import ClaimsTokenObtainPairSerializer, ClaimsUser
+from users.models import Customer, Supplier
+from ships.models import Ship
+from declarations.models import PurchaseOrder, DeclarationRequest, Declaration, HazardousMaterial
+from declarations.substances import cas_check_digit
+
+User = get_user_model()
+
+_seq = itertools.count(1)
+
+
+class TestRunner(DiscoverRunner):
+    """SQLite 테스트 DB 를 파일로 만들어 여러 스레드가 각자 연결을 열 수 있게 하는 테스트 실행기
+
+    동시성 테스트(declarations.tests.ConcurrentTransitionTests)는 스레드마다 연결을 쓰므로 메모리 DB(연결 하나)로는
+    실행할 수 없습니다. 읽고 나서 쓰는 트랜잭션이 동시에 잠금을 올리다 바로 'database is locked' 로 실패하지 않도록
+    시작할 때 쓰기 잠금을 잡고(IMMEDIATE) 다른 쓰기가 끝나기를 timeout 초까지 기다립니다.
+    개발/운영 DB 설정은 바꾸지 않으며, TEST NAME 이나 OPTIONS 를 직접 지정했으면 그대로 둡니다.
+    """
+
+    SQLITE_OPTIONS = {'transaction_mode': 'IMMEDIATE', 'timeout': 20}
+
+    def setup_databases(self, **kwargs):
+        for alias in connections:
+            settings_dict = connections[alias].settings_dict
+            if connections[alias].vendor != 'sqlite':
+                continue
+            if not settings_dict['TEST'].get('NAME'):
+                name = 'test_db.sqlite3' if alias == 'default' else f'test_db_{alias}.sqlite3'
+                settings_dict['TEST']['NAME'] = settings.BASE_DIR / name
+            for key, value in self.SQLITE_OPTIONS.items():
+                settings_dict['OPTIONS'].setdefault(key, value)
+        return super().setup_databases(**kwargs)
+
+
+def make_cas(n):
+    """검증 숫자가 맞는 CAS 번호 (n-00-?)"""
+    return f'{n}-00-{cas_check_digit(f"{n}00")}'
+
+
+def make_user(user_type, password=None, **kwargs):
+    n = next(_seq)
+    kwargs.setdefault('username', f'{user_type}{n}')
+    return User.objects.create_user(password=password, user_type=user_type, **kwargs)
+
+
+def make_customer(user=None):
+    n = next(_seq)
+    user = user or make_user('customer')
+    return Customer.objects.create(
+        user=user, company_name=f'Customer {n}', business_number=f'C-{n}',
+        contact_person='담당자', contact_phone='010-0000-0000',
+        contact_email=f'customer{n}@example.com'
+    )
+
+
+def make_supplier(user=None):
+    n = next(_seq)
+    user = user or make_user('supplier')
+    return Supplier.objects.create(
+        user=user, company_name=f'Supplier {n}', business_number=f'S-{n}',
+        contact_person='담당자', contact_phone='010-0000-0000',
+        contact_email=f'supplier{n}@example.com'
+    )
+
+
+def make_ship(customer, **kwargs):
+    n = next(_seq)
+    kwargs.setdefault('ship_name', f'Ship {n}')
+    kwargs.setdefault('imo_number', f'IMO{n:07d}')
+    return Ship.objects.create(customer=customer, **kwargs)
+
+
+def make_purchase_order(ship, **kwargs):
+    n = next(_seq)
+    kwargs.setdefault('order_number', f'PO-{n}')
+    kwargs.setdefault('title', f'Order {n}')
+    kwargs.setdefault('order_date', date(2025, 1, 1))
+    return PurchaseOrder.objects.create(ship=ship, **kwargs)
+
+
+def make_declaration_request(purchase_order, supplier, **kwargs):
+    return DeclarationRequest.objects.create(
+        purchase_order=purchase_order, supplier=supplier, **kwargs
+    )
+
+
+def make_declaration(declaration_request, hazmat_count=0, **kwargs):
+    n = next(_seq)
+    kwargs.setdefault('declaration_number', f'MD-{n}')
+    kwargs.setdefault('declaration_type', 'MD')
+    kwargs.setdefault('status', 'submitted')
+    declaration = Declaration.objects.create(
+        declaration_request=declaration_request,
+        supplier=declaration_request.supplier,
+        ship=declaration_request.purchase_order.ship,
+        **kwargs
+    )
+    for i in range(hazmat_count):
+        HazardousMaterial.objects.create(
+            declaration=declaration, material_name=f'Material {i}',
+            cas_number=make_cas(1000 + i), content_percentage='0.05'
+        )
+    return declaration
+
+
+def make_declaration_chain(ship, supplier, hazmat_count=0, request_status='submitted', **kwargs):
+    """PurchaseOrder → DeclarationRequest → Declaration 을 한 번에 생성"""
+    purchase_order = make_purchase_order(ship, status='requested')
+    declaration_request = make_declaration_request(purchase_order, supplier, status=request_status)
+    return make_declaration(declaration_request, hazmat_count=hazmat_count, **kwargs)
+
+
+def token_user(user):
+    """user 로 발급한 access 토큰의 클레임으로 만든 요청 사용자 (force_authenticate 용)"""
+    return ClaimsUser(ClaimsTokenObtainPairSerializer.get_token(user).access_token)
+
+
+class QueryCountTestMixin:
+    """행 수(N, 10N)에 따라 쿼리 수가 늘어나는지 검사하는 Mixin
+
+    QUERY_BUDGET_MODE='raise' 로 실행되므로 ViewSet 에 선언된 예산을 넘으면
+    요청 자체가 QueryBudgetExceeded 로 실패합니다.
+    행을 bulk_create 로 추가하고 같은 URL 을 다시 조회하므로 응답 캐시는 끄고 실행합니다.
+    """
+    scale = 2
+
+    def setUp(self):
+        super().setUp()
+        budget_mode = override_settings(QUERY_BUDGET_MODE='raise', RESPONSE_CACHE_TIMEOUT=0)
+        budget_mode.enable()
+        self.addCleanup(budget_mode.disable)
+
+    def count_queries(self, url, **params):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return len(ctx.captured_queries)
+
+    def assertQueryCountStable(self, url, seed, **params):
+        """seed(n) 으로 n 개의 행을 추가하며 N, 10N 에서 쿼리 수가 같은지 확인"""
+        seed(self.scale)
+        small = self.count_queries(url, **params)
+        seed(self.scale * 9)
+        large = self.count_queries(url, **params)
+        self.assertEqual(
+            small, large,
+            f'{url}: {small} queries for N={self.scale}, {large} for N={self.scale * 10}'
+        )
+        return large
+
+    def budget_request(self, user, method, url, data=None):
+        """실제 Bearer 토큰으로 요청 - 토큰 버전 캐시를 비워 인증 쿼리(AUTH)까지 예산에 포함해 검사
+
+        raise 모드이므로 예산을 넘으면 QueryBudgetExceeded 로 테스트가 실패합니다.
+        """
+        cache.clear()
+        user.refresh_from_db()
+        token = ClaimsTokenObtainPairSerializer.get_token(user).access_token
+        response = getattr(self.client, method)(url, data, format='json', headers={'authorization': f'Bearer {token}'})
+        self.assertLess(response.status_code, 300, response.content)
+        self.assertIn('X-Query-Count', response)
+        return response
@@ -17,6 +17,7 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path, include
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
+from .response_cache import ResponseCacheStatsView
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -29,4 +30,9 @@ urlpatterns = [
     path('api/', include('users.urls')),
     path('api/', include('ships.urls')),
     path('api/', include('declarations.urls')),
+    path('api/', include('jobs.urls')),
+    path('api/', include('search.urls')),
+    
+    # 응답 캐시 적중/실패 통계
+    path('api/cache/stats/', ResponseCacheStatsView.as_view(), name='response_cache_stats'),
 ]
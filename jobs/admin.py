@@ -0,0 +1,12 @@
+from django.contrib import admin
+from .models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    """백그라운드 작업 관리"""
+    list_display = ['id', 'job_type', 'status', 'priority', 'attempts', 'max_attempts', 'run_after', 'locked_by', 'created_at', 'finished_at']
+    list_filter = ['status', 'job_type', 'created_at']
+    search_fields = ['job_type', 'locked_by', 'last_error']
+    readonly_fields = ['attempts', 'locked_by', 'locked_at', 'result', 'last_error', 'created_by', 'created_at', 'finished_at']
+    ordering = ['-created_at']
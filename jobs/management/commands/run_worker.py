@@ -0,0 +1,55 @@
+"""
+Django management command that runs background jobs from the jobs table
+Usage: python manage.py run_worker [--processes 2] [--types ship_report,...] [--burst] [--max-jobs 100] [--poll-interval 2]
+"""
+import multiprocessing
+import signal
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+from jobs import worker
+
+
+class Command(BaseCommand):
+    help = 'Claim and run queued jobs (SELECT ... FOR UPDATE SKIP LOCKED where the database supports it)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=1,
+                            help='Worker processes (1 = run jobs in this process)')
+        parser.add_argument('--types', type=lambda v: [s.strip() for s in v.split(',') if s.strip()],
+                            default=None, help='Comma-separated job types to run (default: all)')
+        parser.add_argument('--burst', action='store_true', help='Exit once no runnable job is left')
+        parser.add_argument('--max-jobs', type=int, default=None, help='Exit after running this many jobs per process')
+        parser.add_argument('--poll-interval', type=float, default=None,
+                            help='Seconds between polls when idle (default: JOB_POLL_INTERVAL)')
+
+    def handle(self, *args, **options):
+        kwargs = {
+            'types': options['types'],
+            'burst': options['burst'],
+            'max_jobs': options['max_jobs'],
+            'poll_interval': options['poll_interval'],
+        }
+        if options['processes'] <= 1:
+            processed = worker.run(**kwargs)
+            self.stdout.write(f'Ran {processed} jobs.')
+            return
+
+        # 자식 프로세스가 부모의 DB 연결을 이어받아 쓰지 않도록 먼저 닫는다
+        connections.close_all()
+        children = [
+            multiprocessing.Process(target=worker.run, kwargs=kwargs, name=f'run_worker-{index}')
+            for index in range(options['processes'])
+        ]
+        for child in children:
+            child.start()
+        # SIGTERM(배포 종료)은 자식에게 전달 - 자식은 실행 중인 작업을 마치고 끝난다
+        signal.signal(signal.SIGTERM, lambda signum, frame: [child.terminate() for child in children])
+        try:
+            for child in children:
+                child.join()
+        except KeyboardInterrupt:
+            # 자식도 같은 SIGINT 를 받아 실행 중인 작업을 마치고 끝난다
+            for child in children:
+                child.join()
+        self.stdout.write(f'{len(children)} worker processes exited.')
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.8 on 2026-10-18 08:36
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Job',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('job_type', models.CharField(max_length=100, verbose_name='작업 유형')),
+                ('payload', models.JSONField(blank=True, default=dict, verbose_name='인자')),
+                ('status', models.CharField(choices=[('queued', '대기'), ('running', '실행 중'), ('succeeded', '성공'), ('failed', '실패')], default='queued', max_length=20, verbose_name='상태')),
+                ('priority', models.SmallIntegerField(default=0, verbose_name='우선순위')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='시도 횟수')),
+                ('max_attempts', models.PositiveSmallIntegerField(default=3, verbose_name='최대 시도 횟수')),
+                ('run_after', models.DateTimeField(default=django.utils.timezone.now, verbose_name='실행 가능 시각')),
+                ('locked_by', models.CharField(blank=True, max_length=100, verbose_name='실행 워커')),
+                ('locked_at', models.DateTimeField(blank=True, null=True, verbose_name='가져간 시각')),
+                ('result', models.JSONField(blank=True, null=True, verbose_name='결과')),
+                ('last_error', models.TextField(blank=True, verbose_name='마지막 오류')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='생성일')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='완료일')),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='jobs', to=settings.AUTH_USER_MODEL, verbose_name='요청자')),
+            ],
+            options={
+                'verbose_name': '작업',
+                'verbose_name_plural': '작업',
+                'db_table': 'jobs',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'priority', 'run_after'], name='job_claim_idx'), models.Index(fields=['job_type', 'status'], name='job_type_status_idx')],
+            },
+        ),
+    ]
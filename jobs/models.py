@@ -0,0 +1,48 @@
+from django.db import models
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+User = get_user_model()
+
+
+class Job(models.Model):
+    """DB 작업 큐의 작업 하나
+
+    run_worker 가 (status='queued', run_after <= 현재) 인 작업을 priority 가 높은 순서로 가져가 실행합니다.
+    """
+    
+    STATUS_CHOICES = [
+        ('queued', '대기'),
+        ('running', '실행 중'),
+        ('succeeded', '성공'),
+        ('failed', '실패'),
+    ]
+    
+    job_type = models.CharField(max_length=100, verbose_name='작업 유형')
+    payload = models.JSONField(default=dict, blank=True, verbose_name='인자')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='queued', verbose_name='상태')
+    priority = models.SmallIntegerField(default=0, verbose_name='우선순위')
+    attempts = models.PositiveSmallIntegerField(default=0, verbose_name='시도 횟수')
+    max_attempts = models.PositiveSmallIntegerField(default=3, verbose_name='최대 시도 횟수')
+    run_after = models.DateTimeField(default=timezone.now, verbose_name='실행 가능 시각')
+    locked_by = models.CharField(max_length=100, blank=True, verbose_name='실행 워커')
+    locked_at = models.DateTimeField(null=True, blank=True, verbose_name='가져간 시각')
+    result = models.JSONField(null=True, blank=True, verbose_name='결과')
+    last_error = models.TextField(blank=True, verbose_name='마지막 오류')
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='jobs', verbose_name='요청자')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='생성일')
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name='완료일')
+    
+    class Meta:
+        db_table = 'jobs'
+        verbose_name = '작업'
+        verbose_name_plural = '작업'
+        ordering = ['-created_at']
+        indexes = [
+            # 워커가 다음 작업을 고르는 쿼리
+            models.Index(fields=['status', 'priority', 'run_after'], name='job_claim_idx'),
+            models.Index(fields=['job_type', 'status'], name='job_type_status_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.job_type} #{self.id} ({self.status})"
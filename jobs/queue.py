@@ -0,0 +1,204 @@
+"""
+DB 작업 큐
+
+별도 브로커 없이 jobs 테이블을 큐로 사용합니다. 로컬(SQLite)과 운영(MySQL) 모두에서 동작합니다.
+
+- enqueue(job_type, payload): 작업 등록 (웹 요청은 등록만 하고 바로 응답)
+- claim(worker_id): 실행할 작업 하나를 가져옴
+    MySQL 8 / PostgreSQL: SELECT ... FOR UPDATE SKIP LOCKED 로 다른 워커가 잠근 행은 건너뛴다.
+    SKIP LOCKED 가 없는 DB(SQLite)는 쓰기가 DB 단위로 직렬화되므로 잠금 없이 조회한다.
+    어느 쪽이든 UPDATE ... WHERE status='queued' 가 한 행만 바꾸므로 같은 작업을 두 워커가 가져가지 않는다.
+- execute(job): 등록된 함수 실행 → succeeded / 재시도 대기(queued) / failed
+- reap_stale(): JOB_LOCK_TIMEOUT 이 지나도록 running 인 작업(워커 프로세스가 죽은 경우)을 다시 대기시킴
+
+유형별 동시 실행 수(concurrency)는 가져오기 전에 running 건수로 거르고, 가져온 뒤에도 먼저 가져간
+순서로 한도 안에 드는지 확인하여 넘으면 돌려놓습니다 (동시에 가져간 워커 중 늦은 쪽이 양보).
+"""
+import logging
+import time
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from .models import Job
+from .registry import JOB_TYPES, get_job_type
+
+logger = logging.getLogger(__name__)
+
+# 재시도 대기 시간 상한(초)
+MAX_RETRY_DELAY = 3600
+# 한 번에 살펴볼 후보 작업 수 - 앞선 후보를 다른 워커가 먼저 가져가도 이어서 시도한다
+CLAIM_CANDIDATES = 10
+
+
+def enqueue(job_type, payload=None, *, priority=None, run_after=None, user=None):
+    """작업 하나 등록, Job 반환"""
+    [job] = enqueue_many(job_type, [payload or {}], priority=priority, run_after=run_after, user=user)
+    return job
+
+
+def enqueue_many(job_type, payloads, *, priority=None, run_after=None, user=None):
+    """같은 유형의 작업 여러 개를 INSERT 한 번으로 등록, Job 목록 반환
+
+    pk 를 돌려주지 않는 DB(MySQL)에서는 반환된 Job 의 pk 가 None 입니다.
+    """
+    spec = get_job_type(job_type)
+    run_after = run_after or timezone.now()
+    return Job.objects.bulk_create([
+        Job(
+            job_type=job_type, payload=payload,
+            priority=spec.priority if priority is None else priority,
+            max_attempts=spec.max_attempts, run_after=run_after,
+            created_by_id=getattr(user, 'id', None),
+        )
+        for payload in payloads
+    ])
+
+
+def _saturated_types(types):
+    """동시 실행 한도에 이른 작업 유형"""
+    limited = {name: spec.concurrency for name, spec in JOB_TYPES.items()
+               if spec.concurrency is not None and (not types or name in types)}
+    if not limited:
+        return set()
+    running = Job.objects.filter(status='running', job_type__in=limited).values('job_type').annotate(
+        count=Count('pk')
+    ).order_by()
+    return {row['job_type'] for row in running if row['count'] >= limited[row['job_type']]}
+
+
+def _within_limit(job):
+    """가져온 작업이 유형별 동시 실행 한도 안에 드는지 (먼저 가져간 작업 우선)"""
+    limit = JOB_TYPES[job.job_type].concurrency if job.job_type in JOB_TYPES else None
+    if limit is None:
+        return True
+    ahead = Job.objects.filter(job_type=job.job_type, status='running').filter(
+        Q(locked_at__lt=job.locked_at) | Q(locked_at=job.locked_at, pk__lt=job.pk)
+    ).count()
+    return ahead < limit
+
+
+def _claim_one(worker_id, candidates, now):
+    skip_locked = connection.features.has_select_for_update_skip_locked
+    with transaction.atomic():
+        if skip_locked:
+            # 다른 워커가 잠근 행은 건너뛰므로 맨 앞 한 행만 잠그면 된다
+            candidates = candidates.select_for_update(skip_locked=True)
+        for pk in candidates.values_list('pk', flat=True)[:1 if skip_locked else CLAIM_CANDIDATES]:
+            if Job.objects.filter(pk=pk, status='queued').update(
+                status='running', locked_by=worker_id, locked_at=now, attempts=F('attempts') + 1
+            ):
+                return Job.objects.get(pk=pk)
+    return None
+
+
+def claim(worker_id, types=None):
+    """실행할 작업 하나를 running 으로 바꾸고 반환, 없으면 None
+
+    types 를 주면 그 유형의 작업만 가져옵니다.
+    """
+    saturated = _saturated_types(types)
+    while True:
+        now = timezone.now()
+        candidates = Job.objects.filter(status='queued', run_after__lte=now)
+        if types:
+            candidates = candidates.filter(job_type__in=types)
+        if saturated:
+            candidates = candidates.exclude(job_type__in=saturated)
+        job = _claim_one(worker_id, candidates.order_by('-priority', 'run_after', 'pk'), now)
+        if job is None or _within_limit(job):
+            return job
+        # 동시에 가져간 다른 워커가 한도를 먼저 채웠다 - 시도 횟수를 되돌려 대기열로 돌리고 다른 유형을 찾는다
+        Job.objects.filter(pk=job.pk, status='running', locked_by=worker_id).update(
+            status='queued', locked_by='', locked_at=None, attempts=F('attempts') - 1
+        )
+        saturated.add(job.job_type)
+
+
+def retry_delay(spec, attempts):
+    """attempts 번째 실패 후 다음 시도까지 대기 시간(초)"""
+    return min(spec.retry_delay * 2 ** (attempts - 1), MAX_RETRY_DELAY)
+
+
+def _finish(job, **values):
+    """이 워커가 잡고 있는 작업만 갱신 (reap_stale 로 다른 워커에 넘어간 작업은 건드리지 않음)"""
+    return Job.objects.filter(pk=job.pk, status='running', locked_by=job.locked_by).update(
+        locked_by='', locked_at=None, **values
+    )
+
+
+def _notify_failure(job, spec):
+    if spec is None or spec.on_failure is None:
+        return
+    try:
+        spec.on_failure(job)
+    except Exception:
+        logger.exception('on_failure of job %s failed', job.pk)
+
+
+def _fail(job, spec, error):
+    """실패 기록 - 시도 횟수가 남았으면 대기 후 재시도, 아니면 failed"""
+    now = timezone.now()
+    if spec is not None and job.attempts < job.max_attempts:
+        _finish(job, status='queued', last_error=error,
+                run_after=now + timedelta(seconds=retry_delay(spec, job.attempts)))
+        return 'queued'
+    if _finish(job, status='failed', last_error=error, finished_at=now):
+        job.status, job.last_error, job.finished_at = 'failed', error, now
+        _notify_failure(job, spec)
+    return 'failed'
+
+
+def execute(job):
+    """가져온 작업 실행, 실행 후 상태(succeeded / queued / failed) 반환"""
+    spec = JOB_TYPES.get(job.job_type)
+    if spec is None:
+        return _fail(job, None, f'등록되지 않은 작업 유형입니다: {job.job_type}')
+    try:
+        result = spec.func(**job.payload)
+    except Exception:
+        logger.exception('job %s (%s) attempt %s failed', job.pk, job.job_type, job.attempts)
+        return _fail(job, spec, traceback.format_exc(limit=10))
+    _finish(job, status='succeeded', result=result, last_error='', finished_at=timezone.now())
+    return 'succeeded'
+
+
+def reap_stale(timeout=None):
+    """잠금 시간이 지난 running 작업(워커 프로세스가 죽은 경우)을 정리하고 다시 대기시킨 수를 반환
+
+    시도 횟수가 남았으면 바로 다시 대기시키고, 남지 않았으면 failed 로 기록합니다.
+    """
+    timeout = settings.JOB_LOCK_TIMEOUT if timeout is None else timeout
+    now = timezone.now()
+    stale = Job.objects.filter(status='running', locked_at__lt=now - timedelta(seconds=timeout))
+    requeued = stale.filter(attempts__lt=F('max_attempts')).update(
+        status='queued', locked_by='', locked_at=None, run_after=now,
+        last_error='작업 시간이 초과되어 다시 대기합니다.',
+    )
+    for job in stale:
+        _fail(job, JOB_TYPES.get(job.job_type), '작업 시간이 초과되었습니다.')
+    return requeued
+
+
+def work(worker_id, types=None, burst=False, max_jobs=None, poll_interval=None, should_stop=None):
+    """작업을 가져와 실행하는 반복, 실행한 작업 수 반환
+
+    burst 이면 실행할 작업이 없을 때 끝내고, 아니면 poll_interval 초마다 다시 확인합니다.
+    """
+    poll_interval = settings.JOB_POLL_INTERVAL if poll_interval is None else poll_interval
+    processed = 0
+    while not (should_stop and should_stop()) and (max_jobs is None or processed < max_jobs):
+        job = claim(worker_id, types)
+        if job is None:
+            if burst:
+                break
+            reap_stale()
+            time.sleep(poll_interval)
+            continue
+        execute(job)
+        processed += 1
+    return processed
@@ -0,0 +1,46 @@
+"""
+작업 유형 등록
+
+각 앱의 tasks.py 에서 함수를 @job 으로 등록합니다. 함수는 Job.payload 를 키워드 인자로 받고,
+반환값(JSON 직렬화 가능)은 Job.result 에 저장됩니다. 예외가 발생하면 재시도합니다.
+
+    @job('ship_report', concurrency=2, max_attempts=3)
+    def generate_ship_report(report_id):
+        ...
+
+- concurrency: 모든 워커를 통틀어 동시에 실행할 수 있는 이 유형의 작업 수 (None 이면 제한 없음)
+- max_attempts / retry_delay: 실패하면 retry_delay * 2^(시도 횟수 - 1) 초 뒤 다시 시도, max_attempts 번 실패하면 failed
+- priority: enqueue 에서 지정하지 않았을 때의 우선순위 (클수록 먼저)
+- on_failure: 마지막 시도까지 실패했을 때 Job 을 인자로 호출
+"""
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+
+@dataclass(frozen=True)
+class JobType:
+    name: str
+    func: Callable
+    concurrency: Optional[int] = None
+    max_attempts: int = 3
+    # 재시도 대기 시간(초) - 시도할 때마다 두 배로 늘어난다
+    retry_delay: float = 10
+    priority: int = 0
+    on_failure: Optional[Callable] = None
+
+
+JOB_TYPES = {}
+
+
+def job(name, **options):
+    """함수를 name 작업 유형으로 등록하는 데코레이터"""
+    def register(func):
+        if name in JOB_TYPES and JOB_TYPES[name].func is not func:
+            raise ValueError(f'job type {name!r} is already registered')
+        JOB_TYPES[name] = JobType(name=name, func=func, **options)
+        return func
+    return register
+
+
+def get_job_type(name):
+    return JOB_TYPES[name]
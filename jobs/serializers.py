@@ -0,0 +1,12 @@
+from rest_framework import serializers
+from .models import Job
+
+
+class JobSerializer(serializers.ModelSerializer):
+    """작업 상태 조회 Serializer"""
+    
+    class Meta:
+        model = Job
+        fields = ['id', 'job_type', 'status', 'priority', 'attempts', 'max_attempts', 'run_after',
+                  'result', 'last_error', 'created_at', 'finished_at']
+        read_only_fields = fields
@@ -0,0 +1,148 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from ihm_backend.testing import make_user, token_user
+from . import queue
+from .models import Job
+from .registry import JOB_TYPES, job
+
+
+class JobQueueTests(TestCase):
+    """DB 작업 큐: 우선순위, 재시도, 동시 실행 한도, 시간 초과 정리"""
+
+    def setUp(self):
+        registry = mock.patch.dict(JOB_TYPES)
+        registry.start()
+        self.addCleanup(registry.stop)
+        self.calls = []
+        self.failures = []
+
+        @job('test.echo')
+        def echo(value):
+            self.calls.append(value)
+            return {'value': value}
+
+        @job('test.flaky', max_attempts=2, retry_delay=10, on_failure=self.failures.append)
+        def flaky():
+            raise RuntimeError('boom')
+
+        @job('test.single', concurrency=1)
+        def single():
+            pass
+
+    def test_priority_and_run_after(self):
+        low = queue.enqueue('test.echo', {'value': 'low'})
+        high = queue.enqueue('test.echo', {'value': 'high'}, priority=5)
+        queue.enqueue('test.echo', {'value': 'later'}, priority=9,
+                      run_after=timezone.now() + timedelta(hours=1))
+
+        self.assertEqual(queue.claim('w1').pk, high.pk)
+        claimed = queue.claim('w1')
+        self.assertEqual(claimed.pk, low.pk)
+        self.assertEqual((claimed.status, claimed.attempts, claimed.locked_by), ('running', 1, 'w1'))
+        self.assertIsNone(queue.claim('w1'))
+
+        self.assertEqual(queue.execute(claimed), 'succeeded')
+        claimed.refresh_from_db()
+        self.assertEqual((claimed.status, claimed.result, claimed.locked_by), ('succeeded', {'value': 'low'}, ''))
+
+    def test_retry_with_backoff_then_fail(self):
+        failing = queue.enqueue('test.flaky')
+        before = timezone.now()
+        with self.assertLogs('jobs.queue', 'ERROR'):
+            self.assertEqual(queue.execute(queue.claim('w1')), 'queued')
+        failing.refresh_from_db()
+        self.assertEqual((failing.status, failing.attempts), ('queued', 1))
+        self.assertIn('RuntimeError: boom', failing.last_error)
+        self.assertGreaterEqual(failing.run_after, before + timedelta(seconds=10))
+        self.assertIsNone(queue.claim('w1'))  # 대기 시간 전에는 가져가지 않음
+
+        Job.objects.filter(pk=failing.pk).update(run_after=timezone.now())
+        with self.assertLogs('jobs.queue', 'ERROR'):
+            self.assertEqual(queue.execute(queue.claim('w1')), 'failed')
+        failing.refresh_from_db()
+        self.assertEqual((failing.status, failing.attempts), ('failed', 2))
+        self.assertEqual([j.pk for j in self.failures], [failing.pk])
+
+        self.assertEqual(queue.retry_delay(JOB_TYPES['test.flaky'], 3), 40)
+        self.assertEqual(queue.retry_delay(JOB_TYPES['test.flaky'], 30), queue.MAX_RETRY_DELAY)
+
+    def test_concurrency_limit_per_type(self):
+        queue.enqueue_many('test.single', [{}, {}], priority=5)
+        echo = queue.enqueue('test.echo', {'value': 1})
+
+        first = queue.claim('w1')
+        self.assertEqual(first.job_type, 'test.single')
+        self.assertEqual(queue.claim('w2').pk, echo.pk)  # 한도에 이른 유형은 건너뜀
+        self.assertIsNone(queue.claim('w2'))
+
+        queue.execute(first)
+        self.assertEqual(queue.claim('w2').job_type, 'test.single')
+
+    def test_claim_yields_when_limit_taken_concurrently(self):
+        queue.enqueue_many('test.single', [{}, {}])
+        first = queue.claim('w1')
+        # 두 워커가 같은 시점에 running 건수를 읽어 한도 검사를 통과한 경우
+        with mock.patch.object(queue, '_saturated_types', return_value=set()):
+            self.assertIsNone(queue.claim('w2'))
+        self.assertEqual(Job.objects.filter(status='running').get().pk, first.pk)
+        self.assertEqual(list(Job.objects.filter(status='queued').values_list('attempts', flat=True)), [0])
+
+    def test_reap_stale(self):
+        queue.enqueue_many('test.flaky', [{}, {}])
+        retried, exhausted = queue.claim('w1'), queue.claim('w1')
+        Job.objects.filter(pk=exhausted.pk).update(attempts=2)
+        Job.objects.update(locked_at=timezone.now() - timedelta(hours=1))
+
+        self.assertEqual(queue.reap_stale(timeout=60), 1)
+        self.assertEqual(Job.objects.get(pk=retried.pk).status, 'queued')
+        self.assertEqual(Job.objects.get(pk=exhausted.pk).status, 'failed')
+        self.assertEqual([j.pk for j in self.failures], [exhausted.pk])
+
+        # 시간 초과로 넘어간 작업의 결과는 원래 워커가 덮어쓰지 않는다
+        with self.assertLogs('jobs.queue', 'ERROR'):
+            queue.execute(retried)
+        self.assertEqual(Job.objects.get(pk=retried.pk).status, 'queued')
+
+    def test_run_worker_burst(self):
+        queue.enqueue_many('test.echo', [{'value': n} for n in range(3)])
+        Job.objects.create(job_type='unknown.type')
+        out = StringIO()
+        call_command('run_worker', '--burst', '--types', 'test.echo', stdout=out)
+        self.assertEqual(sorted(self.calls), [0, 1, 2])
+        self.assertIn('Ran 3 jobs', out.getvalue())
+        self.assertEqual(Job.objects.get(job_type='unknown.type').status, 'queued')
+
+        call_command('run_worker', '--burst', stdout=StringIO())
+        unknown = Job.objects.get(job_type='unknown.type')
+        self.assertEqual(unknown.status, 'failed')
+        self.assertIn('unknown.type', unknown.last_error)
+
+
+class JobStatusAPITests(APITestCase):
+    """/api/jobs/{id}/ 상태 조회와 범위"""
+
+    def setUp(self):
+        self.owner = make_user('customer')
+        self.job = Job.objects.create(job_type='ship_report', payload={'report_id': 1}, created_by=self.owner)
+
+    def test_owner_and_operator_can_read(self):
+        self.client.force_authenticate(token_user(self.owner))
+        response = self.client.get(f'/api/jobs/{self.job.id}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data['job_type'], response.data['status']), ('ship_report', 'queued'))
+
+        self.client.force_authenticate(token_user(make_user('operator')))
+        self.assertEqual(self.client.get(f'/api/jobs/{self.job.id}/').status_code, 200)
+        self.assertEqual(self.client.get('/api/jobs/', {'status': 'failed'}).data['count'], 0)
+
+    def test_other_users_cannot_read(self):
+        self.client.force_authenticate(token_user(make_user('customer')))
+        self.assertEqual(self.client.get(f'/api/jobs/{self.job.id}/').status_code, 404)
+        self.assertEqual(self.client.get('/api/jobs/').data['count'], 0)
@@ -0,0 +1,26 @@
+from rest_framework import viewsets
+from rest_framework.permissions import IsAuthenticated
+from ihm_backend.query_budget import AUTH, PAGE, QueryBudgetMixin
+from .models import Job
+from .serializers import JobSerializer
+
+
+class JobViewSet(QueryBudgetMixin, viewsets.ReadOnlyModelViewSet):
+    """백그라운드 작업 상태 조회 - 운영자는 전체, 그 외에는 자신이 요청한 작업만"""
+    queryset = Job.objects.all()
+    serializer_class = JobSerializer
+    permission_classes = [IsAuthenticated]
+    query_budgets = {'list': AUTH + PAGE, 'retrieve': AUTH + 1}
+    
+    def get_queryset(self):
+        queryset = Job.objects.all()
+        
+        if self.request.user.user_type != 'operator':
+            queryset = queryset.filter(created_by_id=self.request.user.id)
+        
+        for param, field in (('status', 'status'), ('type', 'job_type')):
+            value = self.request.query_params.get(param, None)
+            if value:
+                queryset = queryset.filter(**{field: value})
+        
+        return queryset
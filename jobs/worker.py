@@ -0,0 +1,33 @@
+"""
+run_worker 의 작업 프로세스
+
+SIGTERM / SIGINT 를 받으면 실행 중인 작업을 마친 뒤 종료합니다.
+자식 프로세스(spawn)에서도 불러올 수 있도록 모델은 django.setup() 뒤에 불러옵니다.
+"""
+import os
+import signal
+import socket
+
+
+def worker_id():
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+def run(types=None, burst=False, max_jobs=None, poll_interval=None):
+    """현재 프로세스에서 작업 반복 실행, 실행한 작업 수 반환"""
+    import django
+    django.setup()
+    from .queue import work
+
+    stopping = []
+
+    def stop(signum, frame):
+        stopping.append(signum)
+
+    previous = {signum: signal.signal(signum, stop) for signum in (signal.SIGTERM, signal.SIGINT)}
+    try:
+        return work(worker_id(), types=types, burst=burst, max_jobs=max_jobs,
+                    poll_interval=poll_interval, should_stop=lambda: bool(stopping))
+    finally:
+        for signum, handler in previous.items():
+            signal.signal(signum, handler)
@@ -0,0 +1,157 @@
+"""
+통합 검색 백엔드 - DB 마다 다른 텍스트 색인을 같은 방식으로 조회
+
+- SQLite: FTS5 (search_documents_fts), 후보 문서만 rank(bm25, 0003_fts_rank 에서 설정)로 순위
+  후보는 제목/식별 번호가 맞는 최근 문서 CANDIDATES 건과 어느 열이든 맞는 최근 문서 CANDIDATES 건이므로,
+  흔한 단어로 수십만 건이 맞아도 점수 계산량이 일정하고 오래된 제목 일치가 본문 일치에 밀려나지 않습니다.
+  제목이 맞는 문서가 CANDIDATES 건보다 많으면 그중 최근 문서만 순위에 들어갑니다.
+  (제목 후보로만 뽑힌 문서의 점수는 제목/식별 번호 열의 일치만 반영)
+- MySQL: InnoDB FULLTEXT, MATCH ... AGAINST (... IN BOOLEAN MODE) 점수로 순위
+- 그 밖의 DB: 텍스트 색인 없이 icontains (개발/테스트용)
+
+검색어는 공백으로 나눈 단어마다 앞부분 일치이며, 모든 단어가 들어 있는 문서만 찾습니다.
+'PO-2024' 처럼 구분자가 있는 단어는 구분자로 나눈 구(phrase)와 구분자를 뺀 번호('po2024') 중
+하나가 맞으면 되므로, IMO 번호나 주문번호를 일부만 입력해도 찾습니다.
+
+범위 제한(role scope)은 SearchDocument queryset 의 WHERE 절을 그대로 붙여 한 쿼리로 실행합니다.
+"""
+import re
+from abc import ABC, abstractmethod
+
+from django.core.exceptions import EmptyResultSet, FullResultSet
+from django.db import connection
+from django.db.models import Q
+
+RESULT_COLUMNS = ('entity', 'object_id', 'title')
+
+
+def terms(query):
+    """검색어 → 단어별 (토큰 목록, 구분자를 뺀 값)"""
+    result = []
+    for word in query.split():
+        tokens = re.findall(r'[^\W_]+', word.casefold())
+        if tokens:
+            result.append((tokens, ''.join(tokens)))
+    return result
+
+
+class SearchBackend(ABC):
+    @abstractmethod
+    def search(self, queryset, query, limit):
+        """queryset 범위에서 query 에 맞는 문서를 점수 순으로 limit 개, [{'entity', 'object_id', 'title', 'score'}]"""
+
+    @staticmethod
+    def scope_sql(queryset):
+        """queryset 의 WHERE 절 (SQL, params) - 항상 거짓이면 None"""
+        try:
+            sql, params = queryset.query.get_compiler(using=queryset.db).compile(queryset.query.where)
+        except EmptyResultSet:
+            return None
+        except FullResultSet:
+            return '1=1', []
+        return (sql or '1=1'), list(params)
+
+    @staticmethod
+    def rows(cursor):
+        return [dict(zip((*RESULT_COLUMNS, 'score'), row)) for row in cursor.fetchall()]
+
+
+class SQLiteFTS5Backend(SearchBackend):
+    # 점수를 매길 후보 수 (제목/식별 번호 일치, 전체 일치 각각) - 최대 limit(50)의 두 배
+    CANDIDATES = 100
+    PRIORITY_COLUMNS = '{title keywords}'
+
+    @staticmethod
+    def match_expression(query):
+        def phrase(text):
+            return '"' + text.replace('"', '""') + '"*'
+
+        parts = []
+        for tokens, compacted in terms(query):
+            alternatives = [phrase(' '.join(tokens))]
+            if len(tokens) > 1:
+                alternatives.append(phrase(compacted))
+            parts.append('(' + ' OR '.join(alternatives) + ')')
+        return ' AND '.join(parts)
+
+    def search(self, queryset, query, limit):
+        expression = self.match_expression(query)
+        scope = self.scope_sql(queryset)
+        if not expression or scope is None:
+            return []
+        where, params = scope
+        columns = ', '.join(f'search_documents.{column}' for column in RESULT_COLUMNS)
+        # FTS5 는 rowid 역순으로 일치 문서를 차례로 내주므로 각 후보 쿼리는 CANDIDATES 건에서 멈춘다
+        candidates = (
+            f'SELECT * FROM (SELECT search_documents.id, {columns}, -search_documents_fts.rank AS score '
+            f'FROM search_documents_fts JOIN search_documents ON search_documents.id = search_documents_fts.rowid '
+            f'WHERE search_documents_fts MATCH %s AND ({where}) '
+            f'ORDER BY search_documents_fts.rowid DESC LIMIT %s)'
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT {", ".join(RESULT_COLUMNS)}, MAX(score) AS score '
+                f'FROM ({candidates} UNION ALL {candidates}) '
+                f'GROUP BY id ORDER BY score DESC, id DESC LIMIT %s',
+                [f'{self.PRIORITY_COLUMNS} : ({expression})', *params, self.CANDIDATES,
+                 expression, *params, self.CANDIDATES, limit],
+            )
+            return self.rows(cursor)
+
+
+class MySQLFullTextBackend(SearchBackend):
+    MATCH = 'MATCH(search_documents.title, search_documents.keywords, search_documents.body) AGAINST (%s IN BOOLEAN MODE)'
+
+    @staticmethod
+    def match_expression(query):
+        parts = []
+        for tokens, compacted in terms(query):
+            if len(tokens) == 1:
+                parts.append(f'+{compacted}*')
+            else:
+                parts.append(f'+({compacted}* "{" ".join(tokens)}")')
+        return ' '.join(parts)
+
+    def search(self, queryset, query, limit):
+        expression = self.match_expression(query)
+        scope = self.scope_sql(queryset)
+        if not expression or scope is None:
+            return []
+        where, params = scope
+        columns = ', '.join(f'search_documents.{column}' for column in RESULT_COLUMNS)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT {columns}, {self.MATCH} AS score FROM search_documents '
+                f'WHERE {self.MATCH} AND ({where}) ORDER BY score DESC LIMIT %s',
+                [expression, expression, *params, limit],
+            )
+            return self.rows(cursor)
+
+
+class BasicBackend(SearchBackend):
+    """텍스트 색인이 없는 DB - 순위 없이 최근 색인 순"""
+
+    def search(self, queryset, query, limit):
+        for tokens, compacted in terms(query):
+            word = Q()
+            for token in tokens:
+                word &= Q(title__icontains=token) | Q(body__icontains=token) | Q(keywords__icontains=token)
+            queryset = queryset.filter(word | Q(keywords__icontains=compacted))
+        if not terms(query):
+            return []
+        rows = queryset.order_by('-updated_at').values(*RESULT_COLUMNS)[:limit]
+        return [dict(row, score=0.0) for row in rows]
+
+
+BACKENDS = {
+    'sqlite': SQLiteFTS5Backend,
+    'mysql': MySQLFullTextBackend,
+}
+
+
+def get_backend():
+    return BACKENDS.get(connection.vendor, BasicBackend)()
+
+
+def search(queryset, query, limit=20):
+    return get_backend().search(queryset, query, limit)
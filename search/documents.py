@@ -0,0 +1,145 @@
+"""
+검색 색인 문서 작성과 갱신
+
+ENTITIES 의 모델마다 행을 SearchDocument 로 바꾸는 함수를 정의합니다.
+저장/삭제 시에는 search.signals 가, signal 이 발생하지 않는 bulk_create 경로에서는 호출하는 쪽이
+index_objects 를 직접 부릅니다. 처음 배포할 때나 어긋났을 때는 rebuild_search_index 로 다시 만듭니다.
+"""
+import re
+from dataclasses import dataclass
+from typing import Callable
+
+from declarations.models import Declaration, PurchaseOrder, Substance
+from ships.models import Ship
+from .models import SearchDocument
+
+INDEX_BATCH_SIZE = 500
+
+
+def compact(*values):
+    """번호류를 소문자·구분자 없이 붙여 쓴 값 (예: 'PO-2024-001' → 'po2024001')"""
+    return ' '.join(filter(None, (re.sub(r'[\W_]+', '', str(value or '')).casefold() for value in values)))
+
+
+def _text(*values):
+    return ' '.join(str(value) for value in values if value not in (None, ''))
+
+
+def _ship(ship):
+    # 'IMO 1234567' / '1234567' 어느 쪽으로 저장·검색해도 맞도록 숫자만, 'imo' 를 붙인 값 둘 다
+    number = re.sub(r'^imo', '', compact(ship.imo_number))
+    return {
+        'title': ship.ship_name,
+        'keywords': compact(number, f'IMO{number}'),
+        'body': _text(ship.imo_number, ship.ship_type),
+        'customer_id': ship.customer_id,
+        'ship_id': ship.pk,
+    }
+
+
+def _purchase_order(po):
+    return {
+        'title': _text(po.order_number, po.title),
+        'keywords': compact(po.order_number),
+        'body': _text(po.item_name, po.description, po.item_description),
+        'customer_id': po.customer_id,
+        'ship_id': po.ship_id,
+    }
+
+
+def _declaration(declaration):
+    return {
+        'title': _text(declaration.declaration_number, declaration.title),
+        'keywords': compact(declaration.declaration_number, declaration.model_number),
+        'body': _text(declaration.item_name, declaration.manufacturer, declaration.model_number),
+        'customer_id': declaration.customer_id,
+        'supplier_id': declaration.supplier_id,
+        'ship_id': declaration.ship_id,
+    }
+
+
+def _substance(substance):
+    return {
+        'title': substance.name,
+        'keywords': compact(substance.cas_number),
+        'body': _text(substance.cas_number, *(substance.synonyms or [])),
+    }
+
+
+@dataclass(frozen=True)
+class Entity:
+    model: type
+    build: Callable
+    # build 가 읽는 필드 - save(update_fields=...) 가 이 필드를 건드리지 않으면 다시 색인하지 않는다
+    fields: frozenset
+
+
+ENTITIES = {
+    'ship': Entity(Ship, _ship, frozenset({'ship_name', 'imo_number', 'ship_type', 'customer'})),
+    'purchase_order': Entity(PurchaseOrder, _purchase_order, frozenset({
+        'order_number', 'title', 'item_name', 'description', 'item_description', 'customer', 'ship',
+    })),
+    'declaration': Entity(Declaration, _declaration, frozenset({
+        'declaration_number', 'title', 'model_number', 'item_name', 'manufacturer', 'customer', 'supplier', 'ship',
+    })),
+    'substance': Entity(Substance, _substance, frozenset({'name', 'cas_number', 'synonyms'})),
+}
+MODEL_ENTITIES = {entity.model: name for name, entity in ENTITIES.items()}
+
+_FIELD_LIMITS = {'title': 300, 'keywords': 500}
+
+
+def _document(name, obj):
+    values = {
+        'title': '', 'keywords': '', 'body': '', 'customer_id': None, 'supplier_id': None, 'ship_id': None,
+        **ENTITIES[name].build(obj),
+    }
+    for field, limit in _FIELD_LIMITS.items():
+        values[field] = values[field][:limit]
+    return SearchDocument(entity=name, object_id=obj.pk, **values)
+
+
+def index_objects(objs, created=False):
+    """같은 모델의 행들을 색인에 추가/갱신 (조회 한 번 + bulk_create / bulk_update)
+
+    created 이면 방금 만든 행이므로 기존 문서를 조회하지 않고 추가만 합니다.
+    """
+    objs = [obj for obj in objs if obj.pk is not None]
+    if not objs:
+        return
+    name = MODEL_ENTITIES[type(objs[0])]
+    documents = [_document(name, obj) for obj in objs]
+    existing = {} if created else dict(SearchDocument.objects.filter(
+        entity=name, object_id__in=[document.object_id for document in documents]
+    ).values_list('object_id', 'pk'))
+
+    new, changed = [], []
+    for document in documents:
+        document.pk = existing.get(document.object_id)
+        (changed if document.pk else new).append(document)
+    SearchDocument.objects.bulk_create(new, batch_size=INDEX_BATCH_SIZE, ignore_conflicts=True)
+    SearchDocument.objects.bulk_update(
+        changed, ['title', 'keywords', 'body', 'customer_id', 'supplier_id', 'ship_id'], batch_size=INDEX_BATCH_SIZE
+    )
+
+
+def remove_objects(model, pks):
+    SearchDocument.objects.filter(entity=MODEL_ENTITIES[model], object_id__in=list(pks)).delete()
+
+
+def rebuild(chunk_size=INDEX_BATCH_SIZE):
+    """모든 대상 행을 pk 순서로 chunk_size 개씩 다시 색인하고, 원본이 없어진 문서는 삭제. 색인한 행 수 반환"""
+    indexed = 0
+    for name, entity in ENTITIES.items():
+        last_pk = 0
+        while True:
+            chunk = list(entity.model.objects.filter(pk__gt=last_pk).order_by('pk')[:chunk_size])
+            if not chunk:
+                break
+            index_objects(chunk)
+            indexed += len(chunk)
+            last_pk = chunk[-1].pk
+        SearchDocument.objects.filter(entity=name).exclude(
+            object_id__in=entity.model.objects.values('pk')
+        ).delete()
+    return indexed
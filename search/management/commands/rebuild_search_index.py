@@ -0,0 +1,17 @@
+"""
+Django management command that rebuilds the full-text search index
+Usage: python manage.py rebuild_search_index [--chunk-size 500]
+"""
+from django.core.management.base import BaseCommand
+from search.documents import rebuild
+
+
+class Command(BaseCommand):
+    help = 'Re-index ships, purchase orders, declarations and substances into search_documents'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=500, help='Rows per batch')
+
+    def handle(self, *args, **options):
+        indexed = rebuild(chunk_size=options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(f'Indexed {indexed} rows.'))
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.8 on 2026-10-18 08:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('entity', models.CharField(choices=[('ship', '선박'), ('purchase_order', '구매 주문'), ('declaration', '신고서'), ('substance', '물질')], max_length=20, verbose_name='대상')),
+                ('object_id', models.PositiveBigIntegerField(verbose_name='대상 ID')),
+                ('title', models.CharField(max_length=300, verbose_name='제목')),
+                ('keywords', models.CharField(blank=True, max_length=500, verbose_name='식별 번호')),
+                ('body', models.TextField(blank=True, verbose_name='본문')),
+                ('customer_id', models.PositiveBigIntegerField(blank=True, null=True, verbose_name='고객사 ID')),
+                ('supplier_id', models.PositiveBigIntegerField(blank=True, null=True, verbose_name='공급업체 ID')),
+                ('ship_id', models.PositiveBigIntegerField(blank=True, db_index=True, null=True, verbose_name='선박 ID')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='색인일')),
+            ],
+            options={
+                'verbose_name': '검색 문서',
+                'verbose_name_plural': '검색 문서',
+                'db_table': 'search_documents',
+                'indexes': [models.Index(fields=['customer_id', 'entity'], name='search_doc_customer_idx'), models.Index(fields=['supplier_id', 'entity'], name='search_doc_supplier_idx')],
+                'constraints': [models.UniqueConstraint(fields=('entity', 'object_id'), name='search_document_unique')],
+            },
+        ),
+    ]
@@ -0,0 +1,49 @@
+from django.db import migrations
+
+SQLITE_CREATE = [
+    # 외부 콘텐츠 FTS5 테이블 - 본문은 search_documents 에만 저장하고 트리거로 색인을 맞춘다
+    "CREATE VIRTUAL TABLE search_documents_fts USING fts5("
+    "title, keywords, body, content='search_documents', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2', prefix='2 3 4')",
+    "CREATE TRIGGER search_documents_ai AFTER INSERT ON search_documents BEGIN "
+    "INSERT INTO search_documents_fts(rowid, title, keywords, body) "
+    "VALUES (new.id, new.title, new.keywords, new.body); END",
+    "CREATE TRIGGER search_documents_ad AFTER DELETE ON search_documents BEGIN "
+    "INSERT INTO search_documents_fts(search_documents_fts, rowid, title, keywords, body) "
+    "VALUES ('delete', old.id, old.title, old.keywords, old.body); END",
+    "CREATE TRIGGER search_documents_au AFTER UPDATE OF title, keywords, body ON search_documents BEGIN "
+    "INSERT INTO search_documents_fts(search_documents_fts, rowid, title, keywords, body) "
+    "VALUES ('delete', old.id, old.title, old.keywords, old.body); "
+    "INSERT INTO search_documents_fts(rowid, title, keywords, body) "
+    "VALUES (new.id, new.title, new.keywords, new.body); END",
+]
+SQLITE_DROP = [
+    "DROP TRIGGER IF EXISTS search_documents_au",
+    "DROP TRIGGER IF EXISTS search_documents_ad",
+    "DROP TRIGGER IF EXISTS search_documents_ai",
+    "DROP TABLE IF EXISTS search_documents_fts",
+]
+MYSQL_CREATE = ["CREATE FULLTEXT INDEX search_documents_ft ON search_documents (title, keywords, body)"]
+MYSQL_DROP = ["DROP INDEX search_documents_ft ON search_documents"]
+
+
+def _run(statements_by_vendor):
+    def run(apps, schema_editor):
+        for statement in statements_by_vendor.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0001_initial'),
+    ]
+
+    operations = [
+        # 그 밖의 DB 는 텍스트 색인 없이 search.backends.BasicBackend 로 검색한다
+        migrations.RunPython(
+            _run({'sqlite': SQLITE_CREATE, 'mysql': MYSQL_CREATE}),
+            _run({'sqlite': SQLITE_DROP, 'mysql': MYSQL_DROP}),
+        ),
+    ]
@@ -0,0 +1,23 @@
+from django.db import migrations
+
+# FTS5 rank 열의 순위 함수 - title, keywords, body 열 가중치 (search.backends.SQLiteFTS5Backend 가 rank 로 조회)
+SQLITE_RANK = "INSERT INTO search_documents_fts(search_documents_fts, rank) VALUES ('rank', 'bm25(10.0, 5.0, 1.0)')"
+SQLITE_RANK_DEFAULT = "INSERT INTO search_documents_fts(search_documents_fts, rank) VALUES ('rank', 'bm25()')"
+
+
+def _run(statement):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor == 'sqlite':
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0002_text_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(_run(SQLITE_RANK), _run(SQLITE_RANK_DEFAULT)),
+    ]
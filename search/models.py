@@ -0,0 +1,43 @@
+from django.db import models
+
+
+class SearchDocument(models.Model):
+    """통합 검색 색인 문서 (검색 대상 행 하나당 한 행)
+
+    텍스트 색인은 DB 별로 migration 에서 만듭니다 - SQLite: FTS5 가상 테이블(search_documents_fts)과
+    동기화 트리거, MySQL: FULLTEXT(title, keywords, body). 조회는 search.backends 를 거칩니다.
+    customer_id / supplier_id / ship_id 는 역할별 범위 제한용으로 원본 행에서 복사한 값입니다.
+    """
+    
+    ENTITY_CHOICES = [
+        ('ship', '선박'),
+        ('purchase_order', '구매 주문'),
+        ('declaration', '신고서'),
+        ('substance', '물질'),
+    ]
+    
+    entity = models.CharField(max_length=20, choices=ENTITY_CHOICES, verbose_name='대상')
+    object_id = models.PositiveBigIntegerField(verbose_name='대상 ID')
+    title = models.CharField(max_length=300, verbose_name='제목')
+    # 번호류(IMO, 주문번호, 신고서 번호, CAS 번호)를 구분자 없이 붙여 쓴 값 - 앞부분 일치 검색용
+    keywords = models.CharField(max_length=500, blank=True, verbose_name='식별 번호')
+    body = models.TextField(blank=True, verbose_name='본문')
+    customer_id = models.PositiveBigIntegerField(null=True, blank=True, verbose_name='고객사 ID')
+    supplier_id = models.PositiveBigIntegerField(null=True, blank=True, verbose_name='공급업체 ID')
+    ship_id = models.PositiveBigIntegerField(null=True, blank=True, db_index=True, verbose_name='선박 ID')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='색인일')
+    
+    class Meta:
+        db_table = 'search_documents'
+        verbose_name = '검색 문서'
+        verbose_name_plural = '검색 문서'
+        constraints = [
+            models.UniqueConstraint(fields=['entity', 'object_id'], name='search_document_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['customer_id', 'entity'], name='search_doc_customer_idx'),
+            models.Index(fields=['supplier_id', 'entity'], name='search_doc_supplier_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.entity} #{self.object_id}: {self.title}"
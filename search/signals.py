@@ -0,0 +1,41 @@
+"""
+검색 대상 모델 저장/삭제 시 색인 갱신
+
+- 선박의 소유 고객사가 바뀌면 그 선박에 딸린 문서의 customer_id 도 바꾼다
+  (declarations.signals.sync_ship_customer 가 update() 로 바꾸는 구매 주문/신고서)
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from declarations.models import Declaration, PurchaseOrder, Substance
+from ships.models import Ship
+from . import documents
+from .models import SearchDocument
+
+
+@receiver(post_save, sender=Ship)
+@receiver(post_save, sender=PurchaseOrder)
+@receiver(post_save, sender=Declaration)
+@receiver(post_save, sender=Substance)
+def index_on_save(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    entity = documents.ENTITIES[documents.MODEL_ENTITIES[sender]]
+    if raw or (update_fields is not None and not entity.fields & set(update_fields)):
+        return
+    documents.index_objects([instance], created=created)
+
+
+@receiver(post_delete, sender=Ship)
+@receiver(post_delete, sender=PurchaseOrder)
+@receiver(post_delete, sender=Declaration)
+@receiver(post_delete, sender=Substance)
+def remove_on_delete(sender, instance, **kwargs):
+    documents.remove_objects(sender, [instance.pk])
+
+
+@receiver(post_save, sender=Ship)
+def sync_ship_customer(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if created or raw or (update_fields is not None and 'customer' not in update_fields):
+        return
+    SearchDocument.objects.filter(ship_id=instance.pk).exclude(
+        customer_id=instance.customer_id
+    ).update(customer_id=instance.customer_id)
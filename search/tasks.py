@@ -0,0 +1,10 @@
+"""
+search 앱의 백그라운드 작업 (run_worker 가 실행)
+"""
+from jobs.registry import job
+from . import documents
+
+
+@job('rebuild_search_index', concurrency=1, priority=-10)
+def rebuild_search_index(chunk_size=documents.INDEX_BATCH_SIZE):
+    return {'indexed': documents.rebuild(chunk_size=chunk_size)}
@@ -0,0 +1,134 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+
+from declarations.models import PurchaseOrder
+from ihm_backend.testing import (
+    make_user, make_customer, make_supplier, make_ship, make_purchase_order, make_declaration_chain, token_user,
+)
+from . import backends, documents
+from .models import SearchDocument
+
+
+class SearchTests(APITestCase):
+    """/api/search/ 통합 검색: 색인 갱신, 앞부분 일치, 순위, 역할별 범위"""
+
+    def setUp(self):
+        self.customer = make_customer()
+        self.supplier = make_supplier()
+        self.ship = make_ship(self.customer, ship_name='Ocean Pioneer', imo_number='9876543')
+        self.po = make_purchase_order(
+            self.ship, order_number='PO-2024-0815', title='Ballast pump', item_name='Pioneer gasket'
+        )
+        self.declaration = make_declaration_chain(
+            self.ship, self.supplier, declaration_number='MD-7781', manufacturer='Hanil Pump', model_number='HP-300'
+        )
+        other_ship = make_ship(make_customer(), ship_name='Ocean Star', imo_number='9111111')
+        make_purchase_order(other_ship, order_number='PO-2024-0900', title='Ballast valve')
+        self.operator = make_user('operator')
+
+    def search(self, user, q, **params):
+        self.client.force_authenticate(token_user(user))
+        response = self.client.get('/api/search/', {'q': q, **params})
+        self.assertEqual(response.status_code, 200, response.content)
+        return [(row['type'], row['id']) for row in response.data['results']]
+
+    def test_prefix_matching_on_identifiers(self):
+        ship = ('ship', self.ship.id)
+        self.assertEqual(self.search(self.operator, 'IMO 98765'), [ship])
+        self.assertEqual(self.search(self.operator, 'imo9876543'), [ship])
+        self.assertEqual(self.search(self.operator, '987654'), [ship])
+
+        po = ('purchase_order', self.po.id)
+        self.assertEqual(self.search(self.operator, 'PO-2024-08'), [po])
+        self.assertEqual(self.search(self.operator, 'po202408'), [po])
+        self.assertEqual(len(self.search(self.operator, 'PO-2024')), 2)
+        self.assertEqual(self.search(self.operator, 'hp-30'), [('declaration', self.declaration.id)])
+
+    def test_ranking_and_type_filter(self):
+        # 선박명(title)에 있는 단어가 구매 주문 품목명(body)에 있는 것보다 앞선다
+        self.assertEqual(
+            self.search(self.operator, 'pioneer'), [('ship', self.ship.id), ('purchase_order', self.po.id)]
+        )
+        self.assertEqual(self.search(self.operator, 'pioneer', type='purchase_order'), [('purchase_order', self.po.id)])
+        self.assertEqual(self.search(self.operator, 'ballast pioneer'), [('purchase_order', self.po.id)])
+        self.assertEqual(len(self.search(self.operator, 'ocean', limit=1)), 1)
+
+        self.client.force_authenticate(token_user(self.operator))
+        self.assertEqual(self.client.get('/api/search/').status_code, 400)
+        self.assertEqual(self.client.get('/api/search/', {'q': 'x', 'type': 'users'}).status_code, 400)
+
+    def test_ranking_covers_all_matches(self):
+        # 오래된 제목 일치가 나중에 색인된 본문 일치 수천 건 뒤로 밀려나지 않는다
+        SearchDocument.objects.bulk_create(
+            SearchDocument(entity='purchase_order', object_id=100000 + i, title=f'Order {i}', body='pioneer gasket')
+            for i in range(2000)
+        )
+        rows = backends.search(SearchDocument.objects.all(), 'pioneer', limit=1)
+        self.assertEqual([(row['entity'], row['object_id']) for row in rows], [('ship', self.ship.id)])
+
+    def test_ranking_is_bounded_to_recent_candidates(self):
+        # 후보는 최근 제목 일치 CANDIDATES 건 + 최근 일치 CANDIDATES 건 - 그보다 오래된 문서는 순위에 들지 않는다
+        newer = make_ship(self.customer, ship_name='Pioneer Two')
+        documents = SearchDocument.objects.all()
+        with mock.patch.object(backends.SQLiteFTS5Backend, 'CANDIDATES', 1):
+            rows = backends.search(documents, 'pioneer', limit=5)
+        self.assertEqual([(row['entity'], row['object_id']) for row in rows], [('ship', newer.id)])
+        with mock.patch.object(backends.SQLiteFTS5Backend, 'CANDIDATES', 2):
+            rows = backends.search(documents, 'pioneer', limit=5)
+        self.assertEqual({(row['entity'], row['object_id']) for row in rows},
+                         {('ship', newer.id), ('ship', self.ship.id), ('purchase_order', self.po.id)})
+
+    def test_role_scope(self):
+        self.assertEqual(
+            {t for t, _ in self.search(self.customer.user, 'ballast')}, {'purchase_order'}
+        )
+        self.assertEqual(self.search(self.customer.user, 'ballast'), [('purchase_order', self.po.id)])
+        self.assertEqual(self.search(make_customer().user, 'pioneer'), [])
+
+        self.assertEqual(self.search(self.supplier.user, 'MD-7781'), [('declaration', self.declaration.id)])
+        self.assertEqual(self.search(make_supplier().user, 'MD-7781'), [])
+        self.assertEqual(len(self.search(make_supplier().user, 'ballast')), 2)
+
+        documents.rebuild()  # migration 으로 넣은 물질 등록부
+        self.assertEqual([t for t, _ in self.search(self.customer.user, '7439-92-1')], ['substance'])
+
+    def test_index_follows_save_and_delete(self):
+        self.ship.ship_name = 'Northern Light'
+        self.ship.save()
+        self.assertEqual(self.search(self.operator, 'northern'), [('ship', self.ship.id)])
+        self.assertEqual(self.search(self.operator, 'pioneer', type='ship'), [])
+
+        new_owner = make_customer()
+        self.ship.customer = new_owner
+        self.ship.save()
+        self.assertEqual(self.search(new_owner.user, 'MD-7781'), [('declaration', self.declaration.id)])
+        self.assertEqual(self.search(self.customer.user, 'MD-7781'), [])
+
+        self.po.delete()
+        self.assertEqual(self.search(self.operator, 'PO-2024-08'), [])
+
+    def test_bulk_submission_is_indexed(self):
+        po = make_purchase_order(self.ship)
+        self.client.force_authenticate(token_user(self.supplier.user))
+        response = self.client.post('/api/declarations/bulk/', [
+            {'purchase_order': po.id, 'declaration_number': 'BULK-4242', 'declaration_type': 'MD'}
+        ], format='json')
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual([t for t, _ in self.search(self.operator, 'bulk-4242')], ['declaration'])
+
+    def test_single_query_and_rebuild(self):
+        self.client.force_authenticate(token_user(self.operator))
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get('/api/search/', {'q': 'ocean'})
+        self.assertEqual(len(ctx.captured_queries), 1)
+
+        PurchaseOrder.objects.filter(pk=self.po.pk).update(title='Fresh water pump')  # signal 없이 변경
+        SearchDocument.objects.create(entity='ship', object_id=999999, title='Ghost ship')
+        call_command('rebuild_search_index', '--chunk-size', '2', stdout=StringIO())
+        self.assertEqual(self.search(self.operator, 'fresh water'), [('purchase_order', self.po.id)])
+        self.assertEqual(self.search(self.operator, 'ghost'), [])
@@ -0,0 +1,66 @@
+from django.db.models import Q
+from rest_framework import viewsets
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from ihm_backend.query_budget import AUTH, QueryBudgetMixin
+from . import backends
+from .models import SearchDocument
+
+SEARCH_DEFAULT_LIMIT = 20
+SEARCH_MAX_LIMIT = 50
+ENTITIES = [entity for entity, _ in SearchDocument.ENTITY_CHOICES]
+
+
+def scope_for(user):
+    """역할별로 볼 수 있는 문서 - 각 목록 API 의 범위와 같다
+
+    운영자: 전체 / 고객사: 자신의 선박, 구매 주문, 신고서와 물질 등록부 /
+    공급업체: 선박, 구매 주문, 자신이 제출한 신고서와 물질 등록부
+    프로필이 연결되지 않은 사용자(범위 id 가 None)는 자신의 행 없이 나머지만 봅니다 (IS NULL 로 범위 밖 행이 보이지 않도록)
+    """
+    if user.user_type == 'customer':
+        if user.customer_id is None:
+            return Q(entity='substance')
+        return Q(customer_id=user.customer_id) | Q(entity='substance')
+    if user.user_type == 'supplier':
+        if user.supplier_id is None:
+            return ~Q(entity='declaration')
+        return ~Q(entity='declaration') | Q(supplier_id=user.supplier_id)
+    return Q()
+
+
+class SearchViewSet(QueryBudgetMixin, viewsets.ViewSet):
+    """통합 검색 (?q= 검색어, ?type=ship,purchase_order,declaration,substance, ?limit= 최대 50)
+
+    선박명/IMO 번호, 주문번호/제목/품목명, 신고서 번호/품목명/제조사/모델번호, 물질명/동의어/CAS 번호를
+    텍스트 색인(SQLite FTS5, MySQL FULLTEXT)으로 찾아 점수 순으로 반환합니다.
+    """
+    permission_classes = [IsAuthenticated]
+    query_budgets = {'list': AUTH + 1}
+    
+    def list(self, request):
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            raise ValidationError({'q': '검색어를 입력해주세요.'})
+        
+        types = [t for t in request.query_params.get('type', '').split(',') if t]
+        if any(t not in ENTITIES for t in types):
+            raise ValidationError({'type': f"{', '.join(ENTITIES)} 중에서 지정해주세요."})
+        try:
+            limit = min(int(request.query_params.get('limit', SEARCH_DEFAULT_LIMIT)), SEARCH_MAX_LIMIT)
+        except ValueError:
+            raise ValidationError({'limit': '숫자여야 합니다.'})
+        
+        queryset = SearchDocument.objects.filter(scope_for(request.user))
+        if types:
+            queryset = queryset.filter(entity__in=types)
+        
+        results = backends.search(queryset, query, max(limit, 1))
+        return Response({
+            'query': query,
+            'results': [
+                {'type': row['entity'], 'id': row['object_id'], 'title': row['title'], 'score': row['score']}
+                for row in results
+            ],
+        })
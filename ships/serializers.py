@@ -1,9 +1,10 @@
 from rest_framework import serializers
+from ihm_backend.fieldsets import DynamicFieldsModelSerializer
 from .models import Ship
 from users.serializers import CustomerSerializer
 
 
-class ShipSerializer(serializers.ModelSerializer):
+class ShipSerializer(DynamicFieldsModelSerializer):
     """선박 Serializer"""
     customer_info = CustomerSerializer(source='customer', read_only=True)
     
@@ -13,9 +14,10 @@ class ShipSerializer(serializers.ModelSerializer):
                   'ship_type', 'gross_tonnage', 'year_built', 'is_active',
                   'created_at', 'updated_at']
         read_only_fields = ['id', 'created_at', 'updated_at']
+        expandable_fields = ['customer_info']
 
 
-class ShipListSerializer(serializers.ModelSerializer):
+class ShipListSerializer(DynamicFieldsModelSerializer):
     """선박 목록용 간단한 Serializer"""
     customer_name = serializers.CharField(source='customer.company_name', read_only=True)
     
@@ -1,3 +1,347 @@
-from django.test import TestCase
+import warnings
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.paginator import UnorderedObjectListWarning
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+
+from ihm_backend.pagination import StandardPagination
+from ihm_backend.query_budget import AUTH, PAGE
+from declarations import inventory
+from declarations.models import HazardousMaterial, ShipInventoryItem
+from ihm_backend.testing import (
+    QueryCountTestMixin, make_user, make_customer, make_supplier, make_ship, make_declaration_chain, token_user,
+)
+from .models import Ship
+
+
+class ShipQueryCountTests(QueryCountTestMixin, APITestCase):
+    """ships 앱 ViewSet 의 N+1 회귀 테스트"""
+
+    def setUp(self):
+        super().setUp()
+        self.customer = make_customer()
+
+    def test_ship_list_operator(self):
+        self.client.force_authenticate(token_user(make_user('operator')))
+        self.assertQueryCountStable(
+            '/api/ships/', lambda n: [make_ship(make_customer()) for _ in range(n)]
+        )
+
+    def test_ship_list_customer(self):
+        self.client.force_authenticate(token_user(self.customer.user))
+        self.assertQueryCountStable(
+            '/api/ships/', lambda n: [make_ship(self.customer) for _ in range(n)]
+        )
+
+    def test_my_ships(self):
+        self.client.force_authenticate(token_user(self.customer.user))
+        self.assertQueryCountStable(
+            '/api/ships/my_ships/', lambda n: [make_ship(self.customer) for _ in range(n)]
+        )
+
+    def test_my_ships_is_paginated_and_pinned(self):
+        for _ in range(25):
+            make_ship(self.customer)
+        make_ship(make_customer())
+        self.client.force_authenticate(token_user(self.customer.user))
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/ships/my_ships/', {'page_size': 10})
+        self.assertEqual(response.data['count'], 25)
+        self.assertEqual(len(response.data['results']), 10)
+
+    def test_ship_detail(self):
+        ship = make_ship(self.customer)
+        self.client.force_authenticate(token_user(self.customer.user))
+        self.count_queries(f'/api/ships/{ship.id}/', expand='customer_info.user_info')
+
+
+class PaginationTests(APITestCase):
+    """StandardPagination: page_size 상한과 count 모드"""
+
+    def setUp(self):
+        cache.clear()
+        customer = make_customer()
+        Ship.objects.bulk_create(
+            Ship(customer=customer, ship_name=f'Ship {i}', imo_number=f'IMO-P{i}') for i in range(120)
+        )
+        self.client.force_authenticate(token_user(make_user('operator')))
+
+    def get(self, **params):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/api/ships/', params)
+        self.assertEqual(response.status_code, 200)
+        counted = any('COUNT(' in q['sql'] for q in ctx.captured_queries)
+        return response.data, counted
+
+    def test_page_size_is_honored_and_capped(self):
+        data, _ = self.get(page_size=7)
+        self.assertEqual(len(data['results']), 7)
+        self.assertEqual(data['count'], 120)
+
+        data, _ = self.get(page_size=10000)
+        self.assertEqual(len(data['results']), StandardPagination.max_page_size)
+
+    def test_count_none_skips_count_query(self):
+        data, counted = self.get(count='none', page_size=50, page=2)
+        self.assertFalse(counted)
+        self.assertIsNone(data['count'])
+        self.assertEqual(len(data['results']), 50)
+        self.assertIn('page=3', data['next'])
+
+        data, _ = self.get(count='none', page_size=50, page=3)
+        self.assertEqual(len(data['results']), 20)
+        self.assertIsNone(data['next'])
+
+        response = self.client.get('/api/ships/', {'count': 'none', 'page_size': 50, 'page': 4})
+        self.assertEqual(response.status_code, 404)
+
+    def test_count_estimate_is_cached(self):
+        data, counted = self.get(count='estimate', is_active='true')
+        self.assertTrue(counted)
+        self.assertEqual(data['count'], 120)
+
+        data, counted = self.get(count='estimate', is_active='true', page=2)
+        self.assertFalse(counted)
+        self.assertEqual(data['count'], 120)
+
+
+    def test_unordered_querysets_are_paged_by_pk(self):
+        for _ in range(4):
+            make_declaration_chain(make_ship(make_customer()), make_supplier(), hazmat_count=2)
+        for url in ('/api/hazardous-materials/', '/api/suppliers/', '/api/customers/', '/api/users/'):
+            with self.subTest(url=url), warnings.catch_warnings(record=True) as caught:
+                warnings.simplefilter('always')
+                ids = [row['id'] for row in self.client.get(url, {'page_size': 100}).json()['results']]
+                pages = [
+                    row['id'] for page in (1, 2)
+                    for row in self.client.get(url, {'page_size': 2, 'page': page, 'count': 'none'}).json()['results']
+                ]
+                self.assertEqual(ids, sorted(ids))
+                self.assertEqual(pages, ids[:4])
+                self.assertFalse([w for w in caught if issubclass(w.category, UnorderedObjectListWarning)])
+
+
+class ConditionalGetTests(APITestCase):
+    """ETag / Last-Modified 조건부 조회"""
+
+    def setUp(self):
+        self.customer = make_customer()
+        self.ships = [make_ship(self.customer) for _ in range(3)]
+        self.client.force_authenticate(token_user(self.customer.user))
+
+    def test_detail_not_modified(self):
+        url = f'/api/ships/{self.ships[0].id}/'
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+        etag, last_modified = response['ETag'], response['Last-Modified']
+        self.assertIn('private', response['Cache-Control'])
+
+        # 일치하면 검증 쿼리 하나만 실행하고 Serializer 없이 304
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified).status_code, 304)
+        # 다른 필드 구성은 다른 표현
+        self.assertEqual(self.client.get(url, {'fields': 'id'}, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+        Ship.objects.filter(pk=self.ships[0].pk).update(updated_at=self.ships[0].updated_at + timedelta(seconds=1))
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(self.client.get('/api/ships/0/', HTTP_IF_NONE_MATCH=etag).status_code, 404)
+
+    def test_list_not_modified(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/api/ships/', {'is_active': 'true'})
+        # 검증 쿼리의 건수를 페이지네이션이 그대로 사용
+        self.assertEqual(sum('COUNT(' in q['sql'] for q in ctx.captured_queries), 1)
+        self.assertEqual(response.data['count'], 3)
+        etag = response['ETag']
+
+        response = self.client.get('/api/ships/', {'is_active': 'true'}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(self.client.get('/api/ships/my_ships/', HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+        # 삭제는 최종 수정 시각이 그대로여도 건수로 드러난다
+        Ship.objects.filter(pk=self.ships[0].pk).delete()
+        response = self.client.get('/api/ships/', {'is_active': 'true'}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 2)
+
+        # 다른 범위의 사용자는 같은 경로라도 ETag 가 다르다
+        self.client.force_authenticate(token_user(make_user('operator')))
+        self.assertEqual(self.client.get('/api/ships/', {'is_active': 'true'}, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_count_free_pagination_skips_validation(self):
+        response = self.client.get('/api/ships/', {'count': 'none'})
+        self.assertNotIn('ETag', response)
+
+
+class ShipInventoryTests(QueryCountTestMixin, APITestCase):
+    """선박별 유해물질 인벤토리 집계"""
+
+    def setUp(self):
+        super().setUp()
+        self.customer = make_customer()
+        self.ship = make_ship(self.customer)
+        self.supplier = make_supplier()
+        self.first = self.make_declaration('approved', [('7439-92-1', '0.10'), ('7439-92-1', '0.50'), ('1332-21-4', '1.00')])
+        self.second = self.make_declaration('approved', [('7439-92-1', '0.30')])
+        self.pending = self.make_declaration('submitted', [('1336-36-3', '0.05')])
+        self.url = f'/api/ships/{self.ship.id}/inventory/'
+
+    def make_declaration(self, status, materials):
+        declaration = make_declaration_chain(self.ship, self.supplier, status=status)
+        for cas_number, content in materials:
+            HazardousMaterial.objects.create(
+                declaration=declaration, material_name=f'Material {cas_number}',
+                cas_number=cas_number, content_percentage=content,
+            )
+        return declaration
+
+    def inventory(self):
+        self.client.force_authenticate(token_user(self.customer.user))
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return {row['cas_number']: row for row in response.data['results']}
+
+    def test_rollup_of_approved_declarations(self):
+        items = self.inventory()
+        self.assertEqual(set(items), {'7439-92-1', '1332-21-4'})
+        lead = items['7439-92-1']
+        self.assertEqual(lead['item_count'], 3)
+        self.assertEqual(Decimal(lead['max_content_percentage']), Decimal('0.50'))
+        self.assertEqual(Decimal(lead['avg_content_percentage']), Decimal('0.30'))
+        self.assertEqual(lead['declaration_ids'], sorted([self.first.id, self.second.id]))
+
+    def test_within_budget_with_token_lookup(self):
+        response = self.budget_request(self.customer.user, 'get', self.url)
+        self.assertEqual(int(response['X-Query-Count']), AUTH + 1 + PAGE)
+
+    def test_declaration_ids_keep_latest(self):
+        with mock.patch.object(inventory, 'DECLARATION_IDS_LIMIT', 1):
+            inventory.rebuild()
+        lead = self.inventory()['7439-92-1']
+        self.assertEqual(lead['declaration_count'], 2)
+        self.assertEqual(lead['declaration_ids'], [self.second.id])
+
+    def test_approve_and_reject_update_rollup(self):
+        self.client.force_authenticate(token_user(make_user('operator')))
+        self.client.post(f'/api/declarations/{self.pending.id}/approve/')
+        self.client.post(f'/api/declarations/{self.first.id}/reject/')
+
+        items = self.inventory()
+        self.assertEqual(set(items), {'7439-92-1', '1336-36-3'})
+        self.assertEqual(items['7439-92-1']['item_count'], 1)
+        self.assertEqual(items['7439-92-1']['declaration_ids'], [self.second.id])
+
+    def test_declaration_delete_refreshes_once(self):
+        larger = self.make_declaration('approved', [('7439-92-1', '0.20')] * 6 + [('1332-21-4', '0.40')] * 6)
+        with CaptureQueriesContext(connection) as small:
+            self.second.declaration_request.purchase_order.delete()
+        with CaptureQueriesContext(connection) as large:
+            larger.declaration_request.purchase_order.delete()
+        # 유해물질 수와 무관하게 신고서마다 CAS 번호 조회 1 + 재집계 1 회
+        self.assertEqual(len(large), len(small))
+
+        items = self.inventory()
+        self.assertEqual(items['7439-92-1']['item_count'], 2)
+        self.assertEqual(items['7439-92-1']['declaration_ids'], [self.first.id])
+        self.assertEqual(items['1332-21-4']['item_count'], 1)
+
+    def test_rebuild_matches_incremental(self):
+        fields = ['ship_id', 'cas_number', 'item_count', 'max_content_percentage',
+                  'avg_content_percentage', 'declaration_count', 'declaration_ids']
+        incremental = list(ShipInventoryItem.objects.order_by('ship_id', 'cas_number').values(*fields))
+        ShipInventoryItem.objects.all().delete()
+        make_ship(self.customer)
+
+        call_command('rebuild_ship_inventory', '--chunk-size', '1', stdout=StringIO())
+        rebuilt = list(ShipInventoryItem.objects.order_by('ship_id', 'cas_number').values(*fields))
+        self.assertEqual(rebuilt, incremental)
+
+    def test_other_customer_cannot_read(self):
+        self.client.force_authenticate(token_user(make_customer().user))
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+
+class ShipReportTests(QueryCountTestMixin, APITestCase):
+    """선박 IHM 보고서 비동기 생성과 내용 해시 캐시"""
+
+    def setUp(self):
+        super().setUp()
+        self.customer = make_customer()
+        self.ship = make_ship(self.customer)
+        self.supplier = make_supplier()
+        self.approved = make_declaration_chain(self.ship, self.supplier, hazmat_count=2, status='approved')
+        self.submitted = make_declaration_chain(self.ship, self.supplier, hazmat_count=1)
+        self.url = f'/api/ships/{self.ship.id}/reports/'
+        self.client.force_authenticate(token_user(self.customer.user))
+
+    def request_and_generate(self):
+        response = self.client.post(self.url)
+        self.assertEqual(response.status_code, 202, response.content)
+        self.assertEqual(response.data['status'], 'queued')
+        call_command('run_worker', '--burst', stdout=StringIO())
+        return self.client.get(f"/api/reports/{response.data['id']}/").data
+
+    def test_request_generate_and_download(self):
+        first = self.client.post(self.url).data
+        self.assertEqual(self.client.post(self.url).data['id'], first['id'])  # 대기 중인 요청 재사용
+        response = self.client.get(f"/api/reports/{first['id']}/download/")
+        self.assertEqual(response.status_code, 409)
+
+        call_command('run_worker', '--burst', stdout=StringIO())
+        report = self.client.get(f"/api/reports/{first['id']}/").data
+        self.assertEqual(report['status'], 'done')
+        self.assertFalse(report['reused'])
+
+        document = self.client.get(f"/api/reports/{first['id']}/download/").data
+        self.assertEqual(document['ship']['imo_number'], self.ship.imo_number)
+        self.assertEqual([d['id'] for d in document['declarations']], [self.approved.id])
+        self.assertEqual(len(document['declarations'][0]['hazardous_materials']), 2)
+        self.assertEqual(len(document['inventory']), 2)
+
+        response = self.client.get(f"/api/reports/{first['id']}/download/", {'output': 'html'})
+        self.assertEqual(response['Content-Type'], 'text/html; charset=utf-8')
+        self.assertIn(self.ship.ship_name, response.content.decode())
+        self.assertEqual(len(self.client.get(self.url).data['results']), 1)
+
+    def test_artifact_reused_until_approved_declarations_change(self):
+        first = self.request_and_generate()
+
+        make_declaration_chain(self.ship, self.supplier, hazmat_count=3)  # 승인 전 신고서는 영향 없음
+        second = self.request_and_generate()
+        self.assertTrue(second['reused'])
+        self.assertEqual(second['content_hash'], first['content_hash'])
+
+        self.client.force_authenticate(token_user(make_user('operator')))
+        self.client.post(f'/api/declarations/{self.submitted.id}/approve/')
+        third = self.request_and_generate()
+        self.assertFalse(third['reused'])
+        self.assertNotEqual(third['content_hash'], first['content_hash'])
+
+    def test_fleet_request_and_scope(self):
+        other = make_ship(self.customer)
+        make_ship(make_customer())
+        response = self.client.post('/api/ships/reports/')
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual({r['ship'] for r in response.data['reports']}, {self.ship.id, other.id})
+
+        call_command('run_worker', '--burst', '--max-jobs', '1', stdout=StringIO())
+        statuses = self.client.get('/api/reports/').data['results']
+        self.assertEqual(sorted(r['status'] for r in statuses), ['done', 'queued'])
+
+        self.client.force_authenticate(token_user(make_customer().user))
+        self.assertEqual(self.client.get(f"/api/reports/{statuses[0]['id']}/").status_code, 404)
+        self.assertEqual(self.client.post(self.url).status_code, 404)
+        self.client.force_authenticate(token_user(self.supplier.user))
+        self.assertEqual(self.client.post(self.url).status_code, 403)
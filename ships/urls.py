@@ -1,10 +1,11 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
+from ihm_backend.async_views import async_routes
 from .views import ShipViewSet
 
 router = DefaultRouter()
 router.register('ships', ShipViewSet, basename='ship')
 
 urlpatterns = [
-    path('', include(router.urls)),
+    path('', include(async_routes(router.urls))),
 ]
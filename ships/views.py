@@ -1,15 +1,40 @@
-from rest_framework import viewsets
+from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from ihm_backend.async_views import AsyncReadMixin
+from ihm_backend.conditional import ConditionalGetMixin
+from ihm_backend.fast_list import FastListMixin
+from ihm_backend.query_budget import AUTH, PAGE, QueryBudgetMixin
+from ihm_backend.query_planner import QueryPlannerMixin
+from ihm_backend.response_cache import ResponseCacheMixin
+from declarations import reports
+from declarations.models import ShipInventoryItem, ShipReport
+from declarations.serializers import ShipInventoryItemSerializer, ShipReportSerializer
+from users.authentication import scope_filter
+from users.models import Customer
 from .models import Ship
 from .serializers import ShipSerializer, ShipListSerializer
 
 
-class ShipViewSet(viewsets.ModelViewSet):
+class ShipViewSet(QueryBudgetMixin, QueryPlannerMixin, ConditionalGetMixin, ResponseCacheMixin, FastListMixin,
+                  AsyncReadMixin, viewsets.ModelViewSet):
     """선박 ViewSet"""
     queryset = Ship.objects.all()
     permission_classes = [IsAuthenticated]
+    query_budgets = {
+        'list': AUTH + PAGE,
+        'retrieve': AUTH + 1,
+        'my_ships': AUTH + PAGE,
+        # 선박 + 인벤토리 페이지
+        'inventory': AUTH + 1 + PAGE,
+        # 선박 + GET: 보고서 페이지, POST: 생성 요청과 응답용 보고서 조회
+        'reports': AUTH + 1 + max(PAGE, reports.ENQUEUE_QUERIES + 1),
+        # 범위 안의 선박 ID + 생성 요청
+        'fleet_reports': AUTH + 1 + reports.ENQUEUE_QUERIES,
+    }
+    cache_actions = ('list', 'retrieve', 'my_ships')
+    cache_models = (Ship, Customer)
     
     def get_serializer_class(self):
         if self.action == 'list':
@@ -21,7 +46,7 @@ class ShipViewSet(viewsets.ModelViewSet):
         
         # 고객사 사용자는 자신의 선박만 조회
         if self.request.user.user_type == 'customer':
-            queryset = queryset.filter(customer__user=self.request.user)
+            queryset = scope_filter(queryset, customer_id=self.request.user.customer_id)
         
         # 쿼리 파라미터 필터링
         customer_id = self.request.query_params.get('customer', None)
@@ -32,7 +57,7 @@ class ShipViewSet(viewsets.ModelViewSet):
         if is_active is not None:
             queryset = queryset.filter(is_active=is_active.lower() == 'true')
         
-        return queryset
+        return self.plan_queryset(queryset)
     
     @action(detail=False, methods=['get'])
     def my_ships(self, request):
@@ -40,6 +65,58 @@ class ShipViewSet(viewsets.ModelViewSet):
         if request.user.user_type != 'customer':
             return Response({'detail': '고객사 사용자만 접근 가능합니다.'}, status=403)
         
-        ships = Ship.objects.filter(customer__user=request.user)
-        serializer = self.get_serializer(ships, many=True)
-        return Response(serializer.data)
+        # get_queryset 이 이미 고객사 범위로 제한하고 customer 를 조인함
+        return self.list(request)
+    
+    async def amy_ships(self, request):
+        if request.user.user_type != 'customer':
+            return Response({'detail': '고객사 사용자만 접근 가능합니다.'}, status=403)
+        return await self.alist(request)
+    
+    @action(detail=True, methods=['get'])
+    def inventory(self, request, pk=None):
+        """선박 유해물질 인벤토리 (IHM Part I) - 승인된 신고서의 CAS 번호별 집계"""
+        ship = self.get_object()
+        queryset = ShipInventoryItem.objects.filter(ship=ship)
+        page = self.paginate_queryset(queryset)
+        serializer = ShipInventoryItemSerializer(page, many=True, context=self.get_serializer_context())
+        return self.get_paginated_response(serializer.data)
+    
+    async def ainventory(self, request, pk=None):
+        ship = await self.aget_object()
+        queryset = ShipInventoryItem.objects.filter(ship=ship)
+        page = await self.apaginate_queryset(queryset)
+        serializer = ShipInventoryItemSerializer(page, many=True, context=self.get_serializer_context())
+        return self.get_paginated_response(serializer.data)
+    
+    @action(detail=True, methods=['get', 'post'])
+    def reports(self, request, pk=None):
+        """선박 IHM 보고서 - GET: 생성 요청 목록, POST: 생성 요청 (워커가 비동기로 생성)"""
+        if request.user.user_type == 'supplier':
+            return Response({'detail': '운영자 또는 선주 고객사만 요청할 수 있습니다.'}, status=403)
+        
+        ship = self.get_object()
+        if request.method == 'GET':
+            queryset = ShipReport.objects.filter(ship=ship).select_related('ship', 'artifact').defer(
+                'artifact__document', 'artifact__html'
+            )
+            page = self.paginate_queryset(queryset)
+            serializer = ShipReportSerializer(page, many=True, context=self.get_serializer_context())
+            return self.get_paginated_response(serializer.data)
+        
+        [report] = reports.enqueue([ship.id], request.user)
+        serializer = ShipReportSerializer(report, context=self.get_serializer_context())
+        return Response(serializer.data, status=status.HTTP_202_ACCEPTED)
+    
+    @action(detail=False, methods=['post'], url_path='reports', url_name='fleet-reports')
+    def fleet_reports(self, request):
+        """범위 안의 모든 선박(?customer=, ?is_active= 필터 적용) 보고서 생성 요청 - 선박 하나당 작업 하나"""
+        if request.user.user_type == 'supplier':
+            return Response({'detail': '운영자 또는 선주 고객사만 요청할 수 있습니다.'}, status=403)
+        
+        ship_ids = list(self.get_queryset().order_by('pk').values_list('pk', flat=True))
+        queued = reports.enqueue(ship_ids, request.user)
+        return Response(
+            {'queued': len(queued), 'reports': [{'id': r.id, 'ship': r.ship_id, 'status': r.status} for r in queued]},
+            status=status.HTTP_202_ACCEPTED,
+        )
@@ -0,0 +1,87 @@
+"""
+역할/범위 클레임을 담은 JWT 와 DB 조회 없는 인증
+
+발급 토큰에 user_type, customer_id, supplier_id, ver(토큰 버전) 클레임을 넣고,
+ClaimsJWTAuthentication 은 User 행을 읽지 않고 클레임으로 ClaimsUser 를 만듭니다.
+역할이나 소속이 바뀌면 User.token_version 이 증가하므로 이전 토큰은 거부됩니다.
+"""
+from django.utils.functional import cached_property
+from rest_framework_simplejwt.authentication import JWTStatelessUserAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import get_token_version
+
+REVOKED_TOKEN_MESSAGE = '권한 정보가 변경되어 토큰이 만료되었습니다. 다시 로그인해주세요.'
+
+
+def token_claims(user):
+    return {
+        'username': user.username,
+        'user_type': user.user_type,
+        'customer_id': user.customer_id,
+        'supplier_id': user.supplier_id,
+        'ver': user.token_version,
+    }
+
+
+def scope_filter(queryset, **lookups):
+    """역할 범위 필터 - 프로필이 연결되지 않아 범위 id 가 None 이면 빈 쿼리셋
+
+    filter(customer_id=None) 은 IS NULL 이 되어 범위가 없는 행이 모두 보이므로 필터하지 않고 none() 을 반환합니다.
+    """
+    if any(value is None for value in lookups.values()):
+        return queryset.none()
+    return queryset.filter(**lookups)
+
+
+def check_token_version(token):
+    user_id = token.get(api_settings.USER_ID_CLAIM)
+    if user_id is None or token.get('ver') != get_token_version(user_id):
+        raise InvalidToken(REVOKED_TOKEN_MESSAGE)
+
+
+class ClaimsUser(TokenUser):
+    """토큰 클레임으로 만든 요청 사용자 (DB 조회 없음)
+
+    FK 에 저장할 때는 인스턴스 대신 request.user.id 를 사용합니다.
+    """
+
+    @cached_property
+    def user_type(self):
+        return self.token.get('user_type')
+
+    @cached_property
+    def customer_id(self):
+        return self.token.get('customer_id')
+
+    @cached_property
+    def supplier_id(self):
+        return self.token.get('supplier_id')
+
+
+class ClaimsJWTAuthentication(JWTStatelessUserAuthentication):
+    """토큰 버전만 확인하는 JWT 인증 (버전은 캐시되므로 보통 DB 조회 없음)"""
+
+    def get_user(self, validated_token):
+        check_token_version(validated_token)
+        return super().get_user(validated_token)
+
+
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        for claim, value in token_claims(user).items():
+            token[claim] = value
+        return token
+
+
+class ClaimsTokenRefreshSerializer(TokenRefreshSerializer):
+    """폐기된 refresh 토큰으로 새 access 토큰을 받지 못하도록 버전 확인"""
+
+    def validate(self, attrs):
+        check_token_version(self.token_class(attrs['refresh']))
+        return super().validate(attrs)
@@ -1,5 +1,35 @@
+from django.conf import settings
+from django.core.cache import cache
 from django.db import models
+from django.db.models import F
 from django.contrib.auth.models import AbstractUser
+from django.utils.functional import cached_property
+
+
+TOKEN_VERSION_CACHE_KEY = 'auth:token_version:{}'
+
+
+def revoke_tokens(*user_ids):
+    """사용자에게 발급된 JWT 를 모두 폐기 (token_version 증가)"""
+    user_ids = [pk for pk in user_ids if pk]
+    if not user_ids:
+        return
+    User.objects.filter(pk__in=user_ids).update(token_version=F('token_version') + 1)
+    cache.delete_many([TOKEN_VERSION_CACHE_KEY.format(pk) for pk in user_ids])
+
+
+def get_token_version(user_id):
+    """현재 유효한 토큰 버전 (비활성/삭제된 사용자는 -1)
+
+    매 요청마다 조회되므로 TOKEN_VERSION_CACHE_TIMEOUT 초 동안 캐시합니다.
+    """
+    key = TOKEN_VERSION_CACHE_KEY.format(user_id)
+    version = cache.get(key)
+    if version is None:
+        row = User.objects.filter(pk=user_id).values_list('token_version', 'is_active').first()
+        version = row[0] if row and row[1] else -1
+        cache.set(key, version, settings.TOKEN_VERSION_CACHE_TIMEOUT)
+    return version
 
 
 class User(AbstractUser):
@@ -14,6 +44,11 @@ class User(AbstractUser):
     user_type = models.CharField(max_length=20, choices=USER_TYPE_CHOICES, verbose_name='사용자 유형')
     company_name = models.CharField(max_length=200, blank=True, verbose_name='회사명')
     contact_phone = models.CharField(max_length=20, blank=True, verbose_name='연락처')
+    token_version = models.PositiveIntegerField(default=0, verbose_name='토큰 버전')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='수정일')
+    
+    # 값이 바뀌면 이미 발급된 토큰을 폐기하는 필드
+    TOKEN_SENSITIVE_FIELDS = ('user_type', 'is_active', 'password')
     
     class Meta:
         db_table = 'users'
@@ -22,6 +57,36 @@ class User(AbstractUser):
     
     def __str__(self):
         return f"{self.username} ({self.get_user_type_display()})"
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._token_state = instance._get_token_state()
+        return instance
+    
+    def _get_token_state(self):
+        return {name: self.__dict__[name] for name in self.TOKEN_SENSITIVE_FIELDS if name in self.__dict__}
+    
+    def save(self, *args, **kwargs):
+        state = getattr(self, '_token_state', None)
+        revoked = bool(state) and any(self.__dict__.get(name) != value for name, value in state.items())
+        if revoked:
+            self.token_version += 1
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = {*kwargs['update_fields'], 'token_version'}
+        super().save(*args, **kwargs)
+        self._token_state = self._get_token_state()
+        if revoked:
+            cache.delete(TOKEN_VERSION_CACHE_KEY.format(self.pk))
+    
+    # JWT 클레임과 같은 이름의 소속 id - 세션 인증 사용자도 같은 방식으로 범위를 필터링할 수 있다
+    @cached_property
+    def customer_id(self):
+        return Customer.objects.filter(user_id=self.pk).values_list('id', flat=True).first()
+    
+    @cached_property
+    def supplier_id(self):
+        return Supplier.objects.filter(user_id=self.pk).values_list('id', flat=True).first()
 
 
 class Customer(models.Model):
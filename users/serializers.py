@@ -1,11 +1,12 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from ihm_backend.fieldsets import DynamicFieldsModelSerializer
 from .models import Customer, Supplier
 
 User = get_user_model()
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(DynamicFieldsModelSerializer):
     """사용자 기본 Serializer"""
     password = serializers.CharField(write_only=True, required=False)
     
@@ -33,7 +34,7 @@ class UserSerializer(serializers.ModelSerializer):
         return instance
 
 
-class CustomerSerializer(serializers.ModelSerializer):
+class CustomerSerializer(DynamicFieldsModelSerializer):
     """고객사 Serializer"""
     user_info = UserSerializer(source='user', read_only=True)
     
@@ -43,9 +44,10 @@ class CustomerSerializer(serializers.ModelSerializer):
                   'address', 'contact_person', 'contact_phone', 'contact_email',
                   'created_at', 'updated_at']
         read_only_fields = ['id', 'created_at', 'updated_at']
+        expandable_fields = ['user_info']
 
 
-class SupplierSerializer(serializers.ModelSerializer):
+class SupplierSerializer(DynamicFieldsModelSerializer):
     """공급업체 Serializer"""
     user_info = UserSerializer(source='user', read_only=True)
     
@@ -55,9 +57,10 @@ class SupplierSerializer(serializers.ModelSerializer):
                   'address', 'contact_person', 'contact_phone', 'contact_email',
                   'created_at', 'updated_at']
         read_only_fields = ['id', 'created_at', 'updated_at']
+        expandable_fields = ['user_info']
 
 
-class UserRegistrationSerializer(serializers.ModelSerializer):
+class UserRegistrationSerializer(DynamicFieldsModelSerializer):
     """사용자 회원가입 Serializer"""
     password = serializers.CharField(write_only=True, min_length=8)
     password_confirm = serializers.CharField(write_only=True, min_length=8)
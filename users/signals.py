@@ -0,0 +1,33 @@
+"""
+고객사/공급업체 연결이 바뀌면 해당 사용자의 토큰 폐기
+
+JWT 의 customer_id / supplier_id 클레임이 실제 연결과 달라지지 않도록 합니다.
+"""
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .models import Customer, Supplier, revoke_tokens
+
+
+@receiver(pre_save, sender=Customer)
+@receiver(pre_save, sender=Supplier)
+def remember_previous_user(sender, instance, **kwargs):
+    instance._previous_user_id = None
+    if instance.pk:
+        instance._previous_user_id = (
+            sender.objects.filter(pk=instance.pk).values_list('user_id', flat=True).first()
+        )
+
+
+@receiver(post_save, sender=Customer)
+@receiver(post_save, sender=Supplier)
+def revoke_on_profile_link(sender, instance, created, **kwargs):
+    previous = getattr(instance, '_previous_user_id', None)
+    if created or previous != instance.user_id:
+        revoke_tokens(previous, instance.user_id)
+
+
+@receiver(post_delete, sender=Customer)
+@receiver(post_delete, sender=Supplier)
+def revoke_on_profile_delete(sender, instance, **kwargs):
+    revoke_tokens(instance.user_id)
@@ -1,3 +1,151 @@
-from django.test import TestCase
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
 
-# Create your tests here.
+from declarations.models import PurchaseOrder, DeclarationRequest, Declaration, HazardousMaterial
+from ihm_backend.testing import (
+    QueryCountTestMixin, make_user, make_customer, make_supplier, make_ship, make_declaration_chain, token_user,
+)
+from search.models import SearchDocument
+from .models import User
+
+
+class UserQueryCountTests(QueryCountTestMixin, APITestCase):
+    """users 앱 ViewSet 의 N+1 회귀 테스트"""
+
+    def setUp(self):
+        super().setUp()
+        self.operator = make_user('operator')
+        self.client.force_authenticate(token_user(self.operator))
+
+    def test_user_list(self):
+        self.assertQueryCountStable(
+            '/api/users/', lambda n: [make_user('supplier') for _ in range(n)]
+        )
+
+    def test_customer_list(self):
+        self.assertQueryCountStable(
+            '/api/customers/', lambda n: [make_customer() for _ in range(n)]
+        )
+
+    def test_supplier_list(self):
+        self.assertQueryCountStable(
+            '/api/suppliers/', lambda n: [make_supplier() for _ in range(n)]
+        )
+
+    def test_detail_and_my_company(self):
+        supplier = make_supplier()
+        self.count_queries(f'/api/suppliers/{supplier.id}/')
+        self.count_queries(f'/api/users/{supplier.user_id}/')
+
+        self.client.force_authenticate(token_user(supplier.user))
+        self.count_queries('/api/suppliers/my_company/')
+        self.count_queries('/api/users/me/')
+
+        customer = make_customer()
+        self.client.force_authenticate(token_user(customer.user))
+        self.count_queries('/api/customers/my_company/')
+        self.count_queries(f'/api/customers/{customer.id}/')
+
+    def test_conditional_get(self):
+        user = make_user('supplier')
+        for url in ('/api/users/', f'/api/users/{user.id}/'):
+            with self.subTest(url=url):
+                etag = self.client.get(url)['ETag']
+                self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+                user.company_name = f'Renamed {url}'
+                user.save()
+                self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+
+class ClaimsAuthenticationTests(APITestCase):
+    """역할/범위 클레임 JWT 와 토큰 버전 폐기"""
+
+    def setUp(self):
+        cache.clear()
+        self.supplier = make_supplier()
+        self.user = self.supplier.user
+        self.user.set_password('secret-pass')
+        self.user.save()
+
+    def obtain(self):
+        response = self.client.post('/api/token/', {'username': self.user.username, 'password': 'secret-pass'})
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.data
+
+    def get(self, url, access):
+        return self.client.get(url, HTTP_AUTHORIZATION=f'Bearer {access}')
+
+    def test_token_carries_scope_claims(self):
+        token = AccessToken(self.obtain()['access'])
+        self.assertEqual(token['user_type'], 'supplier')
+        self.assertEqual(token['supplier_id'], self.supplier.id)
+        self.assertIsNone(token['customer_id'])
+
+    def test_authentication_does_not_load_user(self):
+        access = self.obtain()['access']
+        self.get('/api/suppliers/', access)  # 토큰 버전 캐시
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.get('/api/suppliers/', access)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(any('"users"' in q['sql'] for q in ctx.captured_queries))
+        self.assertEqual([row['id'] for row in response.data['results']], [self.supplier.id])
+
+    def test_role_change_revokes_tokens(self):
+        tokens = self.obtain()
+        self.assertEqual(self.get('/api/suppliers/', tokens['access']).status_code, 200)
+
+        self.user.user_type = 'customer'
+        self.user.save()
+
+        self.assertEqual(self.get('/api/suppliers/', tokens['access']).status_code, 401)
+        response = self.client.post('/api/token/refresh/', {'refresh': tokens['refresh']})
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(self.get('/api/suppliers/', self.obtain()['access']).status_code, 200)
+
+    def test_profile_link_and_deactivation_revoke_tokens(self):
+        access = self.obtain()['access']
+        customer = make_customer()
+        customer.user = self.user
+        customer.save()
+        self.assertEqual(self.get('/api/suppliers/', access).status_code, 401)
+
+        access = self.obtain()['access']
+        self.assertEqual(AccessToken(access)['customer_id'], customer.id)
+        User.objects.get(pk=self.user.pk).save()  # 변경 없는 저장은 토큰을 유지
+        self.assertEqual(self.get('/api/suppliers/', access).status_code, 200)
+
+        self.user.refresh_from_db()
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.get('/api/suppliers/', access).status_code, 401)
+
+    def test_unlinked_profile_sees_no_scoped_rows(self):
+        make_declaration_chain(make_ship(make_customer()), self.supplier, hazmat_count=2)
+        # 범위 id 가 없는 행 - filter(customer_id=None) 이면 IS NULL 로 보이게 된다
+        for model in (PurchaseOrder, DeclarationRequest, Declaration, HazardousMaterial):
+            model.objects.update(customer=None)
+        SearchDocument.objects.update(customer_id=None)
+
+        scoped_urls = {
+            'customer': [
+                '/api/ships/', '/api/purchase-orders/', '/api/declaration-requests/', '/api/declarations/',
+                '/api/hazardous-materials/', '/api/reports/',
+            ],
+            'supplier': ['/api/declaration-requests/', '/api/declarations/', '/api/hazardous-materials/'],
+        }
+        for user_type, urls in scoped_urls.items():
+            self.client.force_authenticate(token_user(make_user(user_type)))
+            for url in urls:
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 200, (user_type, url))
+                self.assertEqual(response.data['results'], [], (user_type, url))
+            found = {
+                row['type']
+                for query, entity in (('PO', 'purchase_order'), ('MD', 'declaration'))
+                for row in self.client.get('/api/search/', {'q': query, 'type': entity}).data['results']
+            }
+            self.assertEqual(found, set() if user_type == 'customer' else {'purchase_order'})
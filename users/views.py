@@ -3,6 +3,10 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from django.contrib.auth import get_user_model
+from ihm_backend.conditional import ConditionalGetMixin
+from ihm_backend.query_budget import AUTH, PAGE, QueryBudgetMixin
+from ihm_backend.query_planner import QueryPlannerMixin
+from ihm_backend.response_cache import ResponseCacheMixin
 from .models import Customer, Supplier
 from .serializers import (
     UserSerializer, CustomerSerializer, SupplierSerializer,
@@ -12,16 +16,20 @@ from .serializers import (
 User = get_user_model()
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(QueryBudgetMixin, QueryPlannerMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     """사용자 ViewSet"""
     queryset = User.objects.all()
     serializer_class = UserSerializer
+    query_budgets = {'list': AUTH + PAGE, 'retrieve': AUTH + 1, 'me': AUTH + 1}
     
     def get_permissions(self):
         if self.action in ['create', 'register']:
             return [AllowAny()]
         return [IsAuthenticated()]
     
+    def get_queryset(self):
+        return self.plan_queryset(User.objects.all())
+    
     @action(detail=False, methods=['post'], permission_classes=[AllowAny])
     def register(self, request):
         """회원가입"""
@@ -40,28 +48,34 @@ class UserViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
     def me(self, request):
         """현재 로그인한 사용자 정보"""
-        serializer = self.get_serializer(request.user)
+        # request.user 는 토큰 클레임만 가진 객체이므로 프로필은 DB 에서 읽는다
+        serializer = self.get_serializer(self.get_queryset().get(pk=request.user.pk))
         return Response(serializer.data)
 
 
-class CustomerViewSet(viewsets.ModelViewSet):
+class CustomerViewSet(QueryBudgetMixin, QueryPlannerMixin, ConditionalGetMixin, ResponseCacheMixin, viewsets.ModelViewSet):
     """고객사 ViewSet"""
     queryset = Customer.objects.all()
     serializer_class = CustomerSerializer
     permission_classes = [IsAuthenticated]
+    query_budgets = {'list': AUTH + PAGE, 'retrieve': AUTH + 1, 'my_company': AUTH + 1}
+    cache_actions = ('list', 'retrieve', 'my_company')
     
     def get_queryset(self):
         queryset = Customer.objects.all()
         # 고객사 사용자는 자신의 정보만 조회
         if self.request.user.user_type == 'customer':
-            queryset = queryset.filter(user=self.request.user)
-        return queryset
+            queryset = queryset.filter(pk=self.request.user.customer_id)
+        return self.plan_queryset(queryset)
     
     @action(detail=False, methods=['get'])
     def my_company(self, request):
         """내 고객사 정보"""
+        return self.cached_response(request, self._my_company)
+    
+    def _my_company(self, request):
         try:
-            customer = Customer.objects.get(user=request.user)
+            customer = self.plan_queryset(Customer.objects.all()).get(pk=request.user.customer_id)
             serializer = self.get_serializer(customer)
             return Response(serializer.data)
         except Customer.DoesNotExist:
@@ -69,24 +83,29 @@ class CustomerViewSet(viewsets.ModelViewSet):
                           status=status.HTTP_404_NOT_FOUND)
 
 
-class SupplierViewSet(viewsets.ModelViewSet):
+class SupplierViewSet(QueryBudgetMixin, QueryPlannerMixin, ConditionalGetMixin, ResponseCacheMixin, viewsets.ModelViewSet):
     """공급업체 ViewSet"""
     queryset = Supplier.objects.all()
     serializer_class = SupplierSerializer
     permission_classes = [IsAuthenticated]
+    query_budgets = {'list': AUTH + PAGE, 'retrieve': AUTH + 1, 'my_company': AUTH + 1}
+    cache_actions = ('list', 'retrieve', 'my_company')
     
     def get_queryset(self):
         queryset = Supplier.objects.all()
         # 공급업체 사용자는 자신의 정보만 조회
         if self.request.user.user_type == 'supplier':
-            queryset = queryset.filter(user=self.request.user)
-        return queryset
+            queryset = queryset.filter(pk=self.request.user.supplier_id)
+        return self.plan_queryset(queryset)
     
     @action(detail=False, methods=['get'])
     def my_company(self, request):
         """내 공급업체 정보"""
+        return self.cached_response(request, self._my_company)
+    
+    def _my_company(self, request):
         try:
-            supplier = Supplier.objects.get(user=request.user)
+            supplier = self.plan_queryset(Supplier.objects.all()).get(pk=request.user.supplier_id)
             serializer = self.get_serializer(supplier)
             return Response(serializer.data)
         except Supplier.DoesNotExist: